@@ -1,10 +1,39 @@
 import bpy
+import bmesh
 import typing
-import copy
 import os
+import csv
+import json
+import math
+import time
+import logging
+import importlib
+import contextlib
 import mathutils
 from bpy.types import Scene, WindowManager, Image, ShaderNodeTree, ShaderNodeGroup
-import bpy.utils.previews
+from bpy_extras.io_utils import ImportHelper
+
+log = logging.getLogger(__name__)
+
+
+class LazyImport:
+	"""
+	Stands in for a module that is only imported when first used, keeps heavy imports out of Blender startup.
+	The module global is then replaced by the imported module, so later uses access the module directly.
+	"""
+	def __init__(self, name, package=None):
+		self.name = name
+		self.package = package
+
+	def __getattr__(self, attr):
+		module = importlib.import_module(self.name, self.package)
+		globals()[self.name.lstrip(".")] = module
+		return getattr(module, attr)
+
+
+numpy = LazyImport("numpy")
+evaluation = LazyImport(".evaluation", __package__)
+sequence = LazyImport(".sequence", __package__)
 
 bl_info = {
 	"name": "Segment Display Generator",
@@ -35,13 +64,15 @@ class SegmentAddonData(bpy.types.PropertyGroup):
 	)
 	digits: bpy.props.IntProperty(
 		name = "Digits",
-		min = 1, max = 10,
-		default = 3
+		min = 1, max = 20,
+		default = 3,
+		description = "More than 10 digits need integer digit attributes (Advanced settings)"
 	)
 	fraction_digits: bpy.props.IntProperty(
 		name = "Decimal places",
-		min = 0, max = 10,
-		default = 2
+		min = 0, max = 20,
+		default = 2,
+		description = "More than 10 decimal places need integer digit attributes (Advanced settings)"
 	)
 
 	millisecond_digits: bpy.props.IntProperty(
@@ -85,6 +116,7 @@ class SegmentAddonData(bpy.types.PropertyGroup):
 			("number", "Number", "Show a specific decimal value"),
 			("frame", "Frame", "Show the current animation frame"),
 			("timer", "Timer", "Animate the display to go from one value to another"),
+			("sequence", "Sequence", "Show the values of a CSV or JSON time series"),
 		]
 	)
 	number: bpy.props.FloatProperty(
@@ -123,6 +155,11 @@ class SegmentAddonData(bpy.types.PropertyGroup):
 		min = 0,
 		default = 250
 	)
+	sequence_filepath: bpy.props.StringProperty(
+		name = "Sequence file",
+		subtype = 'FILE_PATH',
+		description = "CSV file with frame,value rows or JSON file with frame and value pairs. Every value is held until the next frame in the file"
+	)
 
 	# Display value clock
 	display_value_clock: bpy.props.EnumProperty(
@@ -132,6 +169,7 @@ class SegmentAddonData(bpy.types.PropertyGroup):
 			("time", "Time", "Show a specific time"),
 			("frame", "Frame", "Show the current animation frame converted to time in seconds"),
 			("timer", "Timer", "Animate the display count down/up from one time to another"),
+			("sequence", "Sequence", "Show the times in seconds of a CSV or JSON time series"),
 		]
 	)
 	hours: bpy.props.IntProperty(
@@ -285,6 +323,29 @@ class SegmentAddonData(bpy.types.PropertyGroup):
 		description = "Gap between individual r,g,b subpixels",
 		default = 0.02
 	)
+	lcd_analytic_cells: bpy.props.BoolProperty(
+		name = "Analytic cells",
+		default = False,
+		description = "Compute the pixel cells with math nodes instead of color ramps. All displays share one node group and the gaps can be changed on existing displays"
+	)
+
+	# Level of detail
+	lod_mode: bpy.props.EnumProperty(
+		name = "Level of detail",
+		items = [
+			("off", "Off", "Always render the full display style"),
+			("distance", "Distance", "Render the plain style beyond a camera distance"),
+			("object", "Object property", "Render the plain style when the segment_lod property of the display object is 1"),
+		],
+		description = "Switch distant displays to the cheap plain style. Cycles skips the nodes of the unused style"
+	)
+	lod_distance: bpy.props.FloatProperty(
+		name = "LOD distance",
+		min = 0,
+		default = 25,
+		subtype = 'DISTANCE',
+		description = "Camera distance from which the plain style is rendered"
+	)
 
 
 
@@ -312,6 +373,137 @@ class SegmentAddonData(bpy.types.PropertyGroup):
 		name = "Physically merge neighbouring digit vertexes",
 		default = True
 	)
+	use_instancing: bpy.props.BoolProperty(
+		name = "Instance digits with Geometry Nodes",
+		description = "Build the display as a point per digit with the digit meshes instanced by a Geometry Nodes modifier instead of real geometry",
+		default = False
+	)
+	realize_instances: bpy.props.BoolProperty(
+		name = "Realize instances",
+		description = "Convert the instanced digits to real geometry in the Geometry Nodes modifier",
+		default = False
+	)
+	attribute_encoding: bpy.props.EnumProperty(
+		name = "Digit attributes",
+		items = [
+			("color", "Vertex color", "Store digit position and display section as vertex colors in 0.1 steps, decoded with an approximate gamma in the shader. Limited to 10 digits"),
+			("int8", "INT8", "Store digit position and display section as exact 8 bit integer face attributes"),
+			("int32", "INT32", "Store digit position and display section as exact 32 bit integer face attributes"),
+		],
+		description = "How the digit position and display section of every digit are passed to the material"
+	)
+	segment_decoding: bpy.props.EnumProperty(
+		name = "Segment decoding",
+		items = [
+			("compare", "Comparisons", "Decode the digits by comparing the segment ids of all numerals (7SegmentCore)"),
+			("lookup", "Glyph texture", "Look the lit segments up in a small glyph texture, the cost does not depend on the number of glyphs"),
+		],
+		description = "How the material finds the lit segments of a digit"
+	)
+	use_keyframes: bpy.props.BoolProperty(
+		name = "Keyframe frame and timer values",
+		description = "Animate frame and timer displays with a linear F-curve instead of a Python driver. Renders without script auto-run and needs no driver evaluation",
+		default = False
+	)
+	cpu_evaluation: bpy.props.BoolProperty(
+		name = "Evaluate digits on CPU",
+		description = "Compute the lit segments of every digit once per frame on the CPU and store them as an integer attribute. The material then only tests one bit per segment",
+		default = False
+	)
+	share_material: bpy.props.BoolProperty(
+		name = "Share material between displays",
+		description = "Reuse one material for all displays with the same type, style and value source. Per display settings are stored as object custom properties and read by Attribute nodes",
+		default = False
+	)
+
+
+class DisplayConfig:
+	"""
+	Scene independent copy of the SegmentAddonData settings.
+
+	Unset settings take the SegmentAddonData defaults. Can be passed anywhere a SegmentAddonData is expected.
+	"""
+	def __init__(self, **settings):
+		for prop in self.properties():
+			if getattr(prop, "is_array", False):
+				setattr(self, prop.identifier, tuple(prop.default_array))
+			else:
+				setattr(self, prop.identifier, prop.default)
+		# The style enum has dynamic items, RNA reports no default for it
+		self.style = STYLE_PREVIEWS[0][0]
+		self.update(settings)
+
+	@staticmethod
+	def properties():
+		return [prop for prop in SegmentAddonData.bl_rna.properties if prop.identifier not in ("rna_type", "name")]
+
+	@classmethod
+	def from_data(cls, data) -> "DisplayConfig":
+		"""
+		Copies the current settings of a SegmentAddonData (or another config).
+		"""
+		config = cls()
+		for prop in cls.properties():
+			value = getattr(data, prop.identifier)
+			setattr(config, prop.identifier, tuple(value) if getattr(prop, "is_array", False) else value)
+		return config
+
+	def update(self, settings: dict):
+		"""
+		Sets settings from a dictionary. String values (from CSV files for example) are converted to the property type.
+		Values outside the property limits or unknown enum items raise a ValueError.
+		"""
+		props = {prop.identifier: prop for prop in self.properties()}
+		for key, value in settings.items():
+			if key not in props:
+				raise KeyError(f"Unknown display setting '{key}'")
+			setattr(self, key, self.convert_value(props[key], value))
+
+	@classmethod
+	def convert_value(cls, prop, value):
+		if getattr(prop, "is_array", False):
+			if isinstance(value, str):
+				value = value.replace(";", " ").split()
+			value = tuple(float(v) for v in value)
+			if len(value) != prop.array_length:
+				raise ValueError(f"Setting '{prop.identifier}' expects {prop.array_length} values")
+			for v in value:
+				cls.validate_range(prop, v)
+			return value
+		if prop.type == 'BOOLEAN':
+			if isinstance(value, str):
+				return value.strip().lower() in ("1", "true", "yes", "on")
+			return bool(value)
+		if prop.type == 'INT':
+			number = float(value)
+			if not number.is_integer():
+				raise ValueError(f"Setting '{prop.identifier}' must be a whole number, not {value}")
+			return cls.validate_range(prop, int(number))
+		if prop.type == 'FLOAT':
+			return cls.validate_range(prop, float(value))
+		if prop.type == 'ENUM':
+			value = str(value).strip()
+			identifiers = cls.enum_identifiers(prop)
+			if value not in identifiers:
+				raise ValueError(f"Setting '{prop.identifier}' must be one of {', '.join(identifiers)}, not '{value}'")
+			return value
+		return str(value)
+
+	@staticmethod
+	def validate_range(prop, value):
+		if not prop.hard_min <= value <= prop.hard_max:
+			raise ValueError(f"Setting '{prop.identifier}' must be within [{prop.hard_min}, {prop.hard_max}], not {value}")
+		return value
+
+	@staticmethod
+	def enum_identifiers(prop) -> list:
+		# The style enum has dynamic items, RNA reports none of them without a context
+		if prop.identifier == "style":
+			return [identifier for identifier, name, filename in STYLE_PREVIEWS]
+		return [item.identifier for item in prop.enum_items]
+
+	def to_dict(self) -> dict:
+		return {prop.identifier: getattr(self, prop.identifier) for prop in self.properties()}
 
 
 ################################################################################
@@ -402,6 +594,8 @@ class DisplayValuePanel(SegmentPanel, bpy.types.Panel):
 				col.separator()
 				col.prop(data, "timer_frame_start")
 				col.prop(data, "timer_frame_end")
+			elif data.display_value_numeric == "sequence":
+				col.prop(data, "sequence_filepath")
 
 		elif data.display_type == "clock":
 			layout.prop(data, "display_value_clock", expand=True)
@@ -434,6 +628,11 @@ class DisplayValuePanel(SegmentPanel, bpy.types.Panel):
 				col.separator()
 				col.prop(data, "timer_frame_start")
 				col.prop(data, "timer_frame_end")
+			elif data.display_value_clock == "sequence":
+				layout.use_property_split = True
+				layout.use_property_decorate = False
+				col = layout.column(align=True)
+				col.prop(data, "sequence_filepath")
 
 
 class DisplayAppearancePanel(SegmentPanel, bpy.types.Panel):
@@ -465,6 +664,8 @@ class DisplayAppearancePanel(SegmentPanel, bpy.types.Panel):
 		col.prop(data, "skew")
 		col.prop(data, "extrude")
 
+		layout.operator("segment_addon.update_materials", icon="FILE_REFRESH")
+
 class DisplayStylePanel(SegmentPanel, bpy.types.Panel):
 	bl_label = "Display style"
 	bl_idname = "SEGMENT_PT_display_style"
@@ -475,6 +676,7 @@ class DisplayStylePanel(SegmentPanel, bpy.types.Panel):
 		scene = context.scene
 		data = scene.segment_addon_data
 
+		ensure_style_previews()
 		layout.prop(data, "style", text="", icon="BLANK1")
 		layout.template_icon_view(data, "style", show_labels=True)
 
@@ -496,6 +698,13 @@ class DisplayStylePanel(SegmentPanel, bpy.types.Panel):
 			col.prop(data, "lcd_cell_border_x_width")
 			col.prop(data, "lcd_cell_border_y_width")
 			col.prop(data, "lcd_cell_subpixel_border_width")
+			col.prop(data, "lcd_analytic_cells")
+
+		if data.style != 'plain':
+			col = layout.column(align=True)
+			col.prop(data, "lod_mode")
+			if data.lod_mode == 'distance':
+				col.prop(data, "lod_distance")
 
 class AdvancedPanel(SegmentPanel, bpy.types.Panel):
 	bl_label = "Advanced"
@@ -518,6 +727,15 @@ class AdvancedPanel(SegmentPanel, bpy.types.Panel):
 		layout.use_property_split = False
 		layout.prop(data, "join_display")
 		layout.prop(data, "fuse_display")
+		layout.prop(data, "use_instancing")
+		row = layout.row()
+		row.enabled = data.use_instancing
+		row.prop(data, "realize_instances")
+		layout.prop(data, "attribute_encoding")
+		layout.prop(data, "segment_decoding")
+		layout.prop(data, "use_keyframes")
+		layout.prop(data, "cpu_evaluation")
+		layout.prop(data, "share_material")
 
 		layout.operator("segment_addon.reset_to_defaults")
 
@@ -533,6 +751,8 @@ class GeneratePanel(SegmentPanel, bpy.types.Panel):
 		data = scene.segment_addon_data
 
 		layout.operator("segment_addon.create", icon="RESTRICT_VIEW_OFF")
+		layout.operator("segment_addon.create_batch", icon="FILE")
+		layout.operator("segment_addon.update_layout", icon="FILE_REFRESH")
 
 
 ################################################################################
@@ -549,178 +769,127 @@ class CreateDisplayOperator(bpy.types.Operator):
 		scene = context.scene
 		data = scene.segment_addon_data
 
-		print(f"Creating segment display [digits: {data.digits}]")
-		print("Blend file path: " + SegmentAddon.addon_blend_path)
-
-		# Load resources from the segment blend file
-		link = False
-		with bpy.data.libraries.load(SegmentAddon.addon_blend_path, link=link) as (data_src, data_dst):
-			# Objects that only need to be loaded once
-			objects_to_load = [SEGMENT_DIGIT, SEGMENT_EMPTY, SEGMENT_DOT, SEGMENT_COLON]
-			for o in objects_to_load:
-				if o not in bpy.data.objects:
-					print("Appending prototype object: " + str(o))
-					data_dst.objects.append(o)
-					# Avoid duplicates
-
-			#data_dst.meshes = ['segment_digit_mesh']
-			#data_dst.objects = ['segment_digit', 'segment_empty', 'segment_dot', 'segment_colon']
-			data_dst.materials = ['.7SegmentDisplay', '.7SegmentDisplayBackground']
-			data_dst.node_groups =	[
-									'.7SegmentDecimalProcessor', '.7SegmentClockProcessor',
-									'.7SegmentTimerResolver',
-									'.7SegmentClassicShader', '.7SegmentPlainShader', '.7SegmentPlainLCDShader'
-									]
-		resource = data_dst
-
-		segment_addon = SegmentAddon(context, data, resource)
-		if not segment_addon.validate_data():
-			msg = "SegmentDisplayAddon: Invalid display type!"
-			print(msg)
+		timer = StageTimer()
+		try:
+			# Place the display at the 3D cursor
+			matrix = mathutils.Matrix.Translation(scene.cursor.location)
+			generated_objects = generate_display(data, context.collection, matrix, timer=timer)
+		except ValueError as e:
+			msg = f"SegmentDisplayAddon: {e}"
+			log.error(msg)
 			self.report({'ERROR'}, msg)
+			return {'CANCELLED'}
 
-		# Setup material
-		segment_addon.setup_segment_material()
+		if len(generated_objects) == 0:
+			self.report({'WARNING'}, "SegmentDisplayAddon: No objects generated!")
+		else:
+			select_objects(context, generated_objects)
+			self.report({'INFO'}, f"SegmentDisplayAddon: Generated in {timer.total() * 1000:.1f} ms ({timer.summary()})")
 
-		# Generate digits
-		digit_prototype = bpy.data.objects[SEGMENT_DIGIT]
-		generated_objects = []
+		return {'FINISHED'}
 
-		if data.display_type == "numeric":
-			segment_addon.create_numeric_display(digit_prototype, generated_objects)
-		elif data.display_type == "clock":
-			segment_addon.create_clock_display(digit_prototype, generated_objects)
-
-		# Join objects
-		print(f"SegmentDisplayAddon: Generated {len(generated_objects)} objects!")
-		bpy.ops.object.select_all(action='DESELECT')
-		for o in generated_objects:
-			o.select_set(True)
-
-		if len(generated_objects) > 0:
-			active_obj = generated_objects[0]
-			bpy.context.view_layer.objects.active = active_obj
-
-			# Joining
-			if data.join_display:
-				bpy.ops.object.join()
-				# Rename joined object
-				active_obj.name = "SegmentDisplay" + data.display_type.capitalize() + data.style.capitalize()
-			else:
-				# Name individual objects
-				for i, o in enumerate(generated_objects, 1):
-					o.name = "SegmentDisplay" + data.display_type.capitalize() + data.style.capitalize() + "_digit_" + str(i)
-
-			# Remove doubles
-			if data.fuse_display:
-				bpy.ops.object.mode_set(mode='EDIT')
-				bpy.ops.mesh.select_all(action='SELECT')
-				bpy.ops.mesh.remove_doubles()
-				bpy.ops.object.mode_set(mode='OBJECT')
-
-			# Apply skew
-			if data.skew > 0:
-				skew_value = data.skew
-				skew_value *= -1
-				bpy.ops.object.mode_set(mode='EDIT')
-				bpy.ops.mesh.select_all(action='SELECT')
-				bpy.ops.transform.shear(value=skew_value, orient_axis='Z', orient_type='GLOBAL')
-				bpy.ops.object.mode_set(mode='OBJECT')
-
-			# Delete background
-			if data.hide_background:
-				bpy.ops.object.mode_set(mode='EDIT')
-				bpy.ops.mesh.select_all(action='DESELECT')
-				bpy.context.object.active_material_index = 1
-				old_select_mode = SegmentAddon.get_select_mode()
-				bpy.ops.mesh.select_mode(type="FACE")
-				bpy.ops.object.material_slot_select()
-				bpy.ops.mesh.select_all(action='INVERT')
-				bpy.ops.mesh.delete(type='FACE')
-				bpy.ops.mesh.select_mode(type=old_select_mode)
-				bpy.ops.object.mode_set(mode='OBJECT')
-
-			# Extrude
-			if data.extrude != 0:
-				bpy.ops.object.mode_set(mode='EDIT')
-				bpy.ops.mesh.select_all(action='SELECT')
-				extrude_value = data.extrude
-				bpy.ops.mesh.extrude_region_move(MESH_OT_extrude_region={'use_normal_flip': False,
-								 'use_dissolve_ortho_edges': False,
-								 'mirror': False},
-								 TRANSFORM_OT_translate={
-								'value': (0, 0, extrude_value),
-								'orient_type': 'NORMAL',
-								'constraint_axis': (False, False, True),
-								'mirror': False,
-								'use_proportional_edit': False,
-								'proportional_edit_falloff': 'SMOOTH',
-								'proportional_size': 1,
-								'use_proportional_connected': False,
-								'use_proportional_projected': False,
-								'snap': False,
-								'snap_target': 'CLOSEST',
-								'snap_point': (0, 0, 0),
-								'snap_align': False,
-								'snap_normal': (0, 0, 0),
-								'gpencil_strokes': False,
-								'cursor_transform': False,
-								'texture_space': False,
-								'remove_on_cancel': False,
-								'view2d_edge_pan': False,
-								'release_confirm': False,
-								'use_accurate': False,
-								'use_automerge_and_split': False,
-								})
-				bpy.ops.object.mode_set(mode='OBJECT')
-
-			# Move to origin and scale
-			cursor = bpy.context.scene.cursor.location
-			# if not data.join_display:
-			#	  # We have to move and scale all objects
-			#	  for i, o in enumerate(generated_objects, 1):
-			#		  o.name = "SegmentDisplay" + data.display_type.capitalize() + data.style.capitalize() + "_digit_" + str(i)
-			#	  active_obj.name = "SegmentDisplay" + data.display_type.capitalize() + data.style.capitalize()
-			# else:
-			#	  # Just scale the active object
-
-			bpy.ops.transform.translate(
-				value=(cursor[0], cursor[1], cursor[2]),
-				orient_type='GLOBAL',
-				orient_matrix=((1, 0, 0), (0, 1, 0), (0, 0, 1)),
-				orient_matrix_type='GLOBAL',
-				mirror=False,
-				use_proportional_edit=False,
-				proportional_edit_falloff='SMOOTH',
-				proportional_size=1,
-				use_proportional_connected=False,
-				use_proportional_projected=False,
-			)
-
-			old_pivot_point = bpy.context.scene.tool_settings.transform_pivot_point
-			bpy.context.scene.tool_settings.transform_pivot_point = 'ACTIVE_ELEMENT'
-			scale_factor = data.object_scale
-			bpy.ops.transform.resize(
-				value=(scale_factor, scale_factor, scale_factor),
-				orient_type='GLOBAL',
-				orient_matrix=((1, 0, 0), (0, 1, 0), (0, 0, 1)),
-				orient_matrix_type='GLOBAL',
-				mirror=False,
-				use_proportional_edit=False,
-				proportional_edit_falloff='SMOOTH',
-				proportional_size=1,
-				use_proportional_connected=False,
-				use_proportional_projected=False,
-			)
-			bpy.context.scene.tool_settings.transform_pivot_point = old_pivot_point
 
+class CreateDisplayBatchOperator(bpy.types.Operator, ImportHelper):
+	bl_idname = "segment_addon.create_batch"
+	bl_label = "Create displays from manifest"
+	bl_description = "Create a segment display for every row of a JSON or CSV manifest"
+	bl_options = {'REGISTER', 'UNDO'}
 
-		else:
-			self.report({'WARNING'}, "SegmentDisplayAddon: No objects generated!")
+	filter_glob: bpy.props.StringProperty(
+		default = "*.json;*.csv",
+		options = {'HIDDEN'}
+	)
+	use_scene_settings: bpy.props.BoolProperty(
+		name = "Use scene settings as defaults",
+		description = "Settings missing in the manifest are taken from the addon panel instead of the addon defaults",
+		default = False
+	)
 
+	def execute(self, context):
+		base = DisplayConfig.from_data(context.scene.segment_addon_data) if self.use_scene_settings else None
+		try:
+			rows = load_manifest(self.filepath, base)
+			results = generate_displays(rows, context.collection, mathutils.Matrix.Translation(context.scene.cursor.location))
+		except (OSError, KeyError, ValueError) as e:
+			msg = f"SegmentDisplayAddon: Manifest error: {e}"
+			log.error(msg)
+			self.report({'ERROR'}, msg)
+			return {'CANCELLED'}
+
+		total_time = sum(result.time for result in results)
+		for i, result in enumerate(results):
+			log.info("Display %d (%d objects) generated in %.1f ms (%s)", i, len(result.objects), result.time * 1000, StageTimer.format(result.stages))
+		select_objects(context, [o for result in results for o in result.objects])
+		average = total_time / len(results) if results else 0
+		self.report({'INFO'}, f"SegmentDisplayAddon: Generated {len(results)} displays in {total_time:.3f} s ({average * 1000:.1f} ms per display)")
 		return {'FINISHED'}
 
 
+class UpdateDisplayMaterialsOperator(bpy.types.Operator):
+	bl_idname = "segment_addon.update_materials"
+	bl_label = "Update selected displays"
+	bl_description = "Apply the appearance settings to the materials of the selected displays without generating them again"
+	bl_options = {'REGISTER', 'UNDO'}
+
+	@classmethod
+	def poll(cls, context):
+		return len(context.selected_objects) > 0
+
+	def execute(self, context):
+		data = context.scene.segment_addon_data
+		start = time.perf_counter()
+		updated, skipped = update_display_materials(data, context.selected_objects)
+		duration = time.perf_counter() - start
+
+		if updated == 0:
+			self.report({'WARNING'}, "SegmentDisplayAddon: No displays of the current style selected!")
+			return {'CANCELLED'}
+		msg = f"SegmentDisplayAddon: Updated {updated} objects in {duration * 1000:.1f} ms"
+		if skipped > 0:
+			msg += f", skipped {skipped}"
+		self.report({'INFO'}, msg)
+		return {'FINISHED'}
+
+
+class UpdateDisplayLayoutOperator(bpy.types.Operator):
+	bl_idname = "segment_addon.update_layout"
+	bl_label = "Update display layout"
+	bl_description = "Change the digit counts and separators of the active display to the current settings. Only added and removed digits are built or deleted, modifiers and parenting are kept"
+	bl_options = {'REGISTER', 'UNDO'}
+
+	@classmethod
+	def poll(cls, context):
+		return context.active_object is not None and "segment_config" in context.active_object
+
+	def execute(self, context):
+		data = context.scene.segment_addon_data
+		start = time.perf_counter()
+		try:
+			result = update_display_layout(context.active_object, data)
+		except ValueError as e:
+			msg = f"SegmentDisplayAddon: {e}"
+			log.error(msg)
+			self.report({'ERROR'}, msg)
+			return {'CANCELLED'}
+		duration = time.perf_counter() - start
+
+		mode = "updated" if result.incremental else "rebuilt"
+		self.report({'INFO'}, f"SegmentDisplayAddon: Layout {mode} in {duration * 1000:.1f} ms ({result.added} added, {result.removed} removed, {result.moved} moved)")
+		return {'FINISHED'}
+
+
+def select_objects(context, objects):
+	"""
+	Makes the objects the only selected ones, the first one becomes active.
+	"""
+	for o in context.selected_objects:
+		o.select_set(False)
+	for o in objects:
+		o.select_set(True)
+	if len(objects) > 0:
+		context.view_layer.objects.active = objects[0]
+
+
 class ResetToDefaultsOperator(bpy.types.Operator):
 	bl_idname = "segment_addon.reset_to_defaults"
 	bl_label = "Reset settings to defaults"
@@ -730,7 +899,7 @@ class ResetToDefaultsOperator(bpy.types.Operator):
 	def execute(self, context):
 		scene = context.scene
 		data = scene.segment_addon_data
-		print(f"SegmentAddon: Resetting settings to defaults.")
+		log.info("Resetting settings to defaults")
 		scene.property_unset("segment_addon_data")
 		self.report({'INFO'}, "SegmentDisplayAddon: Reset settings to defaults.")
 		return {'FINISHED'}
@@ -744,10 +913,49 @@ SEGMENT_DIGIT = 'segment_digit'
 SEGMENT_EMPTY = 'segment_empty'
 SEGMENT_DOT = 'segment_dot'
 SEGMENT_COLON = 'segment_colon'
+PROTOTYPE_OBJECTS = [SEGMENT_DIGIT, SEGMENT_EMPTY, SEGMENT_DOT, SEGMENT_COLON]
+# Instance index of the prototypes in the Geometry Nodes backend
+INSTANCE_PROTOTYPES = [SEGMENT_DIGIT, SEGMENT_EMPTY, SEGMENT_DOT, SEGMENT_COLON]
+
+MATERIAL_SEGMENT = '.7SegmentDisplay'
+MATERIAL_BACKGROUND = '.7SegmentDisplayBackground'
+
+NODE_GROUP_TIMER_RESOLVER = '.7SegmentTimerResolver'
+PROCESSOR_NODE_GROUPS = {
+	"numeric": '.7SegmentDecimalProcessor',
+	"clock": '.7SegmentClockProcessor',
+}
+# Display styles: (identifier, name, preview image in resources/styles)
+STYLE_PREVIEWS = [
+	("plain", "Plain", "plain.png"),
+	("classic", "Classic", "classic.png"),
+	("lcd", "LCD", "lcd.png"),
+]
+
+STYLE_NODE_GROUPS = {
+	"plain": '.7SegmentPlainShader',
+	"classic": '.7SegmentClassicShader',
+	"lcd": '.7SegmentPlainLCDShader',
+}
 
 class SegmentAddon:
 	VC_STEP = 0.1
 	VC_STEP_FAILSAFE = 0.01
+	# Inverse of the gamma applied to the "Digit" and "Display" attributes by the SegmentBase node group
+	ATTRIBUTE_GAMMA = 1 / 0.45454
+	# Style group inputs shared by all styles
+	COMMON_STYLE_INPUTS = {
+		"segment_foreground": 1,
+		"segment_digit_background": 2,
+		"segment_emission_strength": 3,
+		"segment_normal_strength": 4,
+	}
+	# Cell gap inputs of the analytic LCD group and their defaults, see lcd_analytic_node_tree()
+	LCD_ANALYTIC_INPUTS = (("Border X", 0.1), ("Border Y", 0.1), ("Subpixel border", 0.02))
+	# Digits per display section the vertex color encoding can address
+	VC_MAX_DIGITS = 10
+	# Attribute data types of the integer "Digit" and "Display" encodings
+	INDEX_ATTRIBUTE_TYPES = {"int8": 'INT8', "int32": 'INT'}
 	DIGIT_WIDTH = 12
 	DIGIT_SEPARATOR_WIDTH = 3
 
@@ -759,10 +967,24 @@ class SegmentAddon:
 	previews = dict()
 	style_previews = "styles_preview"
 
-	def __init__(self, context, data: SegmentAddonData, resource):
-		self.context = context
+	def __init__(self, data: SegmentAddonData, resource, collection):
 		self.data = data
 		self.resource = resource
+		# Collection the generated objects are linked to
+		self.collection = collection
+		# Per display materials, created by setup_segment_material()
+		self.material = None
+		self.background_material = None
+		# Material parameter values by custom property name, see material_parameters()
+		self.parameters = dict()
+		# Optional dictionary for reusing materials with identical settings (batch generation)
+		self.material_cache = None
+		# When set, digits and separators are only recorded as DisplayPiece entries instead of creating objects
+		self.layout_only = False
+		# Prototype copies by prototype name instanced by the last instanced display, see create_instanced_display()
+		self.instance_prototypes = dict()
+		# (frames, values) of the sequence value source, see sequence_samples()
+		self.sequence = None
 
 	def validate_data(self) -> bool:
 		if self.data.display_type == "numeric":
@@ -773,6 +995,125 @@ class SegmentAddon:
 			return False
 		return True
 
+	def validate_attribute_encoding(self):
+		"""
+		Raises a ValueError when the layout has more digits per section than the attribute encoding can address.
+		"""
+		if self.data.attribute_encoding != "color":
+			return
+		if self.data.display_type == "numeric" and max(self.data.digits, self.data.fraction_digits) > self.VC_MAX_DIGITS:
+			raise ValueError(f"More than {self.VC_MAX_DIGITS} digits need integer digit attributes")
+
+	def index_attribute_type(self):
+		"""
+		Returns the data type of the integer "Digit" and "Display" attributes, None for vertex colors.
+		"""
+		return self.INDEX_ATTRIBUTE_TYPES.get(self.data.attribute_encoding)
+
+	@classmethod
+	def attribute_index(cls, value) -> int:
+		"""
+		Converts a "Digit" or "Display" vertex color value (0.1 steps) to the integer index.
+		"""
+		return round(value / cls.VC_STEP)
+
+	def uses_instance_attributes(self) -> bool:
+		"""
+		Instanced displays that are not realized keep the digit and display values as instance attributes.
+		"""
+		return self.data.use_instancing and not self.data.realize_instances
+
+	def uses_timer(self) -> bool:
+		return self.value_source() == "timer" and not self.uses_keyframes()
+
+	def uses_lod(self) -> bool:
+		"""
+		The plain style is the level of detail of the other styles.
+		"""
+		return self.data.lod_mode != "off" and self.data.style != "plain"
+
+	def uses_keyframes(self) -> bool:
+		"""
+		Keyframed displays feed the material with an F-curve that has the offset, divisor and timer range folded in.
+		Sequences are always keyframed, frame and timer values only when enabled.
+		"""
+		if self.data.cpu_evaluation:
+			return False
+		value_source = self.value_source()
+		return value_source == "sequence" or (self.data.use_keyframes and value_source in ("frame", "timer"))
+
+	def value_source(self) -> str:
+		"""
+		Returns how the display value is fed into the material, one of "number", "frame", "timer" or "sequence".
+		"""
+		if self.data.display_type == "numeric":
+			value_source = self.data.display_value_numeric
+		else:
+			value_source = self.data.display_value_clock
+		if value_source in ("seconds", "time"):
+			return "number"
+		return value_source
+
+	def sequence_samples(self) -> tuple:
+		"""
+		Returns the (frames, values) arrays of the sequence file, loaded once per display.
+		"""
+		if self.sequence is None:
+			filepath = bpy.path.abspath(self.data.sequence_filepath)
+			if not filepath:
+				raise ValueError("No sequence file set")
+			try:
+				self.sequence = sequence.load_sequence(filepath)
+			except (OSError, KeyError, IndexError, TypeError, ValueError) as e:
+				raise ValueError(f"Could not load sequence {filepath}: {e}")
+		return self.sequence
+
+	def value_keyframes(self) -> tuple:
+		"""
+		Returns the (frames, values, interpolation, extrapolation) of the F-curve animating the display number.
+		"""
+		data = self.data
+		value_source = self.value_source()
+		if value_source == "sequence":
+			frames, values = self.sequence_samples()
+			return frames, values, 'CONSTANT', 'CONSTANT'
+
+		if value_source == "frame":
+			# (frame + offset) / divisor continued by linear extrapolation
+			divisor = data.frame_divisor if data.display_type == "numeric" else data.clock_frame_divisor
+			scale = 1 / divisor if divisor != 0 else 0
+			offset = data.frame_offset
+			return numpy.array([0., 1.]), numpy.array([offset * scale, (1 + offset) * scale]), 'LINEAR', 'LINEAR'
+
+		if data.display_type == "numeric":
+			timer_from, timer_to = data.timer_number_from, data.timer_number_to
+		else:
+			timer_from, timer_to = data.timer_time_from, data.timer_time_to
+		start, end = data.timer_frame_start, data.timer_frame_end
+		if start >= end:
+			# Jumps to the end value at the end frame, like evaluation.timer_values()
+			return numpy.array([end - 1., end]), numpy.array([timer_from, timer_to]), 'CONSTANT', 'CONSTANT'
+		return numpy.array([start, end], dtype=numpy.float64), numpy.array([timer_from, timer_to]), 'LINEAR', 'CONSTANT'
+
+	def create_value_fcurve(self, id_data, data_path):
+		frames, values, interpolation, extrapolation = self.value_keyframes()
+		return Utils.create_fcurve(id_data, data_path, frames, values, interpolation, extrapolation)
+
+	def required_node_groups(self) -> list:
+		"""
+		Returns the names of the node groups from the addon blend file needed by the current settings.
+		"""
+		node_groups = [STYLE_NODE_GROUPS[self.data.style]]
+		if self.uses_lod():
+			node_groups.append(STYLE_NODE_GROUPS["plain"])
+		if self.data.cpu_evaluation:
+			# The display value is evaluated by the frame change handler
+			return node_groups
+		node_groups.append(PROCESSOR_NODE_GROUPS[self.data.display_type])
+		if self.uses_timer():
+			node_groups.append(NODE_GROUP_TIMER_RESOLVER)
+		return node_groups
+
 	def create_numeric_display(self, digit_prototype, generated):
 		offset_step = self.DIGIT_WIDTH
 		offset = 0
@@ -810,20 +1151,574 @@ class SegmentAddon:
 		if h > 0:
 			offset = self.create_digits(digit_prototype, offset, 0.3, h, offset_step, generated)
 
+	def create_display_layout(self) -> list:
+		"""
+		Returns the list of DisplayPiece entries making up the display, in the order they are generated (right to left).
+		"""
+		pieces = []
+		self.layout_only = True
+		try:
+			digit_prototype = bpy.data.objects[SEGMENT_DIGIT]
+			if self.data.display_type == "numeric":
+				self.create_numeric_display(digit_prototype, pieces)
+			elif self.data.display_type == "clock":
+				self.create_clock_display(digit_prototype, pieces)
+		finally:
+			self.layout_only = False
+		return pieces
+
+	def create_joined_display(self, name, pieces=None):
+		"""
+		Creates the display as a single object.
+		The mesh is written in one pass from the prototype mesh arrays, see DisplayMeshBuilder.
+		"""
+		if pieces is None:
+			pieces = self.create_display_layout()
+		mesh = bpy.data.meshes.new(name)
+		builder = DisplayMeshBuilder(self.background_material, self.material, weld=self.data.fuse_display, index_type=self.index_attribute_type())
+		builder.build(mesh, pieces)
+
+		obj = bpy.data.objects.new(name, mesh)
+		self.collection.objects.link(obj)
+		return obj
+
+	def create_instanced_display(self, name, pieces=None):
+		"""
+		Creates the display as a point cloud with a point per layout piece and a Geometry Nodes modifier
+		instancing the prototype meshes onto the points.
+
+		The points store the prototype index and the "Digit" and "Display" values, which are passed on to the instances.
+		The prototype meshes are copied once per display, so the memory does not grow with the digit count.
+		"""
+		if pieces is None:
+			pieces = self.create_display_layout()
+
+		prototypes = [proto for proto in INSTANCE_PROTOTYPES if any(piece.prototype == proto for piece in pieces)]
+		prototype_objects = {proto: self.create_instance_prototype(name, proto) for proto in prototypes}
+
+		mesh = bpy.data.meshes.new(name)
+		self.write_instance_points(mesh, pieces)
+
+		obj = bpy.data.objects.new(name, mesh)
+		self.collection.objects.link(obj)
+
+		modifier = obj.modifiers.new("SegmentInstances", 'NODES')
+		modifier.node_group = self.instancing_node_tree()
+		for proto, prototype_obj in prototype_objects.items():
+			modifier[modifier.node_group.interface.items_tree[proto].identifier] = prototype_obj
+
+		self.instance_prototypes = prototype_objects
+		return obj
+
+	def create_instance_prototype(self, name, proto):
+		"""
+		Returns a copy of a prototype object with the display materials, to be instanced by an instanced display.
+		"""
+		obj = Utils.copy_object(bpy.data.objects[proto])
+		obj.name = name + "_" + proto
+		obj.location = (0, 0, 0)
+		self.assign_segment_materials(obj.data)
+		if proto != SEGMENT_DIGIT:
+			# Separators are always on, see create_aux()
+			self.create_vertex_color_map_rgb(obj.data, "Segment", 1, 0, 1)
+		return obj
+
+	def write_instance_points(self, mesh, pieces):
+		"""
+		Writes a point per layout piece with the prototype index and the "Digit" and "Display" values into an empty mesh.
+		"""
+		co = numpy.zeros((len(pieces), 3), dtype=numpy.float32)
+		co[:, 0] = [piece.offset for piece in pieces]
+
+		mesh.vertices.add(len(pieces))
+		mesh.vertices.foreach_set("co", co.ravel())
+		mesh.attributes.new("prototype", 'INT', 'POINT').data.foreach_set("value", numpy.array([INSTANCE_PROTOTYPES.index(piece.prototype) for piece in pieces], dtype=numpy.int32))
+		index_type = self.index_attribute_type()
+		if index_type is not None:
+			digits = numpy.array([0 if piece.digit is None else self.attribute_index(piece.digit) for piece in pieces], dtype=numpy.int32)
+			displays = numpy.array([0 if piece.digit is None else self.attribute_index(piece.display) for piece in pieces], dtype=numpy.int32)
+			mesh.attributes.new("Digit", index_type, 'POINT').data.foreach_set("value", digits)
+			mesh.attributes.new("Display", index_type, 'POINT').data.foreach_set("value", displays)
+		else:
+			# Values are stored so that the gamma correction of the SegmentBase node group recovers them exactly
+			failsafe = self.VC_STEP_FAILSAFE
+			digits = numpy.array([0.0 if piece.digit is None else piece.digit + failsafe for piece in pieces], dtype=numpy.float32)
+			displays = numpy.array([0.0 if piece.digit is None else piece.display + failsafe for piece in pieces], dtype=numpy.float32)
+			mesh.attributes.new("Digit", 'FLOAT', 'POINT').data.foreach_set("value", numpy.power(digits, self.ATTRIBUTE_GAMMA))
+			mesh.attributes.new("Display", 'FLOAT', 'POINT').data.foreach_set("value", numpy.power(displays, self.ATTRIBUTE_GAMMA))
+		mesh.update()
+
+	def build_display_mesh(self, name, pieces, materials, skew_center=None):
+		"""
+		Builds and processes the mesh of layout pieces the same way generate_display() does for joined displays.
+		The skew is applied around skew_center, by default the center of the new mesh.
+		Returns the mesh and the skew center.
+		"""
+		mesh = bpy.data.meshes.new(name)
+		builder = DisplayMeshBuilder(materials[0], materials[1], weld=self.data.fuse_display, index_type=self.index_attribute_type())
+		builder.build(mesh, pieces)
+		if self.data.skew != 0:
+			if skew_center is None:
+				skew_center = self.skew_center([mesh])
+			mesh.transform(self.skew_matrix(skew_center))
+		self.process_display_mesh(mesh, StageTimer())
+		return mesh, skew_center or 0.0
+
+	def rebuild_joined_display(self, obj, pieces):
+		"""
+		Replaces the mesh data of a joined display, the object with its modifiers and parenting is kept.
+		"""
+		old_mesh = obj.data
+		mesh, obj["segment_skew_center"] = self.build_display_mesh(old_mesh.name, pieces, list(old_mesh.materials))
+		obj.data = mesh
+		if old_mesh.users == 0:
+			bpy.data.meshes.remove(old_mesh)
+
+	def update_joined_display(self, obj, old_pieces, new_pieces, matches) -> bool:
+		"""
+		Changes the mesh of a joined display from the old to the new layout in place.
+
+		Pieces in both layouts (see match_display_pieces()) keep their geometry and attributes and are only moved,
+		removed pieces are deleted and added pieces are built on their own and appended. The mesh data is rebuilt
+		instead when it has no "segment_piece" face attribute, is extruded, or pieces sharing vertices move apart.
+		Returns True if the mesh was updated in place.
+		"""
+		mesh = obj.data
+		piece_attribute = mesh.attributes.get("segment_piece")
+		if piece_attribute is None or piece_attribute.domain != 'FACE' or self.data.extrude != 0:
+			self.rebuild_joined_display(obj, new_pieces)
+			return False
+
+		face_pieces = numpy.empty(len(mesh.polygons), dtype=numpy.int32)
+		piece_attribute.data.foreach_get("value", face_pieces)
+		loop_totals = numpy.empty(len(mesh.polygons), dtype=numpy.int32)
+		mesh.polygons.foreach_get("loop_total", loop_totals)
+		loop_verts = numpy.empty(len(mesh.loops), dtype=numpy.int32)
+		mesh.loops.foreach_get("vertex_index", loop_verts)
+
+		# Offset change of every kept piece, applied to the vertices of its faces
+		kept = matches >= 0
+		new_offsets = numpy.array([piece.offset for piece in new_pieces] or [0.0])
+		old_offsets = numpy.array([piece.offset for piece in old_pieces])
+		deltas = numpy.where(kept, new_offsets[numpy.maximum(matches, 0)] - old_offsets, 0.0)
+		loop_pieces = numpy.repeat(face_pieces, loop_totals)
+		loop_kept = kept[loop_pieces]
+		vertex_min = numpy.full(len(mesh.vertices), numpy.inf)
+		vertex_max = numpy.full(len(mesh.vertices), -numpy.inf)
+		numpy.minimum.at(vertex_min, loop_verts[loop_kept], deltas[loop_pieces[loop_kept]])
+		numpy.maximum.at(vertex_max, loop_verts[loop_kept], deltas[loop_pieces[loop_kept]])
+		used = numpy.isfinite(vertex_min)
+		if numpy.any(vertex_min[used] != vertex_max[used]):
+			self.rebuild_joined_display(obj, new_pieces)
+			return False
+
+		co = numpy.empty(len(mesh.vertices) * 3, dtype=numpy.float32)
+		mesh.vertices.foreach_get("co", co)
+		co[0::3] += numpy.where(used, vertex_min, 0.0)
+		mesh.vertices.foreach_set("co", co)
+		# Faces of removed pieces are marked with -1
+		piece_attribute.data.foreach_set("value", numpy.where(kept[face_pieces], matches[face_pieces], -1).astype(numpy.int32))
+
+		matched = set(matches[kept].tolist())
+		added = [i for i in range(len(new_pieces)) if i not in matched]
+		added_mesh = None
+		if len(added) > 0:
+			added_mesh, _ = self.build_display_mesh(mesh.name + "_added", [new_pieces[i] for i in added], list(mesh.materials), obj.get("segment_skew_center"))
+			# The builder numbers the pieces of the added mesh from 0
+			added_attribute = added_mesh.attributes["segment_piece"]
+			added_pieces = numpy.empty(len(added_attribute.data), dtype=numpy.int32)
+			added_attribute.data.foreach_get("value", added_pieces)
+			added_attribute.data.foreach_set("value", numpy.asarray(added, dtype=numpy.int32)[added_pieces])
+
+		bm = bmesh.new()
+		bm.from_mesh(mesh)
+		piece_layer = bm.faces.layers.int["segment_piece"]
+		bmesh.ops.delete(bm, geom=[f for f in bm.faces if f[piece_layer] < 0], context='FACES')
+		if added_mesh is not None:
+			bm.from_mesh(added_mesh)
+			bpy.data.meshes.remove(added_mesh)
+			if self.data.fuse_display:
+				# Neighbouring pieces only touch at their open borders
+				border_verts = [v for v in bm.verts if v.is_boundary]
+				bmesh.ops.remove_doubles(bm, verts=border_verts, dist=DisplayMeshBuilder.WELD_DISTANCE)
+		bm.to_mesh(mesh)
+		bm.free()
+		mesh.update()
+		return True
+
+	def update_instanced_display(self, obj, pieces):
+		"""
+		Rewrites the points of an instanced display for a new layout.
+		Prototypes needed by the new layout that the display does not instance yet are added.
+		"""
+		modifier = obj.modifiers["SegmentInstances"]
+		items = modifier.node_group.interface.items_tree
+		prototype_objects = [modifier.get(items[proto].identifier) for proto in INSTANCE_PROTOTYPES]
+		existing = next(o for o in prototype_objects if o is not None)
+		self.background_material, self.material = existing.data.materials[0], existing.data.materials[1]
+
+		for proto, prototype_obj in zip(INSTANCE_PROTOTYPES, prototype_objects):
+			if prototype_obj is not None or not any(piece.prototype == proto for piece in pieces):
+				continue
+			prototype_obj = self.create_instance_prototype(obj.name, proto)
+			if self.data.skew != 0:
+				prototype_obj.data.transform(self.skew_matrix(obj.get("segment_skew_center", 0.0)))
+			self.process_display_mesh(prototype_obj.data, StageTimer())
+			self.apply_object_parameters(prototype_obj)
+			modifier[items[proto].identifier] = prototype_obj
+
+		mesh = obj.data
+		mesh.clear_geometry()
+		self.write_instance_points(mesh, pieces)
+		obj.update_tag()
+
+	def instancing_node_tree(self):
+		"""
+		Returns the Geometry Nodes tree instancing the prototype objects onto the display points.
+		The tree only depends on the realize and fuse settings and is shared by all instanced displays.
+		"""
+		realize = self.data.realize_instances
+		fuse = realize and self.data.fuse_display
+		key = ("instancing", realize, fuse)
+		node_tree = self.resource.get_derived(key)
+		if node_tree is not None:
+			return node_tree
+
+		node_tree = bpy.data.node_groups.new(".7SegmentInstancing", 'GeometryNodeTree')
+		node_tree.interface.new_socket("Geometry", in_out='INPUT', socket_type='NodeSocketGeometry')
+		for proto in INSTANCE_PROTOTYPES:
+			node_tree.interface.new_socket(proto, in_out='INPUT', socket_type='NodeSocketObject')
+		node_tree.interface.new_socket("Geometry", in_out='OUTPUT', socket_type='NodeSocketGeometry')
+		node_tree.is_modifier = True
+
+		nodes = node_tree.nodes
+		links = node_tree.links
+		group_input = nodes.new('NodeGroupInput')
+		group_output = nodes.new('NodeGroupOutput')
+		group_input.location = (-800, 0)
+
+		prototype_index = nodes.new('GeometryNodeInputNamedAttribute')
+		prototype_index.data_type = 'INT'
+		prototype_index.inputs["Name"].default_value = "prototype"
+		prototype_index.location = (-800, -300)
+
+		# One instancing node per prototype, the points are picked by their prototype index
+		join = nodes.new('GeometryNodeJoinGeometry')
+		join.location = (200, 0)
+		for i, proto in enumerate(INSTANCE_PROTOTYPES):
+			object_info = nodes.new('GeometryNodeObjectInfo')
+			object_info.location = (-500, -200 * i)
+			links.new(group_input.outputs[proto], object_info.inputs["Object"])
+
+			compare = nodes.new('FunctionNodeCompare')
+			compare.data_type = 'INT'
+			compare.operation = 'EQUAL'
+			# The integer A and B inputs follow the float ones
+			compare.inputs[3].default_value = i
+			compare.location = (-500, -200 * i - 100)
+			links.new(prototype_index.outputs["Attribute"], compare.inputs[2])
+
+			instance = nodes.new('GeometryNodeInstanceOnPoints')
+			instance.location = (-200, -200 * i)
+			links.new(group_input.outputs["Geometry"], instance.inputs["Points"])
+			links.new(compare.outputs["Result"], instance.inputs["Selection"])
+			links.new(object_info.outputs["Geometry"], instance.inputs["Instance"])
+			links.new(instance.outputs["Instances"], join.inputs["Geometry"])
+
+		output = join.outputs["Geometry"]
+		if realize:
+			realize_node = nodes.new('GeometryNodeRealizeInstances')
+			realize_node.location = (400, 0)
+			links.new(output, realize_node.inputs["Geometry"])
+			output = realize_node.outputs["Geometry"]
+		if fuse:
+			merge = nodes.new('GeometryNodeMergeByDistance')
+			merge.inputs["Distance"].default_value = DisplayMeshBuilder.WELD_DISTANCE
+			merge.location = (600, 0)
+			links.new(output, merge.inputs["Geometry"])
+			output = merge.outputs["Geometry"]
+		group_output.location = (800, 0)
+		links.new(output, group_output.inputs["Geometry"])
+
+		self.resource.set_derived(key, node_tree)
+		return node_tree
+
+	def evaluation_config(self) -> dict:
+		"""
+		Returns the settings needed to evaluate the display value on the CPU, see evaluation.source_numbers().
+		"""
+		config = {"display_type": self.data.display_type, "value_source": self.value_source()}
+		for name, value in self.parameters.items():
+			name = name[len("segment_"):]
+			if name in ("number", "divisor", "float_correction", "frame_offset", "timer_from", "timer_to", "timer_start", "timer_end"):
+				config[name] = value
+		if config["value_source"] == "sequence":
+			frames, values = self.sequence_samples()
+			config["sequence_frames"] = frames.tolist()
+			config["sequence_values"] = values.tolist()
+		return config
+
+	def setup_cpu_evaluation(self, obj, pieces, piece_indices, domain):
+		"""
+		Stores the evaluation settings and the digit layout on a generated object and writes the initial segment masks.
+		piece_indices assigns every element of the domain to a layout piece.
+		"""
+		obj["segment_evaluation"] = self.evaluation_config()
+		obj["segment_digit_indices"] = [-1 if piece.digit is None else self.attribute_index(piece.digit) for piece in pieces]
+		obj["segment_display_indices"] = [0 if piece.display is None else self.attribute_index(piece.display) for piece in pieces]
+		EvaluationCache.discard(obj)
+		mesh = obj.data
+		Utils.ensure_attribute(mesh, "segment_piece", 'INT', domain).data.foreach_set("value", numpy.asarray(piece_indices, dtype=numpy.int32))
+		Utils.ensure_attribute(mesh, "segment_mask", 'INT', domain)
+
+		scene = bpy.context.scene
+		self.update_segment_mask(obj, scene.frame_current if scene is not None else 0)
+
+	def setup_display_evaluation(self, objects, pieces):
+		"""
+		Sets up CPU evaluation for the objects of a generated display.
+		"""
+		if self.data.use_instancing:
+			self.setup_cpu_evaluation(objects[0], pieces, numpy.arange(len(pieces)), 'POINT')
+		elif self.data.join_display:
+			face_counts = [len(bpy.data.objects[piece.prototype].data.polygons) for piece in pieces]
+			self.setup_cpu_evaluation(objects[0], pieces, numpy.repeat(numpy.arange(len(pieces)), face_counts), 'FACE')
+		else:
+			# Objects are created in the layout order, one per piece
+			for obj, piece in zip(objects, self.create_display_layout()):
+				self.setup_cpu_evaluation(obj, [piece], numpy.zeros(len(obj.data.polygons)), 'FACE')
+
+	@staticmethod
+	def update_segment_mask(obj, frame):
+		"""
+		Evaluates the display at the frame and writes the segment mask of every piece to the "segment_mask" attribute.
+		Nothing is written if the masks did not change.
+		"""
+		mesh = obj.data
+		pieces = mesh.attributes.get("segment_piece")
+		masks = mesh.attributes.get("segment_mask")
+		if pieces is None or masks is None:
+			return
+
+		config, digit_indices, display_indices = EvaluationCache.get(obj)
+		piece_masks = evaluation.evaluate_masks(config, frame, digit_indices, display_indices)[0]
+		piece_indices = numpy.empty(len(pieces.data), dtype=numpy.int32)
+		pieces.data.foreach_get("value", piece_indices)
+		values = piece_masks[piece_indices]
+
+		current = numpy.empty(len(masks.data), dtype=numpy.int32)
+		masks.data.foreach_get("value", current)
+		if numpy.array_equal(current, values):
+			return
+		masks.data.foreach_set("value", values)
+		mesh.update()
+
 	def setup_segment_material(self):
-		mat = self.resource.materials[0]
-		self.setup_segment_display_processor(mat)
-		self.setup_display_value(mat)
-		self.setup_display_shader(mat)
+		"""
+		Creates the segment foreground and background materials.
+
+		With share_material enabled the materials are created once per node setup and reused by later displays,
+		the display specific values are then read from object custom properties (see apply_object_parameters()).
+		"""
+		self.parameters = self.material_parameters()
+
+		mat = self.reusable_material(("segment",) + self.shared_material_key())
+		if mat is None:
+			mat = self.resource.materials[MATERIAL_SEGMENT].copy()
+			if self.data.cpu_evaluation:
+				self.setup_segment_bitmask(mat)
+				self.setup_display_shader(mat)
+			else:
+				self.setup_segment_display_processor(mat)
+				self.setup_display_value(mat)
+				self.setup_display_shader(mat)
+
+				# Float correction
+				segment_base_group = mat.node_tree.nodes["segment_base"]
+				self.set_material_input(mat.node_tree, segment_base_group.inputs[2], "segment_float_correction")
+			if self.uses_lod():
+				self.setup_lod_shader(mat)
+
+			self.store_reusable_material(("segment",) + self.shared_material_key(), mat)
 
-		bg_mat = self.resource.materials[1]
-		self.setup_background_material(bg_mat)
+		bg_mat = self.reusable_material(("background",))
+		if bg_mat is None:
+			bg_mat = self.resource.materials[MATERIAL_BACKGROUND].copy()
+			self.setup_background_material(bg_mat)
+			self.store_reusable_material(("background",), bg_mat)
 
-		# Float correction
-		mat.node_tree.nodes["segment_base"].inputs[2].default_value = self.data.float_correction
+		self.material = mat
+		self.background_material = bg_mat
+
+	def reusable_material(self, key):
+		"""
+		Returns an already set up material for the key, or None if a new one has to be created.
+		Shared materials live in the resource cache, otherwise materials are only reused within the material_cache.
+		"""
+		if self.data.share_material:
+			return self.resource.get_derived(("shared_material",) + key)
+		if self.material_cache is not None:
+			mat = self.material_cache.get(self.material_cache_key(key))
+			if ResourceCache.is_valid(mat):
+				return mat
+		return None
+
+	def store_reusable_material(self, key, mat):
+		if self.data.share_material:
+			self.resource.set_derived(("shared_material",) + key, mat)
+		elif self.material_cache is not None:
+			self.material_cache[self.material_cache_key(key)] = mat
+
+	def material_cache_key(self, key) -> tuple:
+		"""
+		Extends the structure key with the baked in parameter values (and keyframes) for the material_cache.
+		"""
+		key = key + tuple(sorted(self.parameters.items()))
+		if self.uses_keyframes():
+			frames, values, interpolation, extrapolation = self.value_keyframes()
+			key += (frames.tobytes(), values.tobytes(), interpolation, extrapolation)
+		return key
+
+	def shared_material_key(self) -> tuple:
+		"""
+		Returns the settings that change the structure of the segment material.
+		Displays that only differ in other settings can share a material.
+		"""
+		if self.data.cpu_evaluation:
+			key = ("cpu", self.data.style, self.uses_instance_attributes())
+		else:
+			value_source = "keyframes" if self.uses_keyframes() else self.value_source()
+			key = (self.data.display_type, self.data.style, value_source, self.uses_instance_attributes())
+		if self.data.style == "lcd":
+			key += ("analytic",) if self.data.lcd_analytic_cells else self.lcd_ramp_points()
+		if self.uses_lod():
+			key += (self.data.lod_mode,)
+		return key
+
+	def material_parameters(self) -> dict:
+		"""
+		Collects the values of all material inputs depending on the current settings.
+		The keys are used as object custom property names in shared material mode.
+		"""
+		data = self.data
+		parameters = {
+			"segment_float_correction": data.float_correction,
+			"segment_divisor": 1.0,
+		}
+
+		value_source = self.value_source()
+		if self.uses_keyframes():
+			# Animated by an F-curve, this is the value at the first keyframe
+			parameters["segment_number"] = float(self.value_keyframes()[1][0])
+		elif value_source == "number":
+			if data.display_type == "numeric":
+				number = data.number
+			elif data.display_value_clock == "seconds":
+				number = data.number_of_seconds
+			else:
+				number = data.hours * 3600 + data.minutes * 60 + data.seconds + (data.milliseconds/1000)
+			parameters["segment_number"] = float(number)
+		elif value_source == "frame":
+			parameters["segment_frame_offset"] = float(data.frame_offset)
+			parameters["segment_divisor"] = float(data.frame_divisor if data.display_type == "numeric" else data.clock_frame_divisor)
+		elif value_source == "timer":
+			if data.display_type == "numeric":
+				parameters["segment_timer_from"] = float(data.timer_number_from)
+				parameters["segment_timer_to"] = float(data.timer_number_to)
+			else:
+				parameters["segment_timer_from"] = float(data.timer_time_from)
+				parameters["segment_timer_to"] = float(data.timer_time_to)
+			parameters["segment_timer_start"] = float(data.timer_frame_start)
+			parameters["segment_timer_end"] = float(data.timer_frame_end)
+
+		parameters.update(self.appearance_parameters())
+		return parameters
+
+	def appearance_parameters(self) -> dict:
+		"""
+		Collects the material inputs that can be changed on existing displays, see update_display_materials().
+		"""
+		data = self.data
+		parameters = dict()
+
+		# Style
+		if data.style == "classic":
+			parameters["segment_noise_strength"] = data.background_noise_strength
+			parameters["segment_noise_scale"] = data.background_noise_scale
+		elif data.style == "lcd":
+			parameters["segment_lcd_cell_width"] = data.lcd_cell_width
+			parameters["segment_lcd_cell_height"] = data.lcd_cell_height
+			parameters["segment_lcd_scale"] = data.lcd_scale
+			parameters["segment_lcd_unlit_strength"] = data.lcd_unit_strength
+			if data.lcd_analytic_cells:
+				parameters["segment_lcd_border_x"] = data.lcd_cell_border_x_width
+				parameters["segment_lcd_border_y"] = data.lcd_cell_border_y_width
+				parameters["segment_lcd_subpixel_border"] = data.lcd_cell_subpixel_border_width
+		if self.uses_lod() and data.lod_mode == "distance":
+			parameters["segment_lod_distance"] = data.lod_distance
+
+		# Colors
+		digit_foreground = self.color_property_to_rgba_tuple(data.digit_foreground)
+		digit_background = self.color_property_to_rgba_tuple(data.digit_background)
+		if not data.digit_background_override:
+			if (data.style == 'lcd'):
+				digit_background = (0., 0., 0., 1.)
+			else:
+				dim_factor = data.auto_background_dim_factor
+				digit_background = self.rgba_tuple_multiply(digit_foreground, dim_factor)
+		parameters["segment_foreground"] = digit_foreground
+		parameters["segment_digit_background"] = digit_background
+		parameters["segment_emission_strength"] = data.emission_strength
+		parameters["segment_normal_strength"] = data.normal_strength
+		parameters["segment_background"] = self.color_property_to_rgba_tuple(data.background)
+
+		return parameters
+
+	def set_material_input(self, node_tree, socket, name):
+		"""
+		Sets a material node input to the named parameter value.
+
+		In shared material mode the input is instead linked to an Attribute node reading the object
+		custom property of the same name, so the value can differ between displays using the material.
+		"""
+		value = self.parameters[name]
+		if not self.data.share_material:
+			socket.default_value = value
+			return
+
+		attribute_node = node_tree.nodes.new(type="ShaderNodeAttribute")
+		attribute_node.attribute_type = 'OBJECT'
+		attribute_node.attribute_name = name
+		attribute_node.label = name
+		index = list(socket.node.inputs).index(socket)
+		attribute_node.location = (socket.node.location[0] - 200, socket.node.location[1] - 40 * index)
+		attribute_node.hide = True
+		output = attribute_node.outputs["Color"] if isinstance(value, tuple) else attribute_node.outputs["Fac"]
+		node_tree.links.new(output, socket)
+
+	def apply_object_parameters(self, obj):
+		"""
+		Stores the material parameters as custom properties of a generated display object.
+		Only needed in shared material mode, otherwise the values are baked into the material.
+		The segment_lod property selecting the level of detail is always added when used.
+		"""
+		if self.uses_lod() and self.data.lod_mode == "object":
+			obj["segment_lod"] = 0
+		if not self.data.share_material:
+			return
+		for name, value in self.parameters.items():
+			obj[name] = value
+		if self.uses_keyframes():
+			self.create_value_fcurve(obj, '["segment_number"]')
 
 	def setup_background_material(self, mat):
-		mat.node_tree.nodes['RGB'].outputs[0].default_value = (self.data.background.r, self.data.background.g, self.data.background.b, 1.0)
+		if self.data.share_material:
+			# The RGB node feeds the base color, replace it with the object attribute
+			rgb_node = mat.node_tree.nodes['RGB']
+			for link in list(rgb_node.outputs[0].links):
+				self.set_material_input(mat.node_tree, link.to_socket, "segment_background")
+		else:
+			mat.node_tree.nodes['RGB'].outputs[0].default_value = self.parameters["segment_background"]
 
 	def setup_display_shader(self, mat):
 		"""
@@ -838,65 +1733,272 @@ class SegmentAddon:
 		# Connect mask to the shader group
 		mat.node_tree.links.new(mat.node_tree.nodes['segment_base'].outputs[0], shader_node_group.inputs[0])
 
-		# Set style specific settings
-		if self.data.style == "plain":
-			pass
-		elif self.data.style == "classic":
-			shader_node_group.inputs[5].default_value = self.data.background_noise_strength
-			shader_node_group.inputs[6].default_value = self.data.background_noise_scale
+		if self.data.style == "lcd" and self.data.lcd_analytic_cells:
+			# The cell gaps are inputs of the analytic group, set below with the other style settings
+			shader_node_group.node_tree = self.lcd_analytic_node_tree()
 		elif self.data.style == "lcd":
-			shader_node_group.inputs[5].default_value = self.data.lcd_cell_width
-			shader_node_group.inputs[6].default_value = self.data.lcd_cell_height
-			shader_node_group.inputs[7].default_value = self.data.lcd_scale
-			shader_node_group.inputs[8].default_value = self.data.lcd_unit_strength
-
 			# Process and set the rgb cell border
-			cell_x_ramp = shader_node_group.node_tree.nodes['segment_lcd_shader'].node_tree.nodes['cell_x_ramp']
-			cell_y_ramp = shader_node_group.node_tree.nodes['segment_lcd_shader'].node_tree.nodes['cell_y_ramp']
-			x_points = SegmentAddon.lcd_style_calculate_x_ramp(self.data.lcd_cell_border_x_width, self.data.lcd_cell_subpixel_border_width)
-			y_points = SegmentAddon.lcd_style_calculate_y_ramp(self.data.lcd_cell_border_y_width)
-			print(x_points)
-			print(y_points)
-			for i, p in enumerate(x_points):
-				cell_x_ramp.color_ramp.elements[i+1].position = p
-			for i, p in enumerate(y_points):
-				cell_y_ramp.color_ramp.elements[i+1].position = p
-
-		# Set common settings
-		digit_foreground = self.color_property_to_rgba_tuple(self.data.digit_foreground)
-		digit_background = self.color_property_to_rgba_tuple(self.data.digit_background)
-		if not self.data.digit_background_override:
-			if (self.data.style == 'lcd'):
-				digit_background = (0., 0., 0., 1.)
-			else:
-				dim_factor = self.data.auto_background_dim_factor
-				digit_background = self.rgba_tuple_multiply(digit_foreground, dim_factor)
-
-		shader_node_group.inputs[1].default_value = digit_foreground
-		shader_node_group.inputs[2].default_value = digit_background
-		shader_node_group.inputs[3].default_value = self.data.emission_strength
-		shader_node_group.inputs[4].default_value = self.data.normal_strength
+			x_points, y_points = self.lcd_ramp_points()
+
+			# The ramps live in the shared LCD node group, so a copy is kept for every distinct cell shape
+			key = ("lcd_shader", x_points, y_points)
+			lcd_node_tree = self.resource.get_derived(key)
+			if lcd_node_tree is None:
+				lcd_node_tree = shader_node_group.node_tree.copy()
+				lcd_node = lcd_node_tree.nodes['segment_lcd_shader']
+				lcd_node.node_tree = lcd_node.node_tree.copy()
+				cell_x_ramp = lcd_node.node_tree.nodes['cell_x_ramp']
+				cell_y_ramp = lcd_node.node_tree.nodes['cell_y_ramp']
+				for i, p in enumerate(x_points):
+					cell_x_ramp.color_ramp.elements[i+1].position = p
+				for i, p in enumerate(y_points):
+					cell_y_ramp.color_ramp.elements[i+1].position = p
+				self.resource.set_derived(key, lcd_node_tree)
+			shader_node_group.node_tree = lcd_node_tree
+
+		# Set the common and style specific settings
+		node_tree = mat.node_tree
+		for name, index in self.style_shader_inputs().items():
+			self.set_material_input(node_tree, shader_node_group.inputs[index], name)
 
 		# Connect the shader group to the principled shader
-		principled = mat.node_tree.nodes['segment_principled']
-		mat.node_tree.links.new(shader_node_group.outputs[0], principled.inputs['Base Color']) # Base
-		mat.node_tree.links.new(shader_node_group.outputs[1], principled.inputs['Roughness']) # Roughness
-		mat.node_tree.links.new(shader_node_group.outputs[2], principled.inputs['Emission Color']) # Emission
-		mat.node_tree.links.new(shader_node_group.outputs[3], principled.inputs['Emission Strength']) # Emission strength
-		mat.node_tree.links.new(shader_node_group.outputs[4], principled.inputs['Normal']) # Normal
+		self.link_style_outputs(mat.node_tree, shader_node_group, mat.node_tree.nodes['segment_principled'])
 
-	def create_display_style_shader(self, mat):
-		node_tree = None
+	@staticmethod
+	def link_style_outputs(node_tree, shader_node_group, principled):
+		node_tree.links.new(shader_node_group.outputs[0], principled.inputs['Base Color']) # Base
+		node_tree.links.new(shader_node_group.outputs[1], principled.inputs['Roughness']) # Roughness
+		node_tree.links.new(shader_node_group.outputs[2], principled.inputs['Emission Color']) # Emission
+		node_tree.links.new(shader_node_group.outputs[3], principled.inputs['Emission Strength']) # Emission strength
+		node_tree.links.new(shader_node_group.outputs[4], principled.inputs['Normal']) # Normal
+
+	def setup_lod_shader(self, mat):
+		"""
+		Adds the plain style as a level of detail for distant displays.
 
-		if self.data.style == "plain":
-			node_tree = self.resource.node_groups[4]
-		elif self.data.style == "classic":
-			node_tree = self.resource.node_groups[3]
-		elif self.data.style == 'lcd':
-			node_tree = self.resource.node_groups[5]
+		The full and the plain style feed their own principled shader and are mixed by a Mix Shader.
+		Cycles skips the nodes that only feed the closure with zero weight, so the style textures, noise
+		and LCD cells are not evaluated for displays rendered with the plain style.
+		"""
+		node_tree = mat.node_tree
+		nodes = node_tree.nodes
+		links = node_tree.links
+		principled = nodes['segment_principled']
+
+		lod_group = nodes.new(type='ShaderNodeGroup')
+		lod_group.node_tree = self.resource.node_groups[STYLE_NODE_GROUPS["plain"]]
+		lod_group.name = "segment_lod_shader"
+		lod_group.location = (principled.location[0] - 400, principled.location[1] - 750)
+		links.new(nodes['segment_base'].outputs[0], lod_group.inputs[0])
+		for name, index in self.COMMON_STYLE_INPUTS.items():
+			self.set_material_input(node_tree, lod_group.inputs[index], name)
+
+		lod_principled = nodes.new(type='ShaderNodeBsdfPrincipled')
+		lod_principled.name = "segment_lod_principled"
+		lod_principled.location = (principled.location[0], principled.location[1] - 750)
+		lod_principled.distribution = principled.distribution
+		lod_principled.subsurface_method = principled.subsurface_method
+		for socket, lod_socket in zip(principled.inputs, lod_principled.inputs):
+			if not socket.is_linked and hasattr(socket, "default_value"):
+				lod_socket.default_value = socket.default_value
+		self.link_style_outputs(node_tree, lod_group, lod_principled)
+
+		mix = nodes.new(type='ShaderNodeMixShader')
+		mix.name = "segment_lod_mix"
+		mix.location = (principled.location[0] + 300, principled.location[1])
+		links.new(principled.outputs[0], mix.inputs[1])
+		links.new(lod_principled.outputs[0], mix.inputs[2])
+		links.new(mix.outputs[0], nodes['Material Output'].inputs['Surface'])
+
+		if self.data.lod_mode == "distance":
+			camera = nodes.new(type='ShaderNodeCameraData')
+			camera.location = (mix.location[0] - 400, mix.location[1] + 300)
+			far = nodes.new(type='ShaderNodeMath')
+			far.operation = 'GREATER_THAN'
+			far.name = "segment_lod_far"
+			far.location = (mix.location[0] - 200, mix.location[1] + 300)
+			links.new(camera.outputs['View Distance'], far.inputs[0])
+			self.set_material_input(node_tree, far.inputs[1], "segment_lod_distance")
+			links.new(far.outputs[0], mix.inputs[0])
+		else:
+			lod_attribute = nodes.new(type='ShaderNodeAttribute')
+			lod_attribute.attribute_type = 'OBJECT'
+			lod_attribute.attribute_name = "segment_lod"
+			lod_attribute.location = (mix.location[0] - 200, mix.location[1] + 300)
+			links.new(lod_attribute.outputs["Fac"], mix.inputs[0])
 
-		# Rename to be unique
+	def style_shader_inputs(self) -> dict:
+		"""
+		Returns the input index on the display style group of every style parameter.
+		"""
+		inputs = dict(self.COMMON_STYLE_INPUTS)
+		if self.data.style == "classic":
+			inputs["segment_noise_strength"] = 5
+			inputs["segment_noise_scale"] = 6
+		elif self.data.style == "lcd":
+			inputs["segment_lcd_cell_width"] = 5
+			inputs["segment_lcd_cell_height"] = 6
+			inputs["segment_lcd_scale"] = 7
+			inputs["segment_lcd_unlit_strength"] = 8
+			if self.data.lcd_analytic_cells:
+				inputs["segment_lcd_border_x"] = 9
+				inputs["segment_lcd_border_y"] = 10
+				inputs["segment_lcd_subpixel_border"] = 11
+		return inputs
+
+	@staticmethod
+	def instanced_prototypes(obj) -> list:
+		"""
+		Returns the prototype objects instanced by a display generated with Geometry Nodes instancing.
+		"""
+		prototypes = []
+		modifier = obj.modifiers.get("SegmentInstances")
+		if modifier is not None and modifier.node_group is not None:
+			for proto in INSTANCE_PROTOTYPES:
+				item = modifier.node_group.interface.items_tree.get(proto)
+				prototype_obj = modifier.get(item.identifier) if item is not None else None
+				if prototype_obj is not None:
+					prototypes.append(prototype_obj)
+		return prototypes
+
+	@classmethod
+	def display_materials(cls, obj) -> list:
+		"""
+		Returns the materials of a generated display object, including the ones of instanced prototypes.
+		"""
+		return [slot.material for o in [obj] + cls.instanced_prototypes(obj) for slot in o.material_slots if slot.material is not None]
+
+	def update_material(self, mat, parameters) -> bool:
+		"""
+		Writes the appearance parameters into the node inputs of a display material.
+		Returns False for materials that are not display materials of the current style.
+		"""
+		if mat.node_tree is None:
+			return False
+		nodes = mat.node_tree.nodes
+		style_node = nodes.get(STYLE_NODE_GROUPS[self.data.style])
+		if style_node is not None:
+			for name, index in self.style_shader_inputs().items():
+				# LCD materials using the cell ramps have no cell gap inputs
+				if index < len(style_node.inputs):
+					style_node.inputs[index].default_value = parameters[name]
+			lod_node = nodes.get("segment_lod_shader")
+			if lod_node is not None:
+				for name, index in self.COMMON_STYLE_INPUTS.items():
+					lod_node.inputs[index].default_value = parameters[name]
+			far_node = nodes.get("segment_lod_far")
+			if far_node is not None and "segment_lod_distance" in parameters:
+				far_node.inputs[1].default_value = parameters["segment_lod_distance"]
+			return True
+		if 'segment_base' not in nodes and 'RGB' in nodes:
+			nodes['RGB'].outputs[0].default_value = parameters["segment_background"]
+			return True
+		return False
+
+	def lcd_analytic_node_tree(self):
+		"""
+		Returns a variant of the LCD style group computing the pixel cells with math nodes instead of the cell ramps.
+		The cell gaps are group inputs, so a single group is shared by all LCD displays.
+		"""
+		node_tree = self.resource.get_derived(("lcd_analytic_shader",))
+		if node_tree is not None:
+			return node_tree
+
+		node_tree = self.resource.node_groups[STYLE_NODE_GROUPS["lcd"]].copy()
+		node_tree.name = ".7SegmentPlainLCDAnalyticShader"
+		lcd_node = node_tree.nodes['segment_lcd_shader']
+		lcd_node.node_tree = self.lcd_analytic_cells_node_tree(lcd_node.node_tree)
+		group_input = Utils.group_input_node(node_tree)
+		for name, default in self.LCD_ANALYTIC_INPUTS:
+			socket = node_tree.interface.new_socket(name, in_out='INPUT', socket_type='NodeSocketFloat')
+			socket.default_value = default
+			node_tree.links.new(group_input.outputs[name], lcd_node.inputs[name])
+
+		self.resource.set_derived(("lcd_analytic_shader",), node_tree)
+		return node_tree
+
+	def lcd_analytic_cells_node_tree(self, lcd_node_tree):
+		"""
+		Copies the 7SegmentLCDShader group and replaces the cell_x_ramp and cell_y_ramp nodes with math nodes.
+		Same cell shape as the ramp positions of lcd_style_calculate_x_ramp() and lcd_style_calculate_y_ramp().
+		"""
+		node_tree = lcd_node_tree.copy()
+		node_tree.name = ".7SegmentLCDAnalyticShader"
+		for name, default in self.LCD_ANALYTIC_INPUTS:
+			node_tree.interface.new_socket(name, in_out='INPUT', socket_type='NodeSocketFloat').default_value = default
+		nodes = node_tree.nodes
+		links = node_tree.links
+
+		def ramp_links(name):
+			# The factor source and the driven sockets of a cell ramp, found by the links so that other node names do not matter
+			ramp = nodes.get(name)
+			if ramp is None or not ramp.inputs["Fac"].is_linked or not ramp.outputs["Color"].is_linked or ramp.outputs["Alpha"].is_linked:
+				raise ValueError(f"The {name} node of {lcd_node_tree.name} is not linked as expected")
+			return ramp.inputs["Fac"].links[0].from_socket, [link.to_socket for link in ramp.outputs["Color"].links]
+
+		x_factor, x_targets = ramp_links('cell_x_ramp')
+		y_factor, y_targets = ramp_links('cell_y_ramp')
+		x, y = nodes['cell_x_ramp'].location
+		nodes.remove(nodes['cell_x_ramp'])
+		nodes.remove(nodes['cell_y_ramp'])
+
+		def math_node(operation, a, b, dx, dy, c=None):
+			node = nodes.new('ShaderNodeMath')
+			node.operation = operation
+			node.location = (x + dx, y + dy)
+			node.hide = True
+			for i, value in enumerate((a, b, c)):
+				if value is None:
+					continue
+				if isinstance(value, bpy.types.NodeSocket):
+					links.new(value, node.inputs[i])
+				else:
+					node.inputs[i].default_value = value
+			return node.outputs[0]
+
+		def band(value, start, end, dx, dy):
+			# 1 for start <= value < end, like a constant ramp element between the two positions
+			return math_node('SUBTRACT', math_node('LESS_THAN', value, end, dx - 150, dy), math_node('LESS_THAN', value, start, dx - 150, dy - 40), dx, dy)
+
+		group_input = Utils.group_input_node(node_tree)
+		border_x = group_input.outputs["Border X"]
+		border_y = group_input.outputs["Border Y"]
+		subpixel_border = group_input.outputs["Subpixel border"]
+
+		# Subpixel edges, a pixel is the x border, the r, g, b subpixels separated by the subpixel border and the x border
+		p1 = math_node('MULTIPLY', border_x, 0.5, -600, 0)
+		subpixel = math_node('DIVIDE', math_node('MULTIPLY_ADD', subpixel_border, -2, -600, -40, c=math_node('SUBTRACT', 1, border_x, -750, -40)), 3, -450, -40)
+		p2 = math_node('ADD', p1, subpixel, -450, 0)
+		p3 = math_node('ADD', p2, subpixel_border, -450, 40)
+		p4 = math_node('ADD', p3, subpixel, -300, 40)
+		p5 = math_node('ADD', p4, subpixel_border, -300, 80)
+		p6 = math_node('SUBTRACT', 1, p1, -300, 120)
+
+		cell_x = nodes.new('ShaderNodeCombineColor')
+		cell_x.location = (x + 150, y)
+		links.new(band(x_factor, p1, p2, 0, 0), cell_x.inputs["Red"])
+		links.new(band(x_factor, p3, p4, 0, 80), cell_x.inputs["Green"])
+		links.new(band(x_factor, p5, p6, 0, 160), cell_x.inputs["Blue"])
+
+		q1 = math_node('MULTIPLY', border_y, 0.5, -600, -200)
+		cell_y = band(y_factor, q1, math_node('SUBTRACT', 1, q1, -450, -200), 0, -200)
+
+		for target in x_targets:
+			links.new(cell_x.outputs["Color"], target)
+		for target in y_targets:
+			links.new(cell_y, target)
+		return node_tree
+
+	def lcd_ramp_points(self) -> tuple:
+		"""
+		Returns the x and y cell ramp positions of the LCD style.
+		"""
+		x_points = SegmentAddon.lcd_style_calculate_x_ramp(self.data.lcd_cell_border_x_width, self.data.lcd_cell_subpixel_border_width)
+		y_points = SegmentAddon.lcd_style_calculate_y_ramp(self.data.lcd_cell_border_y_width)
+		return x_points, y_points
 
+	def create_display_style_shader(self, mat):
+		node_tree = self.resource.node_groups[STYLE_NODE_GROUPS[self.data.style]]
 
 		node_group = mat.node_tree.nodes.new(type='ShaderNodeGroup')
 		node_group.node_tree = node_tree
@@ -907,51 +2009,77 @@ class SegmentAddon:
 		"""
 		Sets up the 7SegmentBase number input to reflect display value settings.
 		"""
-		if self.data.display_type == "numeric":
-			if self.data.display_value_numeric == "number":
-				self.setup_numeric_number_display_value(mat, self.data.number)
-			elif self.data.display_value_numeric == "frame":
-				self.setup_numeric_frame_display_value(mat, self.data.frame_divisor)
-			elif self.data.display_value_numeric == "timer":
-				self.setup_numeric_timer_display_value(mat, self.data.timer_number_from, self.data.timer_number_to)
-		elif self.data.display_type == 'clock':
-			if self.data.display_value_clock == "seconds":
-				self.setup_numeric_number_display_value(mat, self.data.number_of_seconds)
-			elif self.data.display_value_clock == "time":
-				self.setup_clock_time_display_value(mat)
-			elif self.data.display_value_clock == "frame":
-				self.setup_numeric_frame_display_value(mat, self.data.clock_frame_divisor)
-			elif self.data.display_value_clock == "timer":
-				self.setup_numeric_timer_display_value(mat, self.data.timer_time_from, self.data.timer_time_to)
-
-	def setup_numeric_number_display_value(self, mat, number):
+		value_source = self.value_source()
+		if self.uses_keyframes():
+			self.setup_numeric_keyframed_display_value(mat)
+		elif value_source == "number":
+			self.setup_numeric_number_display_value(mat)
+		elif value_source == "frame":
+			self.setup_numeric_frame_display_value(mat)
+		elif value_source == "timer":
+			self.setup_numeric_timer_display_value(mat)
+
+	def setup_numeric_number_display_value(self, mat):
 		"""
 		Connects a simple value node to the number input.
 		"""
-		# Get number from the settings and set it as input for the segment base group
-		value_node = mat.node_tree.nodes.new(type="ShaderNodeValue")
 		segment_base_group = mat.node_tree.nodes['segment_base']
+		if self.data.share_material:
+			self.set_material_input(mat.node_tree, segment_base_group.inputs[0], "segment_number")
+		else:
+			# Get number from the settings and set it as input for the segment base group
+			value_node = mat.node_tree.nodes.new(type="ShaderNodeValue")
+			value_node.outputs[0].default_value = self.parameters["segment_number"]
+			mat.node_tree.links.new(value_node.outputs[0], segment_base_group.inputs[0])
+			Utils.move_node(value_node, 450, 300)
 
-		value_node.outputs[0].default_value = number
-		mat.node_tree.links.new(value_node.outputs[0], segment_base_group.inputs[0])
-		Utils.move_node(value_node, 450, 300)
-
-		# Set divisor to 1
-		mat.node_tree.nodes["segment_base"].inputs[1].default_value = 1
+		# Divisor is 1
+		self.set_material_input(mat.node_tree, segment_base_group.inputs[1], "segment_divisor")
 
-	def setup_numeric_frame_display_value(self, mat, divisor):
+	def setup_numeric_frame_display_value(self, mat):
 		"""
 		Connects an animated frame value node to the number input.
 		"""
-		frame_node = Utils.create_frame_value_node(mat.node_tree, self.data.frame_offset)
 		segment_base_group = mat.node_tree.nodes['segment_base']
+		if self.data.share_material:
+			# The driver can't read object properties, the offset is added by a math node instead
+			frame_node = Utils.create_frame_value_node(mat.node_tree)
+			offset_node = mat.node_tree.nodes.new(type="ShaderNodeMath")
+			offset_node.operation = 'ADD'
+			Utils.move_node(offset_node, 450, 300)
+			mat.node_tree.links.new(frame_node.outputs[0], offset_node.inputs[0])
+			mat.node_tree.links.new(offset_node.outputs[0], segment_base_group.inputs[0])
+			self.set_material_input(mat.node_tree, offset_node.inputs[1], "segment_frame_offset")
+			Utils.move_node(frame_node, 450-190, 300)
+		else:
+			frame_node = Utils.create_frame_value_node(mat.node_tree, self.data.frame_offset)
+			mat.node_tree.links.new(frame_node.outputs[0], segment_base_group.inputs[0])
+			Utils.move_node(frame_node, 450, 300)
 
-		mat.node_tree.links.new(frame_node.outputs[0], segment_base_group.inputs[0])
-		mat.node_tree.nodes["segment_base"].inputs[1].default_value = divisor
-
-		Utils.move_node(frame_node, 450, 300)
+		self.set_material_input(mat.node_tree, segment_base_group.inputs[1], "segment_divisor")
 
-	def setup_numeric_timer_display_value(self, mat, from_value, to_value):
+	def setup_numeric_keyframed_display_value(self, mat):
+		"""
+		Connects a value node animated by an F-curve to the number input, see value_keyframes().
+		Sequence samples are held until the next sample, frame and timer values are interpolated linearly.
+		"""
+		segment_base_group = mat.node_tree.nodes['segment_base']
+		if self.data.share_material:
+			# The keyframes are on the segment_number property of every display object, see apply_object_parameters()
+			self.set_material_input(mat.node_tree, segment_base_group.inputs[0], "segment_number")
+		else:
+			value_node = mat.node_tree.nodes.new(type="ShaderNodeValue")
+			value_node.name = "segment_keyframed_value"
+			value_node.label = self.value_source()
+			value_node.outputs[0].default_value = self.parameters["segment_number"]
+			mat.node_tree.links.new(value_node.outputs[0], segment_base_group.inputs[0])
+			Utils.move_node(value_node, 450, 300)
+			self.create_value_fcurve(mat.node_tree, value_node.outputs[0].path_from_id("default_value"))
+
+		# Divisor is 1
+		self.set_material_input(mat.node_tree, segment_base_group.inputs[1], "segment_divisor")
+
+	def setup_numeric_timer_display_value(self, mat):
 		"""
 		Timer is realized by running the frame value through the 7SegmentTimerResolver node.
 		"""
@@ -961,7 +2089,7 @@ class SegmentAddon:
 		Utils.move_node(frame_node, 450-190, 300)
 
 		# Create timer resolver group
-		timer_resolver_tree = self.resource.node_groups[2]
+		timer_resolver_tree = self.resource.node_groups[NODE_GROUP_TIMER_RESOLVER]
 		timer_resolver_group = mat.node_tree.nodes.new(type='ShaderNodeGroup')
 		timer_resolver_group.node_tree = timer_resolver_tree
 		timer_resolver_group.name = timer_resolver_tree.name
@@ -971,50 +2099,264 @@ class SegmentAddon:
 		mat.node_tree.links.new(frame_node.outputs[0], timer_resolver_group.inputs[4])
 		mat.node_tree.links.new(timer_resolver_group.outputs[0], segment_base_group.inputs[0])
 
-		# Set divisor to 1
-		mat.node_tree.nodes["segment_base"].inputs[1].default_value = 1
+		# Divisor is 1
+		self.set_material_input(mat.node_tree, segment_base_group.inputs[1], "segment_divisor")
 
 		# Set remaining timer resolver inputs according to settings
-		timer_resolver_group.inputs[0].default_value = from_value
-		timer_resolver_group.inputs[1].default_value = to_value
-		timer_resolver_group.inputs[2].default_value = self.data.timer_frame_start
-		timer_resolver_group.inputs[3].default_value = self.data.timer_frame_end
-
-	def setup_clock_time_display_value(self, mat):
-		hours = self.data.hours
-		minutes = self.data.minutes;
-		seconds = self.data.seconds
-		milliseconds = self.data.milliseconds
-		number = hours * 3600 + minutes * 60 + seconds + (milliseconds/1000)
-		self.setup_numeric_number_display_value(mat, number)
+		self.set_material_input(mat.node_tree, timer_resolver_group.inputs[0], "segment_timer_from")
+		self.set_material_input(mat.node_tree, timer_resolver_group.inputs[1], "segment_timer_to")
+		self.set_material_input(mat.node_tree, timer_resolver_group.inputs[2], "segment_timer_start")
+		self.set_material_input(mat.node_tree, timer_resolver_group.inputs[3], "segment_timer_end")
 
 	def setup_segment_display_processor(self, mat):
 		"""
 		Sets the node group responsible for adjusting the 7SegmentCore number input using the display vertex color.
 		"""
 		segment_base_group = mat.node_tree.nodes['segment_base']
-		number_node = segment_base_group.node_tree.nodes['number_adjusted']
-		display_node = segment_base_group.node_tree.nodes['display_converted']
+
+		# Every display type needs its own copy of the base group with the matching processor
+		key = ("segment_base", self.data.display_type, self.uses_instance_attributes(), self.index_attribute_type() is not None, self.data.segment_decoding)
+		base_node_tree = self.resource.get_derived(key)
+		if base_node_tree is None:
+			base_node_tree = segment_base_group.node_tree.copy()
+			self.setup_segment_base_processor(base_node_tree)
+			if self.index_attribute_type() is not None:
+				self.setup_segment_base_index_attributes(base_node_tree)
+			if self.data.segment_decoding == "lookup":
+				# Same inputs and output as 7SegmentCore
+				self.replace_group_node_tree(base_node_tree, base_node_tree.nodes['segment_core'], self.glyph_core_node_tree())
+			if self.uses_instance_attributes():
+				# Digit and display values are stored on the instances, not on the instanced mesh
+				for node in base_node_tree.nodes:
+					if node.type == 'ATTRIBUTE' and node.attribute_name in ("Digit", "Display"):
+						node.attribute_type = 'INSTANCER'
+			self.resource.set_derived(key, base_node_tree)
+		segment_base_group.node_tree = base_node_tree
+
+	@staticmethod
+	def replace_group_node_tree(node_tree, group_node, group_tree):
+		"""
+		Swaps the node tree of a group node and restores its links by socket name.
+		Links to sockets the new group does not have raise a ValueError instead of being dropped silently.
+		"""
+		input_links = [(link.from_socket, link.to_socket.name) for link in node_tree.links if link.to_node == group_node]
+		output_links = [(link.from_socket.name, link.to_socket) for link in node_tree.links if link.from_node == group_node]
+		group_node.node_tree = group_tree
+
+		def socket(sockets, name):
+			if name not in sockets:
+				raise ValueError(f"Node group {group_tree.name} has no {name} socket")
+			return sockets[name]
+
+		for from_socket, name in input_links:
+			node_tree.links.new(from_socket, socket(group_node.inputs, name))
+		for name, to_socket in output_links:
+			node_tree.links.new(socket(group_node.outputs, name), to_socket)
+
+	def setup_segment_bitmask(self, mat):
+		"""
+		Replaces the segment base logic with a lookup of the segment bit in the "segment_mask" attribute,
+		which is written every frame by update_segment_masks().
+		"""
+		key = ("segment_bitmask", self.uses_instance_attributes())
+		bitmask_node_tree = self.resource.get_derived(key)
+		if bitmask_node_tree is None:
+			bitmask_node_tree = self.create_bitmask_node_tree()
+			self.resource.set_derived(key, bitmask_node_tree)
+		mat.node_tree.nodes['segment_base'].node_tree = bitmask_node_tree
+
+	def create_bitmask_node_tree(self):
+		node_tree = bpy.data.node_groups.new(".7SegmentBitmask", 'ShaderNodeTree')
+		node_tree.interface.new_socket("Mask", in_out='OUTPUT', socket_type='NodeSocketFloat')
+		nodes = node_tree.nodes
+		links = node_tree.links
+
+		def math_node(operation, a, b, x, y, clamp=False):
+			node = nodes.new('ShaderNodeMath')
+			node.operation = operation
+			node.use_clamp = clamp
+			node.location = (x, y)
+			for i, value in enumerate((a, b)):
+				if isinstance(value, bpy.types.NodeSocket):
+					links.new(value, node.inputs[i])
+				else:
+					node.inputs[i].default_value = value
+			return node.outputs[0]
+
+		segment_attribute = nodes.new('ShaderNodeAttribute')
+		segment_attribute.attribute_name = "Segment"
+		segment_attribute.location = (-800, 0)
+		mask_attribute = nodes.new('ShaderNodeAttribute')
+		mask_attribute.attribute_name = "segment_mask"
+		mask_attribute.attribute_type = 'INSTANCER' if self.uses_instance_attributes() else 'GEOMETRY'
+		mask_attribute.location = (-800, -300)
+
+		# Segment id painted as id * 0.1 in the "Segment" color, same decoding as the SegmentBase group
+		segment_id = math_node('ROUND', math_node('MULTIPLY', math_node('POWER', segment_attribute.outputs["Fac"], 0.45454, -600, 0), 10, -400, 0), 0, -200, 0)
+		bit = math_node('POWER', 2, math_node('SUBTRACT', segment_id, 1, 0, 0), 200, 0)
+		shifted = math_node('FLOOR', math_node('DIVIDE', mask_attribute.outputs["Fac"], bit, 400, -100), 0, 600, -100)
+		lit = math_node('MODULO', shifted, 2, 800, -100)
+
+		# Separators are painted (1, 0, 1) and always lit
+		separate = nodes.new('ShaderNodeSeparateColor')
+		separate.location = (-600, 300)
+		links.new(segment_attribute.outputs["Color"], separate.inputs[0])
+		override = math_node('MULTIPLY',
+			math_node('MULTIPLY', math_node('GREATER_THAN', separate.outputs[0], 0.999, -400, 400), math_node('LESS_THAN', separate.outputs[1], 0.001, -400, 300), -200, 350),
+			math_node('GREATER_THAN', separate.outputs[2], 0.999, -400, 200), 0, 300)
+		mask = math_node('ADD', lit, override, 1000, 0, clamp=True)
+
+		group_output = nodes.new('NodeGroupOutput')
+		group_output.location = (1200, 0)
+		links.new(mask, group_output.inputs["Mask"])
+		return node_tree
+
+	def glyph_texture(self):
+		"""
+		Returns the glyph lookup image, a pixel per glyph (row) and segment id (column) set to 1 for lit segments.
+		The image is packed so it is saved with the blend file.
+		"""
+		image = self.resource.get_derived(("glyph_texture",))
+		if image is not None:
+			return image
+
+		table = evaluation.glyph_table()
+		height, width = table.shape
+		image = bpy.data.images.new(".7SegmentGlyphs", width, height, alpha=False)
+		image.colorspace_settings.name = 'Non-Color'
+		pixels = numpy.ones((height, width, 4), dtype=numpy.float32)
+		pixels[:, :, :3] = table[:, :, None]
+		image.pixels.foreach_set(pixels.ravel())
+		image.pack()
+		self.resource.set_derived(("glyph_texture",), image)
+		return image
+
+	def glyph_core_node_tree(self):
+		"""
+		Returns a replacement for the 7SegmentCore group that looks the segments of the digit up in the glyph texture.
+		Negative digits show the 0 glyph like 7SegmentCore.
+		"""
+		node_tree = self.resource.get_derived(("glyph_core",))
+		if node_tree is not None:
+			return node_tree
+
+		node_tree = bpy.data.node_groups.new(".7SegmentGlyphCore", 'ShaderNodeTree')
+		node_tree.interface.new_socket("Number", in_out='INPUT', socket_type='NodeSocketFloat')
+		node_tree.interface.new_socket("Vertex Colors", in_out='INPUT', socket_type='NodeSocketFloat')
+		node_tree.interface.new_socket("Digit", in_out='INPUT', socket_type='NodeSocketFloat')
+		node_tree.interface.new_socket("Mask", in_out='OUTPUT', socket_type='NodeSocketFloat')
+		nodes = node_tree.nodes
+		links = node_tree.links
+
+		def math_node(operation, a, b, x, y, c=None):
+			node = nodes.new('ShaderNodeMath')
+			node.operation = operation
+			node.location = (x, y)
+			for i, value in enumerate((a, b, c)):
+				if value is None:
+					continue
+				if isinstance(value, bpy.types.NodeSocket):
+					links.new(value, node.inputs[i])
+				else:
+					node.inputs[i].default_value = value
+			return node.outputs[0]
+
+		group_input = nodes.new('NodeGroupInput')
+		group_input.location = (-1200, 0)
+
+		# Digit value, same as 7SegmentCore: floor(Number / 10^digit) mod 10
+		shifted = math_node('DIVIDE', group_input.outputs["Number"], math_node('POWER', 10, math_node('ROUND', group_input.outputs["Digit"], 0, -1000, -100), -800, -100), -600, 0)
+		whole = math_node('SUBTRACT', shifted, math_node('MODULO', shifted, 1, -400, -100), -200, 0)
+		digit = math_node('MODULO', whole, 10, 0, 0)
+		# Negative values select the 0 glyph, like the select nodes of 7SegmentCore
+		glyph = math_node('MAXIMUM', digit, 0, 400, 0)
+
+		# Segment id painted as id * 0.1 in the "Segment" color, same decoding as the SegmentBase group
+		segment_id = math_node('ROUND', math_node('MULTIPLY', math_node('POWER', group_input.outputs["Vertex Colors"], 0.45454, -600, 300), 10, -400, 300), 0, -200, 300)
+
+		table_height, table_width = evaluation.glyph_table().shape
+		texture_u = math_node('DIVIDE', math_node('ADD', segment_id, 0.5, 0, 300), table_width, 200, 300)
+		texture_v = math_node('DIVIDE', math_node('ADD', glyph, 0.5, 600, 0), table_height, 800, 0)
+		combine = nodes.new('ShaderNodeCombineXYZ')
+		combine.location = (1000, 150)
+		links.new(texture_u, combine.inputs[0])
+		links.new(texture_v, combine.inputs[1])
+
+		texture = nodes.new('ShaderNodeTexImage')
+		texture.image = self.glyph_texture()
+		texture.interpolation = 'Closest'
+		texture.extension = 'EXTEND'
+		texture.location = (1200, 150)
+		links.new(combine.outputs[0], texture.inputs["Vector"])
+
+		group_output = nodes.new('NodeGroupOutput')
+		group_output.location = (1500, 150)
+		links.new(texture.outputs["Color"], group_output.inputs["Mask"])
+
+		self.resource.set_derived(("glyph_core",), node_tree)
+		return node_tree
+
+	def setup_segment_base_processor(self, base_node_tree):
+		number_node = base_node_tree.nodes['number_adjusted']
+		display_node = base_node_tree.nodes['display_converted']
 
 		processor_name = ""
-		processor_node_tree = None
+		processor_node_tree = self.resource.node_groups[PROCESSOR_NODE_GROUPS[self.data.display_type]]
 		if self.data.display_type == "numeric":
-			processor_node_tree = self.resource.node_groups[0]
 			processor_name = "Decimal"
 		elif self.data.display_type == "clock":
-			processor_node_tree = self.resource.node_groups[1]
 			processor_name = "Clock"
 
-		processor_node_group = segment_base_group.node_tree.nodes.new(type='ShaderNodeGroup')
+		processor_node_group = base_node_tree.nodes.new(type='ShaderNodeGroup')
 		processor_node_group.node_tree = processor_node_tree
 		processor_node_group.name = f"7Segment{processor_name}Processor"
 		processor_node_group.location = number_node.location[0] + 280, number_node.location[1] + 70
 
-		segment_core_group = segment_base_group.node_tree.nodes['segment_core']
+		segment_core_group = base_node_tree.nodes['segment_core']
 
-		segment_base_group.node_tree.links.new(number_node.outputs[0], processor_node_group.inputs[0])
-		segment_base_group.node_tree.links.new(display_node.outputs[0], processor_node_group.inputs[1])
-		segment_base_group.node_tree.links.new(processor_node_group.outputs[0], segment_core_group.inputs[0])
+		base_node_tree.links.new(number_node.outputs[0], processor_node_group.inputs[0])
+		base_node_tree.links.new(display_node.outputs[0], processor_node_group.inputs[1])
+		base_node_tree.links.new(processor_node_group.outputs[0], segment_core_group.inputs[0])
+
+	def setup_segment_base_index_attributes(self, base_node_tree):
+		"""
+		Makes the base group read integer "Digit" and "Display" attributes instead of vertex colors.
+		The digit index feeds the core directly, the gamma approximation nodes are removed.
+		"""
+		nodes = base_node_tree.nodes
+
+		def unexpected_layout(reason):
+			return ValueError(f"Unexpected {base_node_tree.name} node group layout: {reason}")
+
+		def attribute_source(socket):
+			# The attribute node feeding the socket through the chain of math nodes, and the math nodes
+			chain = []
+			while socket.is_linked:
+				node = socket.links[0].from_node
+				if node.type == 'ATTRIBUTE':
+					return node, chain
+				if node.type != 'MATH':
+					break
+				chain.append(node)
+				socket = node.inputs[0]
+			return None, chain
+
+		# Gamma approximation between the "Digit" attribute and the core
+		digit_attribute, gamma_nodes = attribute_source(nodes['segment_core'].inputs["Digit"])
+		if digit_attribute is None or digit_attribute.attribute_name != "Digit":
+			raise unexpected_layout("the core digit input is not fed by the Digit attribute")
+		base_node_tree.links.new(digit_attribute.outputs["Fac"], nodes['segment_core'].inputs["Digit"])
+		for node in gamma_nodes:
+			nodes.remove(node)
+
+		# The processors expect the display section in 0.1 steps, same as the vertex color encoding
+		display_node = nodes['display_converted']
+		display_attribute, chain = attribute_source(display_node.inputs[0])
+		if display_node.type != 'MATH' or display_attribute is None or display_attribute.attribute_name != "Display" or chain:
+			raise unexpected_layout("display_converted does not convert the Display attribute")
+		display_node.operation = 'MULTIPLY_ADD'
+		display_node.inputs[1].default_value = self.VC_STEP
+		display_node.inputs[2].default_value = self.VC_STEP_FAILSAFE
 
 	def create_digits(self, digit_prototype, offset, display, digit_count, offset_step, generated):
 		for i in range(0, digit_count):
@@ -1025,13 +2367,9 @@ class SegmentAddon:
 	def create_segment(self, prototype):
 		obj = Utils.copy_object(prototype)
 		obj.location = (0, 0, 0)
-		bpy.context.collection.objects.link(obj)
+		self.collection.objects.link(obj)
 
-		bpy.ops.object.select_all(action='DESELECT')
-		bpy.context.view_layer.objects.active = obj
-		obj.select_set(True)
-
-		self.assign_segment_materials()
+		self.assign_segment_materials(obj.data)
 		return obj
 
 	def create_digit(self, digit_prototype, offset, display, digit, generated):
@@ -1043,19 +2381,24 @@ class SegmentAddon:
 		"Segment" vertex color map defining segments
 		"segments" boolean face attribute for active areas
 		"""
+		if self.layout_only:
+			generated.append(DisplayPiece(digit_prototype.name, offset, digit, display))
+			return
+
 		obj = Utils.copy_object(digit_prototype)
 		obj.location = (0, 0, 0)
-		bpy.context.collection.objects.link(obj)
-
-		bpy.ops.object.select_all(action='DESELECT')
-		bpy.context.view_layer.objects.active = obj
-		obj.select_set(True)
-
-		self.assign_segment_materials()
+		self.collection.objects.link(obj)
 
 		mesh = obj.data
-		self.create_vertex_color_map(mesh, "Digit", digit)
-		self.create_vertex_color_map(mesh, "Display", display)
+		self.assign_segment_materials(mesh)
+
+		index_type = self.index_attribute_type()
+		if index_type is not None:
+			self.create_index_attribute(mesh, "Digit", index_type, self.attribute_index(digit))
+			self.create_index_attribute(mesh, "Display", index_type, self.attribute_index(display))
+		else:
+			self.create_vertex_color_map(mesh, "Digit", digit)
+			self.create_vertex_color_map(mesh, "Display", display)
 
 		# Move by offseta
 		obj.location.x += offset
@@ -1072,6 +2415,10 @@ class SegmentAddon:
 		No vertex colors
 		"segments" boolean face attribute for active areas
 		"""
+		if self.layout_only:
+			generated.append(DisplayPiece(prototype.name, offset))
+			return
+
 		obj = self.create_segment(prototype)
 
 		# Paint the segment mask override signal
@@ -1094,44 +2441,90 @@ class SegmentAddon:
 		else:
 			self.create_aux(bpy.data.objects[SEGMENT_EMPTY], offset, generated) #Empty separator
 
-	def assign_segment_materials(self):
+	def assign_segment_materials(self, mesh):
 		"""
 		Assigns the segment foreground and background materials to the 1st and 2nd slots.
-		The segment foreground is assigned to faces based on the "segments" face map.
+		The segment foreground is assigned to faces based on the "segments" face attribute.
 		The segment background everywhere else.
 
-		Uses operators on context.object
-		"""
-		bpy.ops.object.mode_set(mode='EDIT')
-		
-		# Select segments face map
-		bpy.ops.mesh.select_all(action = 'DESELECT')
-		bpy.ops.mesh.select_mode(type='FACE')
-		
-		mesh = bpy.context.object.data;
-		mesh.attributes.active = mesh.attributes['segments']
-		bpy.ops.mesh.select_by_attribute()
-
-		# Add materials
-		bpy.context.object.data.materials.append(self.resource.materials[1])
-		bpy.context.object.data.materials.append(self.resource.materials[0])
-		bpy.context.object.active_material_index = 1
-		bpy.ops.object.material_slot_assign()
-		
-		bpy.ops.mesh.select_mode(type='VERT')
-		bpy.ops.object.mode_set(mode='OBJECT')
+		Works directly on the mesh data, the mode, selection and active object are left untouched.
+		"""
+		mesh.materials.append(self.background_material)
+		mesh.materials.append(self.material)
+
+		mesh.polygons.foreach_set("material_index", self.segment_material_indices(mesh))
+		mesh.update()
 
 	@staticmethod
-	def get_select_mode() -> str:
-		modes = bpy.context.tool_settings.mesh_select_mode[:]
-		if (modes[0] == True):
-			return 'VERT'
-		if (modes[1] == True):
-			return 'EDGE'
-		if (modes[2] == True):
-			return 'FACE'
-		print("SegmentAddon: Failed to detect select mode!")
-		return 'VERT'
+	def segment_material_indices(mesh):
+		"""
+		Returns the per face material slot indices (0 - background, 1 - segment) given by the "segments" face attribute.
+		"""
+		segments = numpy.zeros(len(mesh.polygons), dtype=bool)
+		mesh.attributes['segments'].data.foreach_get("value", segments)
+		return segments.astype(numpy.int32)
+
+	@staticmethod
+	def skew_center(meshes) -> float:
+		"""
+		Returns the vertical center of all the display vertices, the skew is applied around it.
+		"""
+		ys = []
+		for mesh in meshes:
+			co = numpy.empty(len(mesh.vertices) * 3, dtype=numpy.float32)
+			mesh.vertices.foreach_get("co", co)
+			ys.append(co[1::3])
+		ys = numpy.concatenate(ys)
+		return float(ys.mean()) if len(ys) > 0 else 0.0
+
+	def skew_matrix(self, center):
+		"""
+		Returns the matrix shearing x along y around the vertical center.
+		"""
+		shear = mathutils.Matrix.Identity(4)
+		shear[0][1] = self.data.skew
+		shear[0][3] = -self.data.skew * center
+		return shear
+
+	def display_matrix(self, obj, pivot, matrix):
+		"""
+		Returns the world matrix of a generated object, scaled by the object scale around the pivot and then transformed by the matrix.
+		"""
+		scale_factor = self.data.object_scale
+		location = pivot + (obj.location - pivot) * scale_factor
+		scale = mathutils.Matrix.Diagonal((scale_factor, scale_factor, scale_factor, 1.0))
+		return matrix @ mathutils.Matrix.Translation(location) @ scale
+
+	def process_display_mesh(self, mesh, timer):
+		"""
+		Applies the background removal and extrude settings to a generated mesh.
+		Works on the mesh data with bmesh, no operators or edit mode are needed.
+		"""
+		if not self.data.hide_background and self.data.extrude == 0:
+			return
+
+		with timer.stage("bmesh"):
+			bm = bmesh.new()
+			bm.from_mesh(mesh)
+
+		# Delete background
+		if self.data.hide_background:
+			with timer.stage("background"):
+				background_faces = [f for f in bm.faces if f.material_index == 0]
+				bmesh.ops.delete(bm, geom=background_faces, context='FACES')
+
+		# Extrude
+		if self.data.extrude != 0:
+			with timer.stage("extrude"):
+				geom = bm.faces[:] + bm.edges[:] + bm.verts[:]
+				extruded = bmesh.ops.extrude_face_region(bm, geom=geom, use_normal_flip=False)
+				extruded_verts = [e for e in extruded["geom"] if isinstance(e, bmesh.types.BMVert)]
+				bmesh.ops.translate(bm, vec=(0, 0, self.data.extrude), verts=extruded_verts)
+
+		with timer.stage("bmesh"):
+			bm.to_mesh(mesh)
+			bm.free()
+			mesh.update()
 
 	@staticmethod
 	def rgba_tuple_multiply(prop, mult):
@@ -1139,7 +2532,7 @@ class SegmentAddon:
 
 	@staticmethod
 	def color_property_to_rgba_tuple(prop):
-		return (prop.r, prop.g, prop.b, 1.0)
+		return (prop[0], prop[1], prop[2], 1.0)
 
 	@classmethod
 	def lcd_style_calculate_x_ramp(cls, bW, sbW) -> tuple:
@@ -1159,7 +2552,7 @@ class SegmentAddon:
 		p4 = rgb2 - sbWH
 		p5 = rgb2 + sbWH
 
-		print(f"bw: {bW} bWH: {bWH} sbW: {sbW} rgbW: {rgbW} rgb1: {rgb1} rgb2: {rgb2} p[]: {p1} {p2} {p3} {p4} {p5} {p6}")
+		log.debug(f"bw: {bW} bWH: {bWH} sbW: {sbW} rgbW: {rgbW} rgb1: {rgb1} rgb2: {rgb2} p[]: {p1} {p2} {p3} {p4} {p5} {p6}")
 		return (p1, p2, p3, p4, p5, p6)
 
 	@classmethod
@@ -1171,11 +2564,15 @@ class SegmentAddon:
 
 	@classmethod
 	def vertex_paint_all_rgb(cls, mesh, color_map, r, g, b):
-		i = 0
-		for poly in mesh.polygons:
-		   for idx in poly.loop_indices:
-			   color_map.data[i].color = [r, g, b, 1]
-			   i += 1
+		"""
+		Paints every element of a color attribute with a single sRGB color.
+
+		The whole layer is written with one foreach_set call from a preallocated buffer.
+		Values are written as sRGB (same as the legacy vertex_colors API) as the shader decodes them with that assumption.
+		"""
+		colors = numpy.empty((len(color_map.data), 4), dtype=numpy.float32)
+		colors[:] = (r, g, b, 1.0)
+		color_map.data.foreach_set("color_srgb", colors.ravel())
 
 	@classmethod
 	def vertex_paint_all(cls, mesh, color_map, value):
@@ -1183,10 +2580,15 @@ class SegmentAddon:
 
 	@classmethod
 	def create_vertex_color_map_rgb(cls, mesh, name, r, g, b):
-		mesh.vertex_colors.new(name=name)
-		color_map = mesh.vertex_colors[name]
+		color_map = mesh.color_attributes.new(name=name, type='BYTE_COLOR', domain='CORNER')
 		cls.vertex_paint_all_rgb(mesh, color_map, r, g, b)
 
+	@staticmethod
+	def create_index_attribute(mesh, name, data_type, value):
+		# Face domain, so the index is never interpolated between welded digits
+		attribute = mesh.attributes.new(name, data_type, 'FACE')
+		attribute.data.foreach_set("value", numpy.full(len(mesh.polygons), value, dtype=numpy.int32))
+
 	@classmethod
 	def create_vertex_color_map(cls, mesh, name, value, failsafe=None):
 		if failsafe is None:
@@ -1195,11 +2597,768 @@ class SegmentAddon:
 		cls.create_vertex_color_map_rgb(mesh, name, value, value, value)
 
 
+class DatablockReferences:
+	"""
+	Datablocks stored by their name and session UID instead of Python references.
+
+	Python references to IDs are freed by undo and redo (and by loading a file), and using them afterwards can crash
+	Blender, so the datablocks are looked up in bpy.data on every access instead.
+	A reference resolves to None once the datablock was removed, renamed or replaced by another one with the same name.
+	"""
+	ID_COLLECTIONS = {
+		'MATERIAL': "materials",
+		'NODETREE': "node_groups",
+		'IMAGE': "images",
+	}
+
+	def __init__(self):
+		self.references = dict()
+
+	def get(self, key):
+		reference = self.references.get(key)
+		if reference is None:
+			return None
+		collection, name, session_uid = reference
+		datablock = getattr(bpy.data, collection).get(name)
+		if datablock is None or datablock.session_uid != session_uid:
+			return None
+		return datablock
+
+	def __getitem__(self, key):
+		datablock = self.get(key)
+		if datablock is None:
+			raise KeyError(key)
+		return datablock
+
+	def __setitem__(self, key, datablock):
+		self.references[key] = (self.ID_COLLECTIONS[datablock.id_type], datablock.name, datablock.session_uid)
+
+
+class ResourceCache:
+	"""
+	Session cache of the datablocks appended from the addon blend file.
+
+	The blend file is only opened when some of the requested datablocks are not loaded yet, and then
+	only the missing ones are appended. Node trees derived from the appended ones (configured processors,
+	LCD cell shapes) are kept as well so that displays with the same settings can share them.
+	The datablocks are kept as DatablockReferences, so the cache stays safe to use across undo.
+	The cache is keyed on the blend file path and its modification time.
+	"""
+	_instance = None
+
+	def __init__(self, path, mtime):
+		self.path = path
+		self.mtime = mtime
+		self.materials = DatablockReferences()
+		self.node_groups = DatablockReferences()
+		self.derived = DatablockReferences()
+
+	@classmethod
+	def get(cls, path) -> "ResourceCache":
+		mtime = os.path.getmtime(path)
+		cache = cls._instance
+		if cache is None or cache.path != path or cache.mtime != mtime:
+			cache = cls(path, mtime)
+			cls._instance = cache
+		return cache
+
+	@classmethod
+	def clear(cls):
+		cls._instance = None
+
+	@staticmethod
+	def is_valid(datablock) -> bool:
+		"""
+		Checks that a datablock reference still exists (it can be removed by the user, undo or loading a file).
+		"""
+		if datablock is None:
+			return False
+		try:
+			datablock.name
+		except ReferenceError:
+			return False
+		return True
+
+	def require(self, objects=(), materials=(), node_groups=()):
+		"""
+		Makes sure the given datablocks are loaded, appending all the missing ones in a single library load.
+		Prototype objects are looked up by name, so existing ones are never appended twice.
+		"""
+		missing_objects = [name for name in objects if name not in bpy.data.objects]
+		missing_materials = [name for name in materials if self.materials.get(name) is None]
+		missing_node_groups = [name for name in node_groups if self.node_groups.get(name) is None]
+		if not missing_objects and not missing_materials and not missing_node_groups:
+			return
+
+		log.debug(f"Appending {missing_objects + missing_materials + missing_node_groups} from {self.path}")
+		with bpy.data.libraries.load(self.path, link=False) as (data_src, data_dst):
+			data_dst.objects = missing_objects
+			data_dst.materials = missing_materials
+			data_dst.node_groups = missing_node_groups
+
+		for name, material in zip(missing_materials, data_dst.materials):
+			self.materials[name] = material
+		for name, node_group in zip(missing_node_groups, data_dst.node_groups):
+			self.node_groups[name] = node_group
+
+	def get_derived(self, key):
+		return self.derived.get(key)
+
+	def set_derived(self, key, datablock):
+		self.derived[key] = datablock
+
+
+class EvaluationCache:
+	"""
+	Parsed CPU evaluation settings of the displays, keyed on the object session UID.
+
+	Saves the frame change handler from copying the settings, including all sequence samples, out of the
+	custom properties of every display on every frame. Entries are dropped when a display is set up again,
+	and the whole cache on undo, redo and file loads, which can restore other custom property values.
+	"""
+	_entries = dict()
+
+	@classmethod
+	def get(cls, obj) -> tuple:
+		"""
+		Returns the (config, digit_indices, display_indices) of a display object for evaluation.evaluate_masks().
+		"""
+		entry = cls._entries.get(obj.session_uid)
+		if entry is None:
+			config = obj["segment_evaluation"].to_dict()
+			for key in ("sequence_frames", "sequence_values"):
+				if key in config:
+					config[key] = numpy.asarray(config[key], dtype=numpy.float64)
+			digit_indices = numpy.asarray(obj["segment_digit_indices"], dtype=numpy.int32)
+			display_indices = numpy.asarray(obj["segment_display_indices"], dtype=numpy.int32)
+			entry = (config, digit_indices, display_indices)
+			cls._entries[obj.session_uid] = entry
+		return entry
+
+	@classmethod
+	def discard(cls, obj):
+		cls._entries.pop(obj.session_uid, None)
+
+	@classmethod
+	def clear(cls):
+		cls._entries.clear()
+
+
+@bpy.app.handlers.persistent
+def clear_resource_cache(*args):
+	ResourceCache.clear()
+
+
+@bpy.app.handlers.persistent
+def clear_evaluation_cache(*args):
+	EvaluationCache.clear()
+
+
+@bpy.app.handlers.persistent
+def update_segment_masks(scene, *args):
+	"""
+	Frame change handler writing the segment masks of displays generated with CPU evaluation.
+	"""
+	frame = scene.frame_current + scene.frame_subframe
+	for obj in scene.objects:
+		if "segment_evaluation" in obj and obj.type == 'MESH':
+			SegmentAddon.update_segment_mask(obj, frame)
+
+
+class DisplayPiece(typing.NamedTuple):
+	"""
+	A single digit or separator of a display layout.
+	Digit and display are the raw "Digit" and "Display" vertex color values, None for separators.
+	"""
+	prototype: str
+	offset: float
+	digit: float = None
+	display: float = None
+
+
+def match_display_pieces(old_pieces, new_pieces):
+	"""
+	Matches the pieces of two layouts of a display by prototype and digit and display values, in layout order.
+	Returns the index of the matching new piece for every old piece, -1 for pieces not in the new layout.
+	"""
+	available = dict()
+	for i, piece in enumerate(new_pieces):
+		available.setdefault((piece.prototype, piece.digit, piece.display), []).append(i)
+	matches = numpy.full(len(old_pieces), -1, dtype=numpy.int32)
+	for i, piece in enumerate(old_pieces):
+		candidates = available.get((piece.prototype, piece.digit, piece.display))
+		if candidates:
+			matches[i] = candidates.pop(0)
+	return matches
+
+
+class DisplayMeshBuilder:
+	"""
+	Builds a whole display as one mesh by tiling the prototype mesh arrays at the layout offsets.
+
+	Prototype positions, loops and attributes are read once with foreach_get and the final mesh is written
+	with a single foreach_set per array. This replaces copying one object per digit and joining them with operators.
+
+	Neighbouring pieces share their border vertices. With weld enabled the left border vertices of every piece
+	are matched with the right border of the next piece (known per prototype) and merged by remapping vertex indices,
+	instead of searching the whole mesh for doubles.
+	"""
+	# Attribute data type -> (foreach property, components, dtype), dtypes by name so numpy is not imported on registration
+	ATTRIBUTE_ARRAYS = {
+		'FLOAT': ("value", 1, "float32"),
+		'INT': ("value", 1, "int32"),
+		'INT8': ("value", 1, "int32"),
+		'BOOLEAN': ("value", 1, bool),
+		'FLOAT2': ("vector", 2, "float32"),
+		'INT32_2D': ("value", 2, "int32"),
+		'FLOAT_VECTOR': ("vector", 3, "float32"),
+		'FLOAT_COLOR': ("color", 4, "float32"),
+		'BYTE_COLOR': ("color_srgb", 4, "float32"),
+		'QUATERNION': ("value", 4, "float32"),
+	}
+	DOMAINS = ('POINT', 'FACE', 'CORNER')
+	SEGMENT_OVERRIDE_COLOR = (1.0, 0.0, 1.0, 1.0)
+	# Distance under which border vertices are welded, same as the "Merge by distance" default
+	WELD_DISTANCE = 0.0001
+
+	def __init__(self, background_material, segment_material, weld=False, index_type=None):
+		self.materials = (background_material, segment_material)
+		self.weld = weld
+		# Data type of integer "Digit" and "Display" face attributes, None for vertex colors
+		self.index_type = index_type
+		self.prototypes = dict()
+
+	def prototype_arrays(self, name) -> dict:
+		"""
+		Returns (and caches) the geometry and attribute arrays of a prototype object mesh.
+		"""
+		if name in self.prototypes:
+			return self.prototypes[name]
+
+		mesh = bpy.data.objects[name].data
+		co = numpy.empty(len(mesh.vertices) * 3, dtype=numpy.float32)
+		mesh.vertices.foreach_get("co", co)
+		loop_verts = numpy.empty(len(mesh.loops), dtype=numpy.int32)
+		mesh.loops.foreach_get("vertex_index", loop_verts)
+		loop_starts = numpy.empty(len(mesh.polygons), dtype=numpy.int32)
+		mesh.polygons.foreach_get("loop_start", loop_starts)
+
+		attributes = dict()
+		for attribute in mesh.attributes:
+			if attribute.name.startswith(".") or attribute.name in ("position", "material_index", "Digit", "Display"):
+				continue
+			if attribute.domain not in self.DOMAINS or attribute.data_type not in self.ATTRIBUTE_ARRAYS:
+				continue
+			prop, components, dtype = self.ATTRIBUTE_ARRAYS[attribute.data_type]
+			values = numpy.empty(len(attribute.data) * components, dtype=dtype)
+			attribute.data.foreach_get(prop, values)
+			attributes[attribute.name] = (attribute.data_type, attribute.domain, values.reshape(-1, components))
+
+		co = co.reshape(-1, 3)
+		arrays = {
+			"co": co,
+			"left": self.border_vertices(co, co[:, 0].min()),
+			"right": self.border_vertices(co, co[:, 0].max()),
+			"loop_verts": loop_verts,
+			"loop_starts": loop_starts,
+			"material_indices": SegmentAddon.segment_material_indices(mesh),
+			"attributes": attributes,
+			"uv_layers": [uv.name for uv in mesh.uv_layers],
+		}
+		self.prototypes[name] = arrays
+		return arrays
+
+	@classmethod
+	def border_vertices(cls, co, x):
+		"""
+		Returns the indices of the vertices lying on the vertical border at x.
+		"""
+		return numpy.flatnonzero(numpy.abs(co[:, 0] - x) < cls.WELD_DISTANCE)
+
+	def weld_map(self, pieces, protos, co, vertex_offsets):
+		"""
+		Matches the left border of every piece with the right border of the following piece.
+		Returns the kept vertex mask and the old to new vertex index map.
+		"""
+		remap = numpy.arange(len(co), dtype=numpy.int32)
+		keep = numpy.ones(len(co), dtype=bool)
+		for i in range(len(pieces) - 1):
+			left = protos[i]["left"] + vertex_offsets[i]
+			right = protos[i+1]["right"] + vertex_offsets[i+1]
+			if len(left) == 0 or len(right) == 0:
+				continue
+			# Borders only have a few vertices, compare all pairs
+			distances = numpy.linalg.norm(co[right][:, None, :] - co[left][None, :, :], axis=2)
+			best = numpy.argmin(distances, axis=1)
+			matched = distances[numpy.arange(len(right)), best] < self.WELD_DISTANCE
+			remap[right[matched]] = remap[left[best[matched]]]
+			keep[right[matched]] = False
+
+		new_indices = numpy.cumsum(keep, dtype=numpy.int32) - 1
+		return keep, new_indices[remap]
+
+	def build(self, mesh, pieces):
+		"""
+		Writes the geometry of all the layout pieces into the (empty) mesh.
+		"""
+		failsafe = SegmentAddon.VC_STEP_FAILSAFE
+		protos = [self.prototype_arrays(piece.prototype) for piece in pieces]
+
+		co = []
+		loop_verts = []
+		loop_starts = []
+		material_indices = []
+		vertex_offsets = []
+		vertex_offset = 0
+		loop_offset = 0
+		for piece, proto in zip(pieces, protos):
+			co.append(proto["co"] + (piece.offset, 0.0, 0.0))
+			loop_verts.append(proto["loop_verts"] + vertex_offset)
+			loop_starts.append(proto["loop_starts"] + loop_offset)
+			material_indices.append(proto["material_indices"])
+			vertex_offsets.append(vertex_offset)
+			vertex_offset += len(proto["co"])
+			loop_offset += len(proto["loop_verts"])
+
+		co = numpy.concatenate(co)
+		loop_verts = numpy.concatenate(loop_verts)
+		keep = None
+		if self.weld:
+			keep, remap = self.weld_map(pieces, protos, co, vertex_offsets)
+			co = co[keep]
+			loop_verts = remap[loop_verts]
+
+		mesh.vertices.add(len(co))
+		mesh.loops.add(loop_offset)
+		mesh.polygons.add(sum(len(p) for p in loop_starts))
+		mesh.vertices.foreach_set("co", co.ravel())
+		mesh.loops.foreach_set("vertex_index", loop_verts)
+		mesh.polygons.foreach_set("loop_start", numpy.concatenate(loop_starts))
+		mesh.update(calc_edges=True)
+
+		# Prototype attributes, missing ones are filled with zeros
+		uv_layers = set()
+		attribute_types = dict()
+		for proto in protos:
+			uv_layers.update(proto["uv_layers"])
+			for name, (data_type, domain, values) in proto["attributes"].items():
+				attribute_types.setdefault(name, (data_type, domain, values.shape[1], values.dtype))
+
+		for name, (data_type, domain, components, dtype) in attribute_types.items():
+			chunks = []
+			for piece, proto in zip(pieces, protos):
+				size = self.domain_size(proto, domain)
+				if name == "Segment" and piece.digit is None:
+					# Separators are always on, see SegmentAddon.create_aux()
+					chunks.append(numpy.tile(numpy.array(self.SEGMENT_OVERRIDE_COLOR, dtype=dtype), (size, 1)))
+				elif name in proto["attributes"]:
+					chunks.append(proto["attributes"][name][2])
+				else:
+					chunks.append(numpy.zeros((size, components), dtype=dtype))
+			values = numpy.concatenate(chunks)
+			if domain == 'POINT' and keep is not None:
+				# Welded vertices keep the values of the first piece
+				values = values[keep]
+			self.write_attribute(mesh, name, data_type, domain, values, name in uv_layers)
+
+		# Segment mask override for layouts made only of separators
+		if "Segment" not in attribute_types:
+			segment = numpy.tile(numpy.array(self.SEGMENT_OVERRIDE_COLOR, dtype=numpy.float32), (loop_offset, 1))
+			self.write_attribute(mesh, "Segment", 'BYTE_COLOR', 'CORNER', segment)
+
+		# Digit position and display type, constant per piece
+		for name in ("Digit", "Display"):
+			if self.index_type is not None:
+				values = numpy.concatenate([
+					numpy.full(len(proto["loop_starts"]), 0 if piece.digit is None else SegmentAddon.attribute_index(getattr(piece, name.lower())), dtype=numpy.int32)
+					for piece, proto in zip(pieces, protos)
+				])
+				self.write_attribute(mesh, name, self.index_type, 'FACE', values)
+				continue
+
+			values = numpy.concatenate([
+				numpy.full(len(proto["loop_verts"]), 0.0 if piece.digit is None else getattr(piece, name.lower()) + failsafe, dtype=numpy.float32)
+				for piece, proto in zip(pieces, protos)
+			])
+			colors = numpy.ones((loop_offset, 4), dtype=numpy.float32)
+			colors[:, :3] = values[:, None]
+			self.write_attribute(mesh, name, 'BYTE_COLOR', 'CORNER', colors)
+
+		# Layout piece of every face, used to change the layout of the mesh later
+		face_pieces = numpy.repeat(numpy.arange(len(pieces), dtype=numpy.int32), [len(proto["loop_starts"]) for proto in protos])
+		self.write_attribute(mesh, "segment_piece", 'INT', 'FACE', face_pieces)
+
+		# Materials
+		for mat in self.materials:
+			mesh.materials.append(mat)
+		mesh.polygons.foreach_set("material_index", numpy.concatenate(material_indices))
+		mesh.update()
+
+	@staticmethod
+	def domain_size(proto, domain) -> int:
+		if domain == 'POINT':
+			return len(proto["co"])
+		if domain == 'FACE':
+			return len(proto["loop_starts"])
+		return len(proto["loop_verts"])
+
+	def write_attribute(self, mesh, name, data_type, domain, values, uv_layer=False):
+		prop = self.ATTRIBUTE_ARRAYS[data_type][0]
+		if uv_layer:
+			mesh.uv_layers.new(name=name)
+			attribute = mesh.attributes[name]
+		elif data_type in ('FLOAT_COLOR', 'BYTE_COLOR'):
+			attribute = mesh.color_attributes.new(name=name, type=data_type, domain=domain)
+		else:
+			attribute = mesh.attributes.new(name=name, type=data_type, domain=domain)
+		attribute.data.foreach_set(prop, values.ravel())
+
+
+class StageTimer:
+	"""
+	Accumulates the wall time of the display generation stages.
+	"""
+	def __init__(self):
+		# Seconds by stage name, in the order the stages first ran
+		self.stages = dict()
+
+	@contextlib.contextmanager
+	def stage(self, name):
+		start = time.perf_counter()
+		try:
+			yield
+		finally:
+			self.stages[name] = self.stages.get(name, 0.0) + time.perf_counter() - start
+
+	def total(self) -> float:
+		return sum(self.stages.values())
+
+	def summary(self) -> str:
+		return self.format(self.stages)
+
+	@staticmethod
+	def format(stages) -> str:
+		return ", ".join(f"{name} {seconds * 1000:.1f} ms" for name, seconds in stages.items())
+
+
+def generate_display(data, collection, matrix=None, resource=None, name=None, material_cache=None, timer=None) -> list:
+	"""
+	Generates a segment display from the given settings (a SegmentAddonData or a DisplayConfig).
+
+	Works only with bpy.data, so it can be used without a window or an active object (for example in background mode).
+	The generated objects are linked to the collection and transformed by the matrix.
+	Materials with identical settings are reused through the material_cache dictionary when one is passed.
+	Stage timings are accumulated in the timer (a StageTimer) and logged.
+	Returns the list of generated objects.
+	"""
+	if timer is None:
+		timer = StageTimer()
+	log.debug(f"Creating segment display [digits: {data.digits}]")
+
+	# Resources from the segment blend file, only the missing ones are appended
+	with timer.stage("resources"):
+		if resource is None:
+			resource = ResourceCache.get(SegmentAddon.addon_blend_path)
+
+		segment_addon = SegmentAddon(data, resource, collection)
+		segment_addon.material_cache = material_cache
+		if not segment_addon.validate_data():
+			raise ValueError("Invalid display type!")
+		segment_addon.validate_attribute_encoding()
+
+		resource.require(
+			objects=PROTOTYPE_OBJECTS,
+			materials=[MATERIAL_SEGMENT, MATERIAL_BACKGROUND],
+			node_groups=segment_addon.required_node_groups()
+		)
+
+	# Setup material
+	with timer.stage("material"):
+		segment_addon.setup_segment_material()
+
+	# Generate digits
+	digit_prototype = bpy.data.objects[SEGMENT_DIGIT]
+	generated_objects = []
+	display_name = name or "SegmentDisplay" + data.display_type.capitalize() + data.style.capitalize()
+
+	pieces = []
+	if data.use_instancing:
+		# Points with instanced prototype meshes, no geometry per digit
+		with timer.stage("digits"):
+			pieces = segment_addon.create_display_layout()
+		with timer.stage("instancing"):
+			generated_objects.append(segment_addon.create_instanced_display(display_name, pieces))
+	elif data.join_display:
+		# Build the whole display as a single mesh, no per digit objects are created
+		with timer.stage("digits"):
+			pieces = segment_addon.create_display_layout()
+		with timer.stage("join"):
+			generated_objects.append(segment_addon.create_joined_display(display_name, pieces))
+	else:
+		with timer.stage("digits"):
+			if data.display_type == "numeric":
+				segment_addon.create_numeric_display(digit_prototype, generated_objects)
+			elif data.display_type == "clock":
+				segment_addon.create_clock_display(digit_prototype, generated_objects)
+
+	for o in generated_objects + list(segment_addon.instance_prototypes.values()):
+		segment_addon.apply_object_parameters(o)
+
+	if data.cpu_evaluation and len(generated_objects) > 0:
+		with timer.stage("evaluation"):
+			segment_addon.setup_display_evaluation(generated_objects, pieces)
+
+	if len(generated_objects) > 0:
+		if not data.join_display and not data.use_instancing:
+			# Name individual objects
+			for i, o in enumerate(generated_objects, 1):
+				o.name = display_name + "_digit_" + str(i)
+
+		if data.use_instancing:
+			# Mesh settings are applied to the instanced prototypes, the skew center is taken over all instances
+			meshes = [o.data for o in segment_addon.instance_prototypes.values()]
+			display_meshes = [segment_addon.instance_prototypes[piece.prototype].data for piece in pieces]
+		else:
+			meshes = display_meshes = [o.data for o in generated_objects]
+
+		# Apply skew, a single shear transform of the mesh data
+		skew_center = 0.0
+		if data.skew != 0:
+			with timer.stage("skew"):
+				skew_center = segment_addon.skew_center(display_meshes)
+				shear = segment_addon.skew_matrix(skew_center)
+				for mesh in meshes:
+					mesh.transform(shear)
+
+		for mesh in meshes:
+			segment_addon.process_display_mesh(mesh, timer)
+
+		# Scale around the first object and move into place
+		with timer.stage("transform"):
+			if matrix is None:
+				matrix = mathutils.Matrix.Identity(4)
+			pivot = generated_objects[0].location.copy()
+			for o in generated_objects:
+				o.matrix_world = segment_addon.display_matrix(o, pivot, matrix)
+
+		if data.use_instancing or data.join_display:
+			# Kept for changing the layout later, see update_display_layout()
+			generated_objects[0]["segment_config"] = DisplayConfig.from_data(data).to_dict()
+			generated_objects[0]["segment_skew_center"] = skew_center
+
+	log.info(
+		"Generated display %s (%d objects) in %.1f ms (%s)", display_name, len(generated_objects), timer.total() * 1000, timer.summary(),
+		extra={"segment_display": display_name, "segment_objects": len(generated_objects), "segment_stages": dict(timer.stages)}
+	)
+	return generated_objects
+
+
+def update_display_materials(data, objects) -> tuple:
+	"""
+	Writes the appearance settings (colors, emission, normal and style parameters) into existing displays.
+	Only the affected material inputs, or the object properties of shared material displays, are changed.
+	Displays generated with another style are skipped.
+	Returns the number of updated and skipped objects.
+	"""
+	segment_addon = SegmentAddon(data, None, None)
+	parameters = segment_addon.appearance_parameters()
+	updated_materials = set()
+	updated = 0
+	skipped = 0
+	for obj in objects:
+		if "segment_foreground" in obj:
+			# Shared material, the values are read from the object properties
+			if not all(name in obj for name in parameters):
+				skipped += 1
+				continue
+			for o in [obj] + SegmentAddon.instanced_prototypes(obj):
+				for name, value in parameters.items():
+					o[name] = value
+				o.update_tag()
+			updated += 1
+			continue
+
+		found = False
+		for mat in SegmentAddon.display_materials(obj):
+			if mat in updated_materials:
+				found = True
+			elif segment_addon.update_material(mat, parameters):
+				updated_materials.add(mat)
+				found = True
+		if found:
+			updated += 1
+		else:
+			skipped += 1
+	return updated, skipped
+
+
+# Settings changed by update_display_layout(), all other settings are taken from the display
+LAYOUT_SETTINGS = ("digits", "fraction_digits", "millisecond_digits", "second_digits", "minute_digits", "hour_digits", "show_dot", "show_colons")
+
+
+class LayoutUpdate(typing.NamedTuple):
+	"""
+	Piece counts of a layout update and whether the display mesh was changed in place or rebuilt.
+	"""
+	added: int
+	removed: int
+	moved: int
+	incremental: bool
+
+
+def update_display_layout(obj, data, resource=None) -> LayoutUpdate:
+	"""
+	Changes the digit layout of a display generated as a single object (joined or instanced) to the layout settings of data.
+
+	The settings the display was generated with are stored on the object. Their layout is compared to the new one,
+	only added pieces are built and only removed pieces are deleted, the object itself is kept.
+	"""
+	if "segment_config" not in obj:
+		raise ValueError(f"{obj.name} is not a joined or instanced segment display")
+	old_config = DisplayConfig(**obj["segment_config"].to_dict())
+	new_config = DisplayConfig.from_data(old_config)
+	new_config.update({key: getattr(data, key) for key in LAYOUT_SETTINGS})
+
+	if resource is None:
+		resource = ResourceCache.get(SegmentAddon.addon_blend_path)
+	resource.require(objects=PROTOTYPE_OBJECTS)
+	old_addon = SegmentAddon(old_config, resource, None)
+	segment_addon = SegmentAddon(new_config, resource, None)
+	segment_addon.validate_attribute_encoding()
+
+	segment_addon.parameters = segment_addon.material_parameters()
+	old_pieces = old_addon.create_display_layout()
+	pieces = segment_addon.create_display_layout()
+	matches = match_display_pieces(old_pieces, pieces)
+	kept = matches >= 0
+	moved = sum(1 for i in numpy.flatnonzero(kept) if old_pieces[i].offset != pieces[matches[i]].offset)
+
+	if new_config.use_instancing:
+		segment_addon.update_instanced_display(obj, pieces)
+		incremental = True
+	else:
+		incremental = segment_addon.update_joined_display(obj, old_pieces, pieces, matches)
+
+	if "segment_evaluation" in obj:
+		# Digit and display indices of the new layout, the value settings are unchanged
+		if new_config.use_instancing:
+			segment_addon.setup_cpu_evaluation(obj, pieces, numpy.arange(len(pieces)), 'POINT')
+		else:
+			face_pieces = numpy.empty(len(obj.data.polygons), dtype=numpy.int32)
+			obj.data.attributes["segment_piece"].data.foreach_get("value", face_pieces)
+			segment_addon.setup_cpu_evaluation(obj, pieces, face_pieces, 'FACE')
+
+	obj["segment_config"] = new_config.to_dict()
+	return LayoutUpdate(len(pieces) - int(kept.sum()), len(old_pieces) - int(kept.sum()), moved, incremental)
+
+
+class DisplayResult(typing.NamedTuple):
+	"""
+	Objects generated for one display of a batch, the time it took in seconds and its stage timings.
+	"""
+	objects: list
+	time: float
+	stages: dict
+
+
+MANIFEST_TRANSFORM_KEYS = ("name", "matrix", "location", "rotation", "scale")
+
+def load_manifest(filepath, base=None) -> list:
+	"""
+	Loads a display manifest and returns a list of (config, matrix, name) rows.
+
+	JSON manifests contain a list of rows, an object with optional "defaults" and a "displays" list or a single row.
+	CSV manifests have a header row with the setting names, vectors are separated by spaces or semicolons.
+	Every row holds SegmentAddonData settings and optionally a "name" and a transform,
+	either a 4x4 "matrix" (row major) or "location", "rotation" (XYZ euler in degrees) and "scale".
+	Settings missing in a row are taken from the manifest defaults, then from base (or the addon defaults).
+	"""
+	defaults = dict()
+	with open(filepath, newline='') as f:
+		if os.path.splitext(filepath)[1].lower() == ".csv":
+			entries = [{key: value for key, value in row.items() if value not in (None, "")} for row in csv.DictReader(f)]
+		else:
+			manifest = json.load(f)
+			if isinstance(manifest, dict) and "displays" in manifest:
+				defaults = manifest.get("defaults", dict())
+				entries = manifest["displays"]
+			elif isinstance(manifest, dict):
+				# A single display config
+				entries = [manifest]
+			else:
+				entries = manifest
+
+	rows = []
+	for entry in entries:
+		settings = dict(defaults)
+		settings.update(entry)
+		transform = {key: settings.pop(key) for key in MANIFEST_TRANSFORM_KEYS if key in settings}
+
+		config = DisplayConfig.from_data(base) if base is not None else DisplayConfig()
+		config.update(settings)
+		rows.append((config, manifest_matrix(transform), transform.get("name")))
+	return rows
+
+def manifest_matrix(transform):
+	"""
+	Builds the world matrix of a manifest row, returns None if the row has no transform.
+	"""
+	def vector(value, size):
+		if isinstance(value, str):
+			value = value.replace(";", " ").split()
+		if not isinstance(value, (list, tuple)):
+			value = [value] * size
+		if len(value) != size:
+			raise ValueError(f"Expected {size} values, got {len(value)}")
+		return [float(v) for v in value]
+
+	if "matrix" in transform:
+		values = vector(transform["matrix"], 16)
+		return mathutils.Matrix([values[i:i+4] for i in range(0, 16, 4)])
+	if not any(key in transform for key in ("location", "rotation", "scale")):
+		return None
+
+	location = mathutils.Vector(vector(transform.get("location", 0), 3))
+	rotation = mathutils.Euler([math.radians(v) for v in vector(transform.get("rotation", 0), 3)], 'XYZ')
+	scale = mathutils.Vector(vector(transform.get("scale", 1), 3))
+	return mathutils.Matrix.LocRotScale(location, rotation, scale)
+
+def generate_displays(rows, collection, default_matrix=None) -> list:
+	"""
+	Generates a display for every (config, matrix, name) row.
+	Rows without a transform use the default matrix.
+
+	Resources are loaded once and rows with the same material settings share materials.
+	Returns a DisplayResult for every row.
+	"""
+	resource = ResourceCache.get(SegmentAddon.addon_blend_path)
+	material_cache = dict()
+	results = []
+	for config, matrix, name in rows:
+		start = time.perf_counter()
+		if matrix is None:
+			matrix = default_matrix
+		timer = StageTimer()
+		objects = generate_display(config, collection, matrix, resource, name, material_cache, timer)
+		results.append(DisplayResult(objects, time.perf_counter() - start, timer.stages))
+	return results
+
+
 class Utils:
 	@staticmethod
 	def move_node(node, dx, dy):
 		node.location = node.location[0] + dx, node.location[1] + dy
 
+	@staticmethod
+	def group_input_node(node_tree):
+		"""
+		Returns the first group input node of a node group, found by type so that the node name does not matter.
+		"""
+		for node in node_tree.nodes:
+			if node.type == 'GROUP_INPUT':
+				return node
+		raise ValueError(f"Node group {node_tree.name} has no group input node")
+
 	@staticmethod
 	def create_frame_value_node(node_tree, offset=0):
 		value_node = node_tree.nodes.new('ShaderNodeValue')
@@ -1212,6 +3371,49 @@ class Utils:
 		driver = target.driver_add(prop).driver
 		driver.expression = expression
 
+	# Raw values of the keyframe interpolation enum
+	KEYFRAME_INTERPOLATION = {'CONSTANT': 0, 'LINEAR': 1, 'BEZIER': 2}
+
+	@staticmethod
+	def create_fcurve(id_data, data_path, frames, values, interpolation='CONSTANT', extrapolation='CONSTANT'):
+		"""
+		Keys the property at data_path with one keyframe per sample.
+		All keyframes are written at once with foreach_set instead of inserting them one by one.
+		"""
+		animation_data = id_data.animation_data or id_data.animation_data_create()
+		if animation_data.action is None:
+			animation_data.action = bpy.data.actions.new(id_data.name + "Action")
+		fcurves = animation_data.action.fcurves
+		fcurve = fcurves.find(data_path)
+		if fcurve is not None:
+			fcurves.remove(fcurve)
+		fcurve = fcurves.new(data_path)
+
+		count = len(frames)
+		co = numpy.empty(count * 2, dtype=numpy.float32)
+		co[0::2] = frames
+		co[1::2] = values
+		keyframe_points = fcurve.keyframe_points
+		keyframe_points.add(count)
+		keyframe_points.foreach_set("co", co)
+		keyframe_points.foreach_set("interpolation", numpy.full(count, Utils.KEYFRAME_INTERPOLATION[interpolation], dtype=numpy.int32))
+		fcurve.extrapolation = extrapolation
+		fcurve.update()
+		return fcurve
+
+	@staticmethod
+	def ensure_attribute(mesh, name, data_type, domain):
+		"""
+		Returns the named attribute, (re)created if it is missing or has another type or domain.
+		"""
+		attribute = mesh.attributes.get(name)
+		if attribute is not None and (attribute.data_type != data_type or attribute.domain != domain):
+			mesh.attributes.remove(attribute)
+			attribute = None
+		if attribute is None:
+			attribute = mesh.attributes.new(name, data_type, domain)
+		return attribute
+
 	@staticmethod
 	def copy_object(obj):
 		new_obj = obj.copy()
@@ -1241,45 +3443,59 @@ class Utils:
 # ADDON
 ################################################################################
 
-classes = [MainPanel, DisplayTypePanel, DisplayValuePanel, DisplayAppearancePanel, DisplayStylePanel, AdvancedPanel, GeneratePanel, SegmentAddonData, CreateDisplayOperator, ResetToDefaultsOperator]
+classes = [MainPanel, DisplayTypePanel, DisplayValuePanel, DisplayAppearancePanel, DisplayStylePanel, AdvancedPanel, GeneratePanel, SegmentAddonData, CreateDisplayOperator, CreateDisplayBatchOperator, UpdateDisplayMaterialsOperator, UpdateDisplayLayoutOperator, ResetToDefaultsOperator]
 
 def load_preview(pcoll, name, filepath, type):
 	if not name in pcoll.keys():
 		return pcoll.load(name, filepath, type)
 	else:
-		print("Preview '" + name +"' already exists!")
+		log.debug("Preview '" + name +"' already exists!")
 		return pcoll[name]
 
 
 def generate_style_previews():
+	"""
+	Loads the style preview images and returns the style enum items with their icons.
+	"""
+	import bpy.utils.previews
+	pcoll = bpy.utils.previews.new()
+	SegmentAddon.previews[SegmentAddon.style_previews] = pcoll
 	directory = SegmentAddon.style_previews_dir
-	pcoll = SegmentAddon.previews[SegmentAddon.style_previews]
-	print("Loading style previews from directory: " + directory)
+	log.debug("Loading style previews from directory: " + directory)
 
 	items = []
-	to_load = [
-		["plain", "Plain", "plain.png"],
-		["classic", "Classic", "classic.png"],
-		["lcd", "LCD", "lcd.png"],
-	]
-
-	for i, style in enumerate(to_load):
-		filepath = os.path.join(directory, style[2])
-		if not filepath in pcoll.keys():
-			thumb = None
-			if os.path.exists(filepath):
-				thumb = load_preview(pcoll, filepath, filepath, 'IMAGE')
-			else:
-				filepath = os.path.join(directory, "missing.png")
-				thumb = load_preview(pcoll, filepath, filepath, 'IMAGE')
-			items.append((style[0], style[1], "", thumb.icon_id, i))
+	for i, (identifier, name, filename) in enumerate(STYLE_PREVIEWS):
+		filepath = os.path.join(directory, filename)
+		if not os.path.exists(filepath):
+			filepath = os.path.join(directory, "missing.png")
+		thumb = load_preview(pcoll, filepath, filepath, 'IMAGE')
+		items.append((identifier, name, "", thumb.icon_id, i))
 
 	return items
 
 
+def default_style_items():
+	return [(identifier, name, "", 0, i) for i, (identifier, name, filename) in enumerate(STYLE_PREVIEWS)]
+
+
+# Items of the style enum, Blender needs the returned strings to stay referenced
+style_items = default_style_items()
+
+
+def style_enum_items(self, context):
+	return style_items
+
+
+def ensure_style_previews():
+	"""
+	Loads the style previews when the style panel is first drawn, until then the style items have no icons.
+	"""
+	if SegmentAddon.style_previews not in SegmentAddon.previews:
+		style_items[:] = generate_style_previews()
+
+
 def register():
-	print("SegmentAddon: Registering")
-	print("")
+	log.debug("Registering")
 	from bpy.utils import register_class
 	for cls in classes:
 		register_class(cls)
@@ -1296,22 +3512,21 @@ def register():
 	SegmentAddon.addon_resources_dir = os.path.join(SegmentAddon.addon_directory_path, 'resources')
 	SegmentAddon.addon_blend_path = os.path.join(SegmentAddon.addon_resources_dir, 'segment.blend')
 	SegmentAddon.style_previews_dir = os.path.join(SegmentAddon.addon_resources_dir, 'styles')
-
-	print("Segment addon dir full: " + SegmentAddon.addon_directory_path_full)
-	print("Segment addon dir: " + SegmentAddon.addon_directory_path)
-	print("Segment resource dir: " + SegmentAddon.addon_resources_dir)
-	print("Segment blend path: " + SegmentAddon.addon_blend_path)
-	print("Segment style previews dir: " + SegmentAddon.style_previews_dir)
+	log.debug("Segment addon resources: " + SegmentAddon.addon_resources_dir)
 
 	Scene.segment_addon_data = bpy.props.PointerProperty(type=SegmentAddonData)
 
-	# Create the display style enum
-	SegmentAddon.previews[SegmentAddon.style_previews] = bpy.utils.previews.new()
-	style_previews = generate_style_previews()
+	bpy.app.handlers.load_post.append(clear_resource_cache)
+	for handlers in (bpy.app.handlers.load_post, bpy.app.handlers.undo_post, bpy.app.handlers.redo_post):
+		handlers.append(clear_evaluation_cache)
+	bpy.app.handlers.frame_change_pre.append(update_segment_masks)
+
+	# Create the display style enum, the previews are loaded on first draw (see ensure_style_previews())
 	SegmentAddonData.style = bpy.props.EnumProperty(
 		name="Display style",
 		description="Sets in what style the segment display mask is processed to form the final display",
-		items=style_previews,
+		items=style_enum_items,
+		default=0,
 	)
 
 
@@ -1323,9 +3538,20 @@ def unregister():
 	for preview in SegmentAddon.previews.values():
 		bpy.utils.previews.remove(preview)
 	SegmentAddon.previews.clear()
+	style_items[:] = default_style_items()
 
 	del Scene.segment_addon_data
 
+	if clear_resource_cache in bpy.app.handlers.load_post:
+		bpy.app.handlers.load_post.remove(clear_resource_cache)
+	for handlers in (bpy.app.handlers.load_post, bpy.app.handlers.undo_post, bpy.app.handlers.redo_post):
+		if clear_evaluation_cache in handlers:
+			handlers.remove(clear_evaluation_cache)
+	if update_segment_masks in bpy.app.handlers.frame_change_pre:
+		bpy.app.handlers.frame_change_pre.remove(update_segment_masks)
+	ResourceCache.clear()
+	EvaluationCache.clear()
+
 
 if __name__ == "__main__":
 	register()
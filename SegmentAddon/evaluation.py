@@ -0,0 +1,279 @@
+"""
+CPU evaluation of the segment display node logic.
+
+Mirrors the .7SegmentBase, processor and .7SegmentCore node groups of segment.blend without using bpy,
+so the digit states of a display can be computed once per frame instead of once per shading sample.
+All functions work on NumPy arrays and broadcast over frames and digits.
+"""
+import typing
+
+import numpy
+
+# Segment ids as painted into the "Segment" color attribute of the digit prototype (id * 0.1)
+SEGMENT_UPPER_RIGHT = 1
+SEGMENT_LOWER_RIGHT = 2
+SEGMENT_BOTTOM = 3
+SEGMENT_LOWER_LEFT = 4
+SEGMENT_UPPER_LEFT = 5
+SEGMENT_TOP = 6
+SEGMENT_MIDDLE = 7
+
+# Lit segments of the digits 0-9, as wired in .7SegmentCore
+DIGIT_SEGMENTS = [
+	(SEGMENT_TOP, SEGMENT_UPPER_RIGHT, SEGMENT_LOWER_RIGHT, SEGMENT_BOTTOM, SEGMENT_LOWER_LEFT, SEGMENT_UPPER_LEFT),
+	(SEGMENT_UPPER_RIGHT, SEGMENT_LOWER_RIGHT),
+	(SEGMENT_TOP, SEGMENT_UPPER_RIGHT, SEGMENT_BOTTOM, SEGMENT_LOWER_LEFT, SEGMENT_MIDDLE),
+	(SEGMENT_TOP, SEGMENT_UPPER_RIGHT, SEGMENT_LOWER_RIGHT, SEGMENT_BOTTOM, SEGMENT_MIDDLE),
+	(SEGMENT_UPPER_RIGHT, SEGMENT_LOWER_RIGHT, SEGMENT_UPPER_LEFT, SEGMENT_MIDDLE),
+	(SEGMENT_TOP, SEGMENT_LOWER_RIGHT, SEGMENT_BOTTOM, SEGMENT_UPPER_LEFT, SEGMENT_MIDDLE),
+	(SEGMENT_TOP, SEGMENT_LOWER_RIGHT, SEGMENT_BOTTOM, SEGMENT_LOWER_LEFT, SEGMENT_UPPER_LEFT, SEGMENT_MIDDLE),
+	(SEGMENT_TOP, SEGMENT_UPPER_RIGHT, SEGMENT_LOWER_RIGHT),
+	(SEGMENT_TOP, SEGMENT_UPPER_RIGHT, SEGMENT_LOWER_RIGHT, SEGMENT_BOTTOM, SEGMENT_LOWER_LEFT, SEGMENT_UPPER_LEFT, SEGMENT_MIDDLE),
+	(SEGMENT_TOP, SEGMENT_UPPER_RIGHT, SEGMENT_LOWER_RIGHT, SEGMENT_BOTTOM, SEGMENT_UPPER_LEFT, SEGMENT_MIDDLE),
+]
+
+# Lit segments of all glyphs of the lookup texture: the digits, hex A-F, minus and blank
+GLYPH_SEGMENTS = DIGIT_SEGMENTS + [
+	(SEGMENT_TOP, SEGMENT_UPPER_RIGHT, SEGMENT_LOWER_RIGHT, SEGMENT_LOWER_LEFT, SEGMENT_UPPER_LEFT, SEGMENT_MIDDLE),
+	(SEGMENT_LOWER_RIGHT, SEGMENT_BOTTOM, SEGMENT_LOWER_LEFT, SEGMENT_UPPER_LEFT, SEGMENT_MIDDLE),
+	(SEGMENT_TOP, SEGMENT_BOTTOM, SEGMENT_LOWER_LEFT, SEGMENT_UPPER_LEFT),
+	(SEGMENT_UPPER_RIGHT, SEGMENT_LOWER_RIGHT, SEGMENT_BOTTOM, SEGMENT_LOWER_LEFT, SEGMENT_MIDDLE),
+	(SEGMENT_TOP, SEGMENT_BOTTOM, SEGMENT_LOWER_LEFT, SEGMENT_UPPER_LEFT, SEGMENT_MIDDLE),
+	(SEGMENT_TOP, SEGMENT_LOWER_LEFT, SEGMENT_UPPER_LEFT, SEGMENT_MIDDLE),
+	(SEGMENT_MIDDLE,),
+	(),
+]
+GLYPH_MINUS = 16
+GLYPH_BLANK = 17
+
+# 7 bit segment masks of the digits 0-9, bit (id - 1) is set for every lit segment
+DIGIT_MASKS = numpy.array([sum(1 << (segment - 1) for segment in segments) for segments in DIGIT_SEGMENTS], dtype=numpy.int32)
+
+# Segment states of all 7 bit masks, row mask and column (id - 1)
+SEGMENT_STATES = ((numpy.arange(1 << SEGMENT_MIDDLE)[:, None] >> numpy.arange(SEGMENT_MIDDLE)) & 1).astype(bool)
+
+# Smallest epsilon of the Compare operation of the Math node in Cycles and EEVEE
+COMPARE_MIN_EPSILON = 1e-5
+
+# Display indices of the clock sections, see SegmentAddon.create_clock_display()
+DISPLAY_MILLISECONDS = 0
+DISPLAY_SECONDS = 1
+DISPLAY_MINUTES = 2
+DISPLAY_HOURS = 3
+
+
+def safe_divide(a, b):
+	"""
+	Division of the Math node, dividing by zero results in zero.
+	"""
+	b = numpy.asarray(b)
+	return numpy.where(b != 0, a / numpy.where(b != 0, b, 1), 0).astype(numpy.result_type(a, b))
+
+
+def compare(a, b, epsilon=0):
+	"""
+	Compare operation of the Math node, 1 where a and b differ by at most epsilon (at least 1e-5 like Cycles).
+	"""
+	return numpy.abs(a - b) <= max(epsilon, COMPARE_MIN_EPSILON)
+
+
+def timer_values(frames, timer_from, timer_to, timer_start, timer_end, dtype=numpy.float32):
+	"""
+	Interpolates between the from and to values over the start and end frames (.7SegmentTimerResolver).
+	Holds the from value up to the start frame and the to value from the end frame on.
+	When the end frame is not after the start frame, the to value is held from the end frame on like the
+	F-curve of SegmentAddon.value_keyframes(), instead of adding up the overlapping from and to branches of the node.
+	"""
+	frames = numpy.asarray(frames, dtype=dtype)
+	value_from, value_to, start, end = dtype(timer_from), dtype(timer_to), dtype(timer_start), dtype(timer_end)
+
+	factor = numpy.clip(safe_divide(frames - start, numpy.abs(end - start)), 0, 1).astype(dtype)
+	direction = dtype(1) - dtype(value_from > value_to) * dtype(2)
+	interpolated = value_from + direction * (numpy.abs(value_to - value_from) * factor)
+
+	after = (frames > end) | compare(frames, end)
+	before = ((frames < start) | compare(frames, start)) & ~(after & (end <= start))
+	inside = ((frames < end) & (frames > start)).astype(dtype)
+	return value_from * before.astype(dtype) + value_to * after.astype(dtype) + interpolated * inside
+
+
+def sequence_values(frames, sequence_frames, sequence_values):
+	"""
+	Returns the sequence value held at every frame (constant interpolation).
+	Frames before the first sample take the first value.
+	"""
+	indices = numpy.searchsorted(numpy.asarray(sequence_frames), frames, side="right") - 1
+	return numpy.asarray(sequence_values)[numpy.clip(indices, 0, len(sequence_values) - 1)]
+
+
+def source_numbers(config, frames, dtype=numpy.float32):
+	"""
+	Returns the adjusted display number (value / divisor + float correction) for every frame.
+	A zero divisor results in the float correction alone, like the Math node division.
+
+	The config holds "value_source" ("number", "frame", "timer" or "sequence") and the values of the material parameters
+	without the "segment_" prefix, see SegmentAddon.material_parameters(). Sequences also need "sequence_frames"
+	and "sequence_values".
+	"""
+	frames = numpy.asarray(frames, dtype=dtype)
+	source = config["value_source"]
+	if source == "frame":
+		values = frames + dtype(config["frame_offset"])
+	elif source == "timer":
+		values = timer_values(frames, config["timer_from"], config["timer_to"], config["timer_start"], config["timer_end"], dtype)
+	elif source == "sequence":
+		values = sequence_values(frames, config["sequence_frames"], config["sequence_values"]).astype(dtype)
+	else:
+		values = numpy.full(frames.shape, config["number"], dtype=dtype)
+	return safe_divide(values, dtype(config["divisor"])) + dtype(config["float_correction"])
+
+
+def section_numbers(numbers, display_type, display_indices, dtype=numpy.float32):
+	"""
+	Converts the display number to the number shown by every display section (Decimal and Clock processors).
+	Broadcasts numbers of shape (frames, 1) against display indices of shape (digits,).
+	"""
+	numbers = numpy.asarray(numbers, dtype=dtype)
+	display_indices = numpy.asarray(display_indices)
+	if display_type == "numeric":
+		# Fraction digits are shifted in front of the decimal point
+		return numbers * numpy.power(dtype(10), display_indices.astype(dtype))
+
+	# Every section is computed once per number and selected per digit (Clock processor ramps)
+	sections = numpy.zeros((), dtype=dtype)
+	for display, section in (
+		(DISPLAY_HOURS, numbers / dtype(3600)),
+		(DISPLAY_MINUTES, numpy.fmod(numbers / dtype(60), dtype(60))),
+		(DISPLAY_SECONDS, numpy.fmod(numbers, dtype(60))),
+		(DISPLAY_MILLISECONDS, numbers * dtype(1000)),
+	):
+		sections = numpy.where(display_indices == display, section, sections)
+	return sections
+
+
+def digit_values(sections, digit_indices, dtype=numpy.float32):
+	"""
+	Returns the decimal digit at the digit index of every section number (.7SegmentCore).
+	Digits of negative numbers are negative (truncated remainder), the core shows them as 0.
+	"""
+	shifted = numpy.asarray(sections, dtype=dtype) / numpy.power(dtype(10), numpy.asarray(digit_indices).astype(dtype))
+	# Same as shifted - fmod(shifted, 1), both are exact in floating point
+	whole = numpy.trunc(shifted)
+
+	# The whole numbers fit into int64 up to 2^62, the integer remainder is exact and much faster than fmod
+	small = numpy.abs(whole) < 2 ** 62
+	digits = numpy.fmod(numpy.where(small, whole, 0).astype(numpy.int64), 10).astype(dtype)
+	if not small.all():
+		digits[~small] = numpy.fmod(whole[~small], dtype(10))
+	return digits
+
+
+def digit_masks(digits):
+	"""
+	Returns the 7 bit segment masks of the digit values.
+	Negative digits light a 0 like the select nodes of .7SegmentCore, digits above 9 are blank.
+	"""
+	digits = numpy.rint(numpy.asarray(digits)).astype(numpy.int32)
+	return numpy.where(digits <= 9, DIGIT_MASKS[numpy.clip(digits, 0, 9)], 0).astype(numpy.int32)
+
+
+def glyph_table(dtype=numpy.float32):
+	"""
+	Returns the glyph lookup table of shape (glyphs, 8), 1 where the segment (column) of the glyph (row) is lit.
+	Column 0 is for faces without a segment id and always off.
+	"""
+	table = numpy.zeros((len(GLYPH_SEGMENTS), SEGMENT_MIDDLE + 1), dtype=dtype)
+	for glyph, segments in enumerate(GLYPH_SEGMENTS):
+		table[glyph, list(segments)] = 1
+	return table
+
+
+def segment_states(masks):
+	"""
+	Expands segment masks to boolean segment states of shape (..., 7), column (id - 1) is the segment with that id.
+	"""
+	return SEGMENT_STATES[numpy.asarray(masks, dtype=numpy.int32) & 0x7f]
+
+
+def layout_indices(layout):
+	"""
+	Returns the (digit_indices, display_indices) int32 arrays of a display layout, in the order the pieces
+	are generated (right to left, see SegmentAddon.create_display_layout()).
+
+	The layout holds the SegmentAddonData settings "display_type", "digits", "fraction_digits" and the clock
+	"*_digits" counts. Separators get digit index -1 and display index 0.
+	"""
+	digit_indices = []
+	display_indices = []
+
+	def add_digits(display, count):
+		digit_indices.extend(range(count))
+		display_indices.extend([display] * count)
+
+	def add_separator():
+		digit_indices.append(-1)
+		display_indices.append(0)
+
+	if layout["display_type"] == "numeric":
+		fraction_digits = layout["fraction_digits"]
+		add_digits(fraction_digits, fraction_digits)
+		if fraction_digits > 0:
+			add_separator()
+		add_digits(0, layout["digits"])
+	elif layout["display_type"] == "clock":
+		sections = [
+			(DISPLAY_MILLISECONDS, layout["millisecond_digits"]),
+			(DISPLAY_SECONDS, layout["second_digits"]),
+			(DISPLAY_MINUTES, layout["minute_digits"]),
+			(DISPLAY_HOURS, layout["hour_digits"]),
+		]
+		for i, (display, count) in enumerate(sections):
+			if count == 0:
+				continue
+			add_digits(display, count)
+			if any(higher > 0 for _, higher in sections[i + 1:]):
+				add_separator()
+
+	return numpy.array(digit_indices, dtype=numpy.int32), numpy.array(display_indices, dtype=numpy.int32)
+
+
+class DisplayEvaluation(typing.NamedTuple):
+	"""
+	Evaluated states of a display layout, frames are the first and layout pieces the second axis.
+	"""
+	numbers: numpy.ndarray  # (frames,) adjusted display numbers
+	digits: numpy.ndarray  # (frames, pieces) digit values, -1 at separators
+	masks: numpy.ndarray  # (frames, pieces) int32 segment masks
+	segments: numpy.ndarray  # (frames, pieces, 7) boolean segment states
+
+
+def number_digits(numbers, display_type, digit_indices, display_indices, dtype=numpy.float32):
+	"""
+	Returns the digit values of a display layout for display numbers of shape (frames,), -1 at separators.
+	"""
+	digit_indices = numpy.asarray(digit_indices)
+	sections = section_numbers(numpy.asarray(numbers)[:, None], display_type, display_indices, dtype)
+	digits = digit_values(sections, numpy.maximum(digit_indices, 0), dtype)
+	digits[:, digit_indices < 0] = -1
+	return digits
+
+
+def evaluate_display(config, frames, digit_indices, display_indices, dtype=numpy.float32) -> DisplayEvaluation:
+	"""
+	Evaluates the display number, digit values, segment masks and segment states of a display layout.
+	Separators (digit index < 0) get no digit and an empty mask.
+	"""
+	digit_indices = numpy.asarray(digit_indices)
+	numbers = source_numbers(config, numpy.atleast_1d(frames), dtype)
+	digits = number_digits(numbers, config["display_type"], digit_indices, display_indices, dtype)
+	masks = digit_masks(digits)
+	masks[:, digit_indices < 0] = 0
+	return DisplayEvaluation(numbers, digits, masks, segment_states(masks))
+
+
+def evaluate_masks(config, frames, digit_indices, display_indices, dtype=numpy.float32):
+	"""
+	Evaluates the segment masks of a display layout.
+	Returns an int32 array of shape (frames, digits), separators (digit index < 0) get an empty mask.
+	"""
+	return evaluate_display(config, frames, digit_indices, display_indices, dtype).masks
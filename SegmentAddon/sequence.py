@@ -0,0 +1,51 @@
+"""
+Loading of value time series for the "sequence" display value source.
+"""
+import csv
+import json
+import os
+
+import numpy
+
+
+def load_sequence(filepath):
+	"""
+	Loads a time series of display values and returns (frames, values) arrays sorted by frame.
+
+	CSV files contain frame,value rows, rows that are not numbers (like a header) are skipped.
+	JSON files contain a list of [frame, value] pairs, a list of {"frame": ..., "value": ...} objects
+	or an object with "frames" and "values" lists.
+	"""
+	if os.path.splitext(filepath)[1].lower() == ".json":
+		with open(filepath) as f:
+			series = json.load(f)
+		if isinstance(series, dict):
+			frames, values = series["frames"], series["values"]
+		elif len(series) > 0 and isinstance(series[0], dict):
+			frames = [sample["frame"] for sample in series]
+			values = [sample["value"] for sample in series]
+		else:
+			frames = [sample[0] for sample in series]
+			values = [sample[1] for sample in series]
+	else:
+		frames = []
+		values = []
+		with open(filepath, newline='') as f:
+			for row in csv.reader(f):
+				try:
+					frame, value = float(row[0]), float(row[1])
+				except (ValueError, IndexError):
+					continue
+				frames.append(frame)
+				values.append(value)
+
+	frames = numpy.asarray(frames, dtype=numpy.float64)
+	values = numpy.asarray(values, dtype=numpy.float64)
+	if frames.shape != values.shape:
+		raise ValueError("The sequence needs the same number of frames and values")
+	if len(frames) == 0:
+		raise ValueError(f"No samples found in {filepath}")
+
+	order = numpy.argsort(frames, kind="stable")
+	return frames[order], values[order]
+
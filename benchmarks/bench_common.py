@@ -0,0 +1,59 @@
+# Helpers shared by the benchmarks running inside Blender.
+
+import sys
+
+import bpy
+
+try:
+	import resource
+except ImportError:
+	# Not available on Windows
+	resource = None
+
+
+def max_rss_kb():
+	"""
+	Maximum resident set size of the process so far, in kilobytes.
+	The operating system only reports the lifetime maximum, so the value is cumulative over all previous cases.
+	"""
+	if resource is None:
+		return None
+	rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+	# Bytes on macOS, kilobytes elsewhere
+	return rss // 1024 if sys.platform == "darwin" else rss
+
+
+def remove_generated(objects):
+	"""
+	Removes the generated objects, their meshes and the materials left without users.
+	"""
+	meshes = {o.data for o in objects if o.data is not None}
+	for o in objects:
+		bpy.data.objects.remove(o)
+	for mesh in meshes:
+		if mesh.users == 0:
+			bpy.data.meshes.remove(mesh)
+	for mat in list(bpy.data.materials):
+		if mat.users == 0:
+			bpy.data.materials.remove(mat)
+
+
+def compare(results, baseline, threshold):
+	"""
+	Prints the case times against the baseline results and returns the names of the cases slower than the threshold.
+	Cases recording their geometry are also checked for changed vertex and object counts.
+	"""
+	regressions = []
+	baseline_cases = {case["name"]: case for case in baseline["cases"]}
+	for case in results["cases"]:
+		old = baseline_cases.get(case["name"])
+		if old is None:
+			continue
+		ratio = case["time"] / old["time"] if old["time"] > 0 else 1.0
+		status = "REGRESSION" if ratio > threshold else "ok"
+		print(f"{case['name']:40} {old['time'] * 1000:9.2f} ms -> {case['time'] * 1000:9.2f} ms  x{ratio:.2f}  {status}")
+		if ratio > threshold:
+			regressions.append(case["name"])
+		if case.get("vertices") != old.get("vertices") or case.get("objects") != old.get("objects"):
+			print(f"{case['name']:40} geometry changed: {old.get('vertices')} -> {case.get('vertices')} vertices, {old.get('objects')} -> {case.get('objects')} objects")
+	return regressions
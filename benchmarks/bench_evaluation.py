@@ -0,0 +1,87 @@
+# Measures the NumPy evaluation of the display value pipeline (SegmentAddon/evaluation.py).
+# Every case evaluates the digit values, segment masks and segment states of a display layout
+# for all frames at once and records the wall time and the evaluated pieces per second.
+#
+# Does not need Blender, run it with a Python interpreter that has NumPy installed.
+#
+# Usage:
+#   python benchmarks/bench_evaluation.py [--frames N] [--output FILE] [--repeat N]
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+import numpy
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.realpath(__file__)), "..", "SegmentAddon"))
+import evaluation
+
+
+def parse_args():
+	parser = argparse.ArgumentParser(description="Segment display evaluation benchmark")
+	parser.add_argument("--frames", type=int, default=100000, help="Number of evaluated frames")
+	parser.add_argument("--output", default="bench_evaluation.json", help="JSON file the results are written to")
+	parser.add_argument("--repeat", type=int, default=5, help="Number of timed runs of every case")
+	return parser.parse_args()
+
+
+def benchmark_cases():
+	numeric = {"display_type": "numeric", "digits": 8, "fraction_digits": 2}
+	clock = {"display_type": "clock", "hour_digits": 2, "minute_digits": 2, "second_digits": 2, "millisecond_digits": 3}
+	values = {"divisor": 1.0, "float_correction": 0.0001}
+	return [
+		("numeric_number", numeric, dict(values, value_source="number", number=1234.56)),
+		("numeric_frame", numeric, dict(values, value_source="frame", frame_offset=0.0)),
+		("numeric_timer", numeric, dict(values, value_source="timer", timer_from=0.0, timer_to=99999.0, timer_start=0.0, timer_end=100000.0)),
+		("numeric_sequence", numeric, dict(values, value_source="sequence",
+			sequence_frames=list(range(0, 100000, 10)), sequence_values=[i * 0.5 for i in range(10000)])),
+		("clock_frame", clock, dict(values, value_source="frame", frame_offset=0.0, divisor=24.0)),
+		("clock_timer", clock, dict(values, value_source="timer", timer_from=0.0, timer_to=7200.0, timer_start=0.0, timer_end=100000.0)),
+	]
+
+
+def run_case(layout, config, frames, repeat):
+	config = dict(config, display_type=layout["display_type"])
+	digit_indices, display_indices = evaluation.layout_indices(layout)
+
+	times = []
+	for i in range(repeat):
+		start = time.perf_counter()
+		result = evaluation.evaluate_display(config, frames, digit_indices, display_indices)
+		times.append(time.perf_counter() - start)
+
+	return {
+		"pieces": len(digit_indices),
+		"lit_segments": int(result.segments.sum()),
+		"time": min(times),
+		"time_median": statistics.median(times),
+		"pieces_per_second": len(frames) * len(digit_indices) / min(times),
+	}
+
+
+def main():
+	args = parse_args()
+	frames = numpy.arange(args.frames, dtype=numpy.float32)
+
+	results = {
+		"numpy": numpy.__version__,
+		"frames": args.frames,
+		"repeat": args.repeat,
+		"cases": [],
+	}
+	for name, layout, config in benchmark_cases():
+		case = run_case(layout, config, frames, args.repeat)
+		case["name"] = name
+		results["cases"].append(case)
+		print(f"{name:24} {case['time'] * 1000:9.2f} ms  {case['pieces']:3} pieces  {case['pieces_per_second'] / 1e6:8.1f} M pieces/s")
+
+	with open(args.output, "w") as f:
+		json.dump(results, f, indent=2)
+	print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+	main()
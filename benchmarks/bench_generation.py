@@ -0,0 +1,145 @@
+# Measures how display generation scales with the display layout and the mesh processing settings.
+# Every case runs the segment_addon.create operator with the given settings and records the wall time,
+# the maximum RSS of the process so far and the generated vertex, object and datablock counts.
+# The RSS is the lifetime maximum of the Blender process, so it is cumulative over the previous cases.
+#
+# Usage:
+#   blender -b --factory-startup --python benchmarks/bench_generation.py -- [--output FILE] [--baseline FILE] [--repeat N]
+#
+# With --baseline the results are compared to a previous output file, cases slower than
+# the baseline by more than --threshold are reported and the exit code is 1.
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+import bpy
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.realpath(__file__)), ".."))
+sys.path.insert(0, os.path.dirname(os.path.realpath(__file__)))
+import SegmentAddon
+from bench_common import compare, max_rss_kb, remove_generated
+
+DATABLOCK_COLLECTIONS = ("objects", "meshes", "materials", "node_groups")
+
+
+def parse_args():
+	argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+	parser = argparse.ArgumentParser(description="Segment display generation benchmark")
+	parser.add_argument("--output", default="bench_generation.json", help="JSON file the results are written to")
+	parser.add_argument("--baseline", help="Previous results to compare against")
+	parser.add_argument("--threshold", type=float, default=1.2, help="Allowed slowdown factor against the baseline")
+	parser.add_argument("--repeat", type=int, default=3, help="Number of timed runs of every case")
+	return parser.parse_args(argv)
+
+
+def benchmark_cases():
+	cases = []
+
+	# Numeric layout sweep
+	for digits in (1, 4, 8, 12, 20):
+		for fraction_digits in (0, 2):
+			if fraction_digits < digits:
+				cases.append((f"numeric_d{digits}_f{fraction_digits}", {
+					"display_type": "numeric",
+					"digits": digits,
+					"fraction_digits": fraction_digits,
+					# Vertex colors address at most 10 digits
+					"attribute_encoding": "int32" if digits > 10 else "color",
+				}))
+
+	# Clock layout sweep
+	for hours, minutes, seconds, milliseconds in ((0, 2, 2, 0), (2, 2, 2, 0), (2, 2, 2, 3), (3, 2, 2, 3)):
+		cases.append((f"clock_h{hours}_m{minutes}_s{seconds}_ms{milliseconds}", {
+			"display_type": "clock",
+			"hour_digits": hours,
+			"minute_digits": minutes,
+			"second_digits": seconds,
+			"millisecond_digits": milliseconds,
+		}))
+
+	# Mesh processing toggles on a fixed layout
+	base = {"display_type": "numeric", "digits": 8, "fraction_digits": 2}
+	toggles = {
+		"no_join": {"join_display": False},
+		"no_fuse": {"fuse_display": False},
+		"hide_background": {"hide_background": True},
+		"skew": {"skew": 0.2},
+		"extrude": {"extrude": 2.0},
+		"all": {"join_display": False, "hide_background": True, "skew": 0.2, "extrude": 2.0},
+	}
+	for name, settings in toggles.items():
+		cases.append((f"toggle_{name}", dict(base, **settings)))
+
+	return cases
+
+
+def datablock_counts():
+	return {name: len(getattr(bpy.data, name)) for name in DATABLOCK_COLLECTIONS}
+
+
+def run_case(settings, repeat):
+	scene = bpy.context.scene
+	scene.property_unset("segment_addon_data")
+	data = scene.segment_addon_data
+	for key, value in settings.items():
+		setattr(data, key, value)
+
+	times = []
+	for i in range(repeat):
+		before = datablock_counts()
+		start = time.perf_counter()
+		bpy.ops.segment_addon.create()
+		times.append(time.perf_counter() - start)
+
+		objects = list(bpy.context.selected_objects)
+		after = datablock_counts()
+		result = {
+			"vertices": sum(len(o.data.vertices) for o in objects),
+			"objects": len(objects),
+			"datablocks": {name: after[name] - before[name] for name in DATABLOCK_COLLECTIONS},
+		}
+		remove_generated(objects)
+
+	result["time"] = min(times)
+	result["time_median"] = statistics.median(times)
+	result["max_rss_so_far_kb"] = max_rss_kb()
+	return result
+
+
+def main():
+	args = parse_args()
+	SegmentAddon.register()
+
+	results = {
+		"blender": bpy.app.version_string,
+		"repeat": args.repeat,
+		"cases": [],
+	}
+	for name, settings in benchmark_cases():
+		case = run_case(settings, args.repeat)
+		case["name"] = name
+		case["settings"] = settings
+		results["cases"].append(case)
+		print(f"{name:40} {case['time'] * 1000:9.2f} ms  {case['vertices']:7} vertices  {case['objects']:3} objects")
+
+	with open(args.output, "w") as f:
+		json.dump(results, f, indent=2)
+	print(f"Results written to {args.output}")
+
+	SegmentAddon.unregister()
+
+	if args.baseline:
+		with open(args.baseline) as f:
+			baseline = json.load(f)
+		regressions = compare(results, baseline, args.threshold)
+		if regressions:
+			print(f"{len(regressions)} cases regressed: {', '.join(regressions)}")
+			sys.exit(1)
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,236 @@
+# Measures the render cost of the display styles with Cycles on the CPU.
+# Every case generates a grid of displays with one style and value source, frames them with a fixed
+# orthographic camera and renders them at a fixed sample count with adaptive sampling and denoising disabled.
+# The wall time, the pixel samples per second, the Cycles peak memory and the maximum RSS of the process so far
+# (cumulative over the previous cases) are recorded.
+#
+# Usage:
+#   blender -b --factory-startup --python benchmarks/bench_render.py -- [--displays N] [--samples N] [--resolution W H]
+#       [--threads N] [--styles NAME ...] [--sources NAME ...] [--output FILE] [--baseline FILE] [--repeat N]
+#
+# With --baseline the results are compared to a previous output file, cases slower than
+# the baseline by more than --threshold are reported and the exit code is 1.
+
+import argparse
+import json
+import math
+import os
+import re
+import statistics
+import sys
+import tempfile
+import time
+
+import bpy
+import mathutils
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.realpath(__file__)), ".."))
+sys.path.insert(0, os.path.dirname(os.path.realpath(__file__)))
+import SegmentAddon
+from bench_common import compare, max_rss_kb, remove_generated
+
+STYLES = ("plain", "classic", "lcd")
+VALUE_SOURCES = ("number", "frame", "timer", "sequence")
+
+# Frame the displays are rendered at, inside the timer and sequence ranges
+RENDER_FRAME = 125
+
+# Cycles render statistics, like "Mem:12.34M, Peak:56.78M"
+PEAK_MEMORY = re.compile(r"Peak:?\s*([\d.]+)\s*([KMG])")
+
+
+def parse_args():
+	argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+	parser = argparse.ArgumentParser(description="Segment display Cycles render benchmark")
+	parser.add_argument("--displays", type=int, default=16, help="Number of rendered displays")
+	parser.add_argument("--samples", type=int, default=32, help="Cycles samples per pixel")
+	parser.add_argument("--resolution", type=int, nargs=2, default=(640, 360), metavar=("WIDTH", "HEIGHT"), help="Render resolution")
+	parser.add_argument("--threads", type=int, default=0, help="Number of render threads, 0 detects the number of cores")
+	parser.add_argument("--styles", nargs="+", default=STYLES, choices=STYLES, help="Measured display styles")
+	parser.add_argument("--sources", nargs="+", default=VALUE_SOURCES, choices=VALUE_SOURCES, help="Measured value sources")
+	parser.add_argument("--output", default="bench_render.json", help="JSON file the results are written to")
+	parser.add_argument("--baseline", help="Previous results to compare against")
+	parser.add_argument("--threshold", type=float, default=1.2, help="Allowed slowdown factor against the baseline")
+	parser.add_argument("--repeat", type=int, default=2, help="Number of timed renders of every case")
+	return parser.parse_args(argv)
+
+
+def write_sequence(directory):
+	# One value per 5 frames, held in between
+	filepath = os.path.join(directory, "sequence.csv")
+	with open(filepath, "w") as f:
+		f.write("frame,value\n")
+		for frame in range(0, 250, 5):
+			f.write(f"{frame},{frame * 1.37:.2f}\n")
+	return filepath
+
+
+def display_settings(style, source, sequence_filepath):
+	return {
+		"display_type": "numeric",
+		"digits": 4,
+		"fraction_digits": 2,
+		"style": style,
+		"display_value_numeric": source,
+		"number": 1234.56,
+		"frame_divisor": 1.0,
+		"timer_frame_start": 0,
+		"timer_frame_end": 250,
+		"timer_number_from": 0.0,
+		"timer_number_to": 9999.0,
+		"sequence_filepath": sequence_filepath,
+	}
+
+
+def setup_scene(args):
+	scene = bpy.context.scene
+	for obj in list(bpy.data.objects):
+		bpy.data.objects.remove(obj)
+
+	scene.render.engine = 'CYCLES'
+	scene.cycles.device = 'CPU'
+	scene.cycles.samples = args.samples
+	scene.cycles.use_adaptive_sampling = False
+	scene.cycles.use_denoising = False
+	scene.render.resolution_x, scene.render.resolution_y = args.resolution
+	scene.render.resolution_percentage = 100
+	if args.threads > 0:
+		scene.render.threads_mode = 'FIXED'
+		scene.render.threads = args.threads
+	else:
+		scene.render.threads_mode = 'AUTO'
+
+	camera = bpy.data.objects.new("BenchCamera", bpy.data.cameras.new("BenchCamera"))
+	camera.data.type = 'ORTHO'
+	scene.collection.objects.link(camera)
+	scene.camera = camera
+	scene.frame_set(RENDER_FRAME)
+	return scene
+
+
+def world_bounds(objects):
+	corners = [obj.matrix_world @ mathutils.Vector(corner) for obj in objects for corner in obj.bound_box]
+	low = mathutils.Vector([min(c[i] for c in corners) for i in range(3)])
+	high = mathutils.Vector([max(c[i] for c in corners) for i in range(3)])
+	return low, high
+
+
+def layout_grid(results):
+	"""
+	Moves the displays into a grid, all displays have the size of the first one.
+	"""
+	low, high = world_bounds(results[0].objects)
+	size = high - low
+	columns = math.ceil(math.sqrt(len(results)))
+	for i, result in enumerate(results):
+		offset = mathutils.Matrix.Translation((size.x * 1.1 * (i % columns), -size.y * 1.2 * (i // columns), 0))
+		for obj in result.objects:
+			obj.matrix_world = offset @ obj.matrix_world
+
+
+def frame_camera(scene, objects):
+	low, high = world_bounds(objects)
+	center = (low + high) / 2
+	size = high - low
+	aspect = scene.render.resolution_x / scene.render.resolution_y
+	camera = scene.camera
+	camera.location = (center.x, center.y, high.z + max(size.x, size.y))
+	camera.rotation_euler = (0, 0, 0)
+	camera.data.ortho_scale = max(size.x, size.y * aspect) * 1.05
+	camera.data.clip_end = max(size.x, size.y) * 4
+
+
+class RenderStats:
+	"""
+	Keeps the highest Cycles peak memory reported through the render_stats handler, in megabytes.
+	"""
+	UNITS = {"K": 1 / 1024, "M": 1, "G": 1024}
+
+	def __init__(self):
+		self.peak_mb = 0.0
+
+	def __call__(self, stats, *args):
+		match = PEAK_MEMORY.search(stats)
+		if match:
+			self.peak_mb = max(self.peak_mb, float(match.group(1)) * self.UNITS[match.group(2)])
+
+
+def run_case(scene, collection, settings, args, stats):
+	config = SegmentAddon.DisplayConfig(**settings)
+	results = SegmentAddon.generate_displays([(config, None, None)] * args.displays, collection)
+	layout_grid(results)
+	objects = [obj for result in results for obj in result.objects]
+	frame_camera(scene, objects)
+
+	times = []
+	stats.peak_mb = 0.0
+	for i in range(args.repeat):
+		start = time.perf_counter()
+		bpy.ops.render.render(write_still=False)
+		times.append(time.perf_counter() - start)
+
+	pixels = scene.render.resolution_x * scene.render.resolution_y
+	result = {
+		"objects": len(objects),
+		"vertices": sum(len(o.data.vertices) for o in objects if o.type == 'MESH'),
+		# The first render also builds the BVH and compiles the shaders
+		"time_first": times[0],
+		"time": min(times),
+		"time_median": statistics.median(times),
+		"samples_per_second": pixels * args.samples / min(times),
+		"cycles_peak_mb": stats.peak_mb,
+		"max_rss_so_far_kb": max_rss_kb(),
+	}
+	remove_generated(objects)
+	return result
+
+
+def main():
+	args = parse_args()
+	SegmentAddon.register()
+	scene = setup_scene(args)
+	collection = bpy.data.collections.new("BenchDisplays")
+	scene.collection.children.link(collection)
+
+	stats = RenderStats()
+	bpy.app.handlers.render_stats.append(stats)
+
+	results = {
+		"blender": bpy.app.version_string,
+		"displays": args.displays,
+		"samples": args.samples,
+		"resolution": list(args.resolution),
+		"threads": args.threads,
+		"repeat": args.repeat,
+		"cases": [],
+	}
+	with tempfile.TemporaryDirectory() as directory:
+		sequence_filepath = write_sequence(directory)
+		for style in args.styles:
+			for source in args.sources:
+				name = f"{style}_{source}"
+				case = run_case(scene, collection, display_settings(style, source, sequence_filepath), args, stats)
+				case["name"] = name
+				case["style"] = style
+				case["value_source"] = source
+				results["cases"].append(case)
+				print(f"{name:24} {case['time'] * 1000:9.1f} ms  {case['samples_per_second'] / 1e6:7.2f} M samples/s  {case['cycles_peak_mb']:8.1f} MB peak")
+
+	bpy.app.handlers.render_stats.remove(stats)
+	with open(args.output, "w") as f:
+		json.dump(results, f, indent=2)
+	print(f"Results written to {args.output}")
+
+	SegmentAddon.unregister()
+
+	if args.baseline:
+		with open(args.baseline) as f:
+			baseline = json.load(f)
+		regressions = compare(results, baseline, args.threshold)
+		if regressions:
+			print(f"{len(regressions)} cases regressed: {', '.join(regressions)}")
+			sys.exit(1)
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,107 @@
+# Measures how much the addon adds to the launch time of Blender in background mode.
+# Blender is started repeatedly without and with importing and registering the addon, the runs are interleaved
+# and the median wall times are compared. The addon runs also report the import and register() times measured
+# inside Blender and whether numpy was imported by the registration.
+#
+# Runs outside of Blender, the Blender executable is taken from --blender or the BLENDER environment variable.
+#
+# Usage:
+#   python benchmarks/bench_startup.py [--blender PATH] [--runs N] [--output FILE]
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+REPOSITORY = os.path.join(os.path.dirname(os.path.realpath(__file__)), "..")
+
+BASELINE_EXPR = "pass"
+
+ADDON_EXPR = """
+import json, sys, time
+sys.path.insert(0, {repository!r})
+numpy_before = "numpy" in sys.modules
+start = time.perf_counter()
+import SegmentAddon
+imported = time.perf_counter()
+SegmentAddon.register()
+registered = time.perf_counter()
+print("SEGMENT_STARTUP " + json.dumps({{
+	"import": imported - start,
+	"register": registered - imported,
+	"numpy_imported": not numpy_before and "numpy" in sys.modules,
+}}))
+"""
+
+
+def parse_args():
+	parser = argparse.ArgumentParser(description="Segment addon startup time benchmark")
+	parser.add_argument("--blender", default=os.environ.get("BLENDER", "blender"), help="Blender executable")
+	parser.add_argument("--runs", type=int, default=10, help="Number of launches with and without the addon")
+	parser.add_argument("--output", default="bench_startup.json", help="JSON file the results are written to")
+	return parser.parse_args()
+
+
+def launch(blender, expr):
+	command = [blender, "-b", "--factory-startup", "--python-exit-code", "1", "--python-expr", expr]
+	start = time.perf_counter()
+	process = subprocess.run(command, capture_output=True, text=True)
+	elapsed = time.perf_counter() - start
+	if process.returncode != 0:
+		sys.exit(f"Blender failed with exit code {process.returncode}:\n{process.stdout}\n{process.stderr}")
+	return elapsed, process.stdout
+
+
+def addon_stats(stdout):
+	for line in stdout.splitlines():
+		if line.startswith("SEGMENT_STARTUP "):
+			return json.loads(line[len("SEGMENT_STARTUP "):])
+	sys.exit(f"No addon timings found in the Blender output:\n{stdout}")
+
+
+def main():
+	args = parse_args()
+	addon_expr = ADDON_EXPR.format(repository=os.path.abspath(REPOSITORY))
+
+	# Warm up the file system cache
+	launch(args.blender, BASELINE_EXPR)
+
+	baseline_times = []
+	addon_times = []
+	stats = []
+	for i in range(args.runs):
+		baseline_times.append(launch(args.blender, BASELINE_EXPR)[0])
+		elapsed, stdout = launch(args.blender, addon_expr)
+		addon_times.append(elapsed)
+		stats.append(addon_stats(stdout))
+
+	baseline = statistics.median(baseline_times)
+	addon = statistics.median(addon_times)
+	results = {
+		"blender": args.blender,
+		"runs": args.runs,
+		"baseline": baseline,
+		"addon": addon,
+		"overhead": addon - baseline,
+		"import": statistics.median(s["import"] for s in stats),
+		"register": statistics.median(s["register"] for s in stats),
+		"numpy_imported": any(s["numpy_imported"] for s in stats),
+		"baseline_times": baseline_times,
+		"addon_times": addon_times,
+	}
+	print(f"Blender launch       {baseline * 1000:9.1f} ms")
+	print(f"With the addon       {addon * 1000:9.1f} ms  (+{results['overhead'] * 1000:.1f} ms)")
+	print(f"  import             {results['import'] * 1000:9.1f} ms")
+	print(f"  register()         {results['register'] * 1000:9.1f} ms")
+	print(f"  imports numpy      {'yes' if results['numpy_imported'] else 'no'}")
+
+	with open(args.output, "w") as f:
+		json.dump(results, f, indent=2)
+	print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+	main()
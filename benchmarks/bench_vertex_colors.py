@@ -0,0 +1,81 @@
+# Compares the per-loop vertex color painting with the bulk foreach_set path.
+#
+# Usage:
+#   blender -b --factory-startup --python benchmarks/bench_vertex_colors.py -- [--loops N] [--repeat N]
+
+import argparse
+import os
+import sys
+import time
+
+import bmesh
+import bpy
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.realpath(__file__)), ".."))
+from SegmentAddon import SegmentAddon
+
+
+def parse_args():
+	argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+	parser = argparse.ArgumentParser(description="Vertex color painting benchmark")
+	parser.add_argument("--loops", type=int, default=1_000_000, help="Approximate number of face corners of the test mesh")
+	parser.add_argument("--repeat", type=int, default=3, help="Number of timed runs, the best one is reported")
+	return parser.parse_args(argv)
+
+
+def create_grid_mesh(loops):
+	# Every grid quad has 4 loops
+	side = max(1, int((loops / 4) ** 0.5))
+	bm = bmesh.new()
+	bmesh.ops.create_grid(bm, x_segments=side, y_segments=side, size=1)
+	mesh = bpy.data.meshes.new("bench_vertex_colors")
+	bm.to_mesh(mesh)
+	bm.free()
+	return mesh
+
+
+def paint_per_loop(mesh, color_map, r, g, b):
+	# The previous implementation of SegmentAddon.vertex_paint_all_rgb
+	i = 0
+	for poly in mesh.polygons:
+		for idx in poly.loop_indices:
+			color_map.data[i].color = [r, g, b, 1]
+			i += 1
+
+
+def create_legacy_layer(mesh, name):
+	if hasattr(mesh, "vertex_colors"):
+		return mesh.vertex_colors.new(name=name)
+	return mesh.color_attributes.new(name=name, type='BYTE_COLOR', domain='CORNER')
+
+
+def best_time(func, repeat):
+	best = float("inf")
+	for _ in range(repeat):
+		start = time.perf_counter()
+		func()
+		best = min(best, time.perf_counter() - start)
+	return best
+
+
+def main():
+	args = parse_args()
+	mesh = create_grid_mesh(args.loops)
+	loop_count = len(mesh.loops)
+
+	legacy_layer = create_legacy_layer(mesh, "Before")
+	bulk_layer = mesh.color_attributes.new(name="After", type='BYTE_COLOR', domain='CORNER')
+
+	before = best_time(lambda: paint_per_loop(mesh, legacy_layer, 0.31, 0.31, 0.31), args.repeat)
+	after = best_time(lambda: SegmentAddon.vertex_paint_all_rgb(mesh, bulk_layer, 0.31, 0.31, 0.31), args.repeat)
+
+	print(f"Loops: {loop_count}")
+	print(f"Before (per loop):    {before:.4f} s  {loop_count / before:,.0f} loops/s")
+	print(f"After (foreach_set):  {after:.4f} s  {loop_count / after:,.0f} loops/s")
+	print(f"Speedup: {before / after:.1f}x")
+
+	bpy.data.meshes.remove(mesh)
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,8 @@
+import os
+import sys
+
+# The bpy-free modules are imported directly like the tools do, the addon package from the repository root
+ROOT = os.path.join(os.path.dirname(os.path.realpath(__file__)), "..")
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "SegmentAddon"))
+sys.path.insert(0, os.path.join(ROOT, "tools"))
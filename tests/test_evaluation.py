@@ -0,0 +1,170 @@
+import warnings
+
+import numpy
+import pytest
+
+import evaluation
+
+
+def numeric_config(**settings):
+	config = {
+		"display_type": "numeric",
+		"value_source": "number",
+		"number": 0.0,
+		"divisor": 1.0,
+		"float_correction": 0.0,
+	}
+	config.update(settings)
+	return config
+
+
+def clock_layout(hours=0, minutes=2, seconds=2, milliseconds=0):
+	return {
+		"display_type": "clock",
+		"hour_digits": hours,
+		"minute_digits": minutes,
+		"second_digits": seconds,
+		"millisecond_digits": milliseconds,
+	}
+
+
+def test_digit_masks_match_digit_segments():
+	for digit, segments in enumerate(evaluation.DIGIT_SEGMENTS):
+		lit = numpy.flatnonzero(evaluation.segment_states(evaluation.DIGIT_MASKS[digit])) + 1
+		assert sorted(lit) == sorted(segments)
+
+
+def test_glyph_table_starts_with_the_digits():
+	table = evaluation.glyph_table()
+	assert table.shape == (len(evaluation.GLYPH_SEGMENTS), evaluation.SEGMENT_MIDDLE + 1)
+	assert not table[:, 0].any()
+	numpy.testing.assert_array_equal(table[:10, 1:], evaluation.segment_states(evaluation.DIGIT_MASKS))
+	assert table[evaluation.GLYPH_MINUS].sum() == 1
+	assert table[evaluation.GLYPH_BLANK].sum() == 0
+
+
+def test_safe_divide_by_zero():
+	with warnings.catch_warnings():
+		warnings.simplefilter("error")
+		result = evaluation.safe_divide(numpy.array([1.0, -2.0, 6.0], dtype=numpy.float32), numpy.float32(0))
+	numpy.testing.assert_array_equal(result, [0, 0, 0])
+	assert result.dtype == numpy.float32
+	numpy.testing.assert_array_equal(evaluation.safe_divide(numpy.array([6.0]), numpy.array([3.0])), [2.0])
+
+
+def test_compare_epsilon():
+	assert evaluation.compare(numpy.float32(10 + 5e-6), numpy.float32(10))
+	assert not evaluation.compare(numpy.float32(10 + 5e-5), numpy.float32(10))
+	assert evaluation.compare(1.0, 1.5, 0.5)
+
+
+def test_timer_start_compare_epsilon():
+	# Within 1e-5 of the start frame the node holds the from value and interpolates at the same time
+	values = evaluation.timer_values([10 + 5e-6, 10 + 5e-5], 4.0, 0.0, 10, 20)
+	numpy.testing.assert_allclose(values, [8, 4], atol=1e-4)
+
+
+def test_timer_interpolates_between_start_and_end():
+	values = evaluation.timer_values([0, 10, 15, 20, 30], 1.0, 5.0, 10, 20)
+	numpy.testing.assert_allclose(values, [1, 1, 3, 5, 5])
+	values = evaluation.timer_values([0, 10, 15, 20, 30], 5.0, 1.0, 10, 20)
+	numpy.testing.assert_allclose(values, [5, 5, 3, 1, 1])
+
+
+def test_timer_with_equal_start_and_end():
+	# The to value is held from the end frame on
+	values = evaluation.timer_values([0, 10, 20], 1.0, 5.0, 10, 10)
+	numpy.testing.assert_allclose(values, [1, 5, 5])
+
+
+def test_timer_with_start_after_end():
+	# The from value is held up to the end frame and the to value from it on
+	values = evaluation.timer_values([0, 9, 10, 15, 20, 30], 2.0, 10.0, 20, 10)
+	numpy.testing.assert_allclose(values, [2, 2, 10, 10, 10, 10])
+
+
+def test_sequence_holds_values():
+	values = evaluation.sequence_values([-5, 0, 4, 5, 100], [0, 5], [1.5, 2.5])
+	numpy.testing.assert_array_equal(values, [1.5, 1.5, 1.5, 2.5, 2.5])
+
+
+def test_source_numbers():
+	frames = numpy.array([0, 1, 2], dtype=numpy.float32)
+	config = numeric_config(value_source="frame", frame_offset=10, divisor=2.0, float_correction=0.25)
+	numpy.testing.assert_allclose(evaluation.source_numbers(config, frames), [5.25, 5.75, 6.25])
+	config = numeric_config(number=42.0)
+	numpy.testing.assert_allclose(evaluation.source_numbers(config, frames), [42, 42, 42])
+
+
+def test_source_numbers_with_zero_divisor():
+	config = numeric_config(value_source="frame", frame_offset=3, divisor=0.0, float_correction=0.001)
+	with warnings.catch_warnings():
+		warnings.simplefilter("error")
+		numbers = evaluation.source_numbers(config, numpy.arange(5))
+	numpy.testing.assert_allclose(numbers, numpy.full(5, 0.001, dtype=numpy.float32))
+
+
+def test_digit_values():
+	digits = evaluation.digit_values(numpy.array([[4321.0]]), [0, 1, 2, 3, 4], numpy.float64)
+	numpy.testing.assert_array_equal(digits, [[1, 2, 3, 4, 0]])
+	# Values beyond the int64 range use the floating point remainder
+	digits = evaluation.digit_values(numpy.array([[1e20, 12345e20]]), [0, 20], numpy.float64)
+	numpy.testing.assert_array_equal(digits, [[0, 5]])
+
+
+def test_negative_numbers_show_zeros():
+	digit_indices, display_indices = evaluation.layout_indices({"display_type": "numeric", "digits": 2, "fraction_digits": 0})
+	config = numeric_config(value_source="frame", frame_offset=-10)
+	result = evaluation.evaluate_display(config, [3], digit_indices, display_indices)
+	numpy.testing.assert_array_equal(result.digits, [[-7, 0]])
+	numpy.testing.assert_array_equal(result.masks, [[63, 63]])
+
+
+def test_separators_are_blank():
+	digit_indices, display_indices = evaluation.layout_indices({"display_type": "numeric", "digits": 3, "fraction_digits": 2})
+	for number in (43.12, -43.12):
+		result = evaluation.evaluate_display(numeric_config(number=number, float_correction=0.0001), [0], digit_indices, display_indices)
+		assert result.masks[0, digit_indices < 0].tolist() == [0]
+		assert not result.segments[0, digit_indices < 0].any()
+
+
+def test_numeric_display():
+	digit_indices, display_indices = evaluation.layout_indices({"display_type": "numeric", "digits": 3, "fraction_digits": 2})
+	config = numeric_config(number=43.12, float_correction=0.0001)
+	result = evaluation.evaluate_display(config, [0, 1], digit_indices, display_indices)
+	numpy.testing.assert_array_equal(result.digits, [[2, 1, -1, 3, 4, 0]] * 2)
+	numpy.testing.assert_array_equal(result.masks[0], evaluation.DIGIT_MASKS[[2, 1, 0, 3, 4, 0]] * (digit_indices >= 0))
+	numpy.testing.assert_array_equal(evaluation.evaluate_masks(config, [0, 1], digit_indices, display_indices), result.masks)
+
+
+def test_clock_display():
+	digit_indices, display_indices = evaluation.layout_indices(clock_layout(hours=2, milliseconds=3))
+	config = dict(numeric_config(number=3725.5, float_correction=0.0001), display_type="clock")
+	digits = evaluation.evaluate_display(config, [0], digit_indices, display_indices).digits[0]
+	shown = [int(d) for d, i in zip(digits, digit_indices) if i >= 0]
+	# 01:02:05.500 right to left
+	assert shown == [0, 0, 5, 5, 0, 2, 0, 1, 0]
+
+
+@pytest.mark.parametrize("layout, digit_indices, display_indices", [
+	({"display_type": "numeric", "digits": 4, "fraction_digits": 0}, [0, 1, 2, 3], [0, 0, 0, 0]),
+	({"display_type": "numeric", "digits": 3, "fraction_digits": 2}, [0, 1, -1, 0, 1, 2], [2, 2, 0, 0, 0, 0]),
+	(clock_layout(), [0, 1, -1, 0, 1], [1, 1, 0, 2, 2]),
+	(clock_layout(hours=3, minutes=0), [0, 1, -1, 0, 1, 2], [1, 1, 0, 3, 3, 3]),
+	(clock_layout(hours=2, milliseconds=3), [0, 1, 2, -1, 0, 1, -1, 0, 1, -1, 0, 1], [0, 0, 0, 0, 1, 1, 0, 2, 2, 0, 3, 3]),
+])
+def test_layout_indices(layout, digit_indices, display_indices):
+	# Same order as SegmentAddon.create_display_layout(), see test_node_groups.py for the comparison in Blender
+	result = evaluation.layout_indices(layout)
+	assert result[0].tolist() == digit_indices
+	assert result[1].tolist() == display_indices
+	assert result[0].dtype == numpy.int32 and result[1].dtype == numpy.int32
+
+
+def test_number_digits_match_the_display():
+	digit_indices, display_indices = evaluation.layout_indices(clock_layout(hours=1, milliseconds=2))
+	config = dict(numeric_config(value_source="frame", frame_offset=0.5, float_correction=0.0001), display_type="clock")
+	frames = numpy.arange(0, 4000, 7)
+	result = evaluation.evaluate_display(config, frames, digit_indices, display_indices)
+	digits = evaluation.number_digits(result.numbers, "clock", digit_indices, display_indices)
+	numpy.testing.assert_array_equal(digits, result.digits)
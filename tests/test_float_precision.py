@@ -0,0 +1,89 @@
+import json
+import sys
+
+import numpy
+import pytest
+
+import float_precision
+
+
+def run(monkeypatch, capsys, *argv):
+	monkeypatch.setattr(sys, "argv", ["float_precision.py", *argv])
+	try:
+		float_precision.main()
+		code = 0
+	except SystemExit as e:
+		code = e.code
+	return code, capsys.readouterr().out
+
+
+def settings(**overrides):
+	return dict(float_precision.DEFAULTS, **overrides)
+
+
+def test_resolution_and_limits():
+	assert float_precision.resolution(settings(fraction_digits=2)) == pytest.approx(0.01)
+	assert float_precision.resolution(settings(display_type="clock", millisecond_digits=3)) == 0.001
+	assert float_precision.resolution(settings(display_type="clock")) == 1.0
+	assert float_precision.max_displayable(settings(digits=3)) == 1000.0
+	assert float_precision.max_displayable(settings(display_type="clock", hour_digits=2)) == 360000.0
+	# Float32 steps are 2^-8 below 2^16, half of 0.01 would not fit above it
+	assert float_precision.exact_limit(0.01) == 2.0 ** 16
+	assert float_precision.exact_limit(1.0) == 2.0 ** 22
+
+
+def test_evaluation_config():
+	config = float_precision.evaluation_config(settings(display_value_numeric="frame", frame_offset=5, frame_divisor=24.0))
+	assert config["value_source"] == "frame"
+	assert config["frame_offset"] == 5 and config["divisor"] == 24.0
+	config = float_precision.evaluation_config(settings(display_type="clock", display_value_clock="seconds"))
+	assert config["value_source"] == "number"
+
+
+def test_precision_warnings():
+	config = float_precision.evaluation_config(settings(display_value_numeric="frame", frame_divisor=0.0))
+	warnings = float_precision.precision_warnings(settings(), config, numpy.zeros(3))
+	assert any("divisor is 0" in warning and "float correction" in warning for warning in warnings)
+	config = float_precision.evaluation_config(settings(display_value_numeric="frame", frame_divisor=3.0))
+	warnings = float_precision.precision_warnings(settings(), config, numpy.zeros(3))
+	assert any("not a power of two" in warning for warning in warnings)
+	warnings = float_precision.precision_warnings(settings(digits=9), float_precision.evaluation_config(settings()), numpy.zeros(3))
+	assert any("cannot be exact" in warning for warning in warnings)
+
+
+def test_display_text():
+	digits = numpy.array([2, 1, -1, 3, 4, -3])
+	digit_indices = numpy.array([0, 1, -1, 0, 1, 2])
+	display_indices = numpy.array([2, 2, 0, 0, 0, 0])
+	assert float_precision.display_text(digits, digit_indices, display_indices, "numeric") == "043.12"
+
+
+def test_sweep_finds_the_configured_correction_exact(monkeypatch, capsys):
+	code, out = run(monkeypatch, capsys, "--limit", "20000")
+	assert code == 0
+	assert "float_correction 0.0001: 0 values show wrong digits" in out
+	assert "Smallest exact float_correction" in out
+
+
+def test_sweep_reports_mismatches(monkeypatch, capsys, tmp_path):
+	output = tmp_path / "report.json"
+	code, out = run(monkeypatch, capsys, "--set", "float_correction=0", "--output", str(output))
+	assert code == 1
+	with open(output) as f:
+		report = json.load(f)
+	assert report["mismatches"]
+	assert report["suggested_float_correction"] > 0
+	assert all(mismatch["shown"] != mismatch["expected"] for mismatch in report["mismatches"])
+
+
+def test_wide_layouts_use_a_per_value_tolerance(monkeypatch, capsys, tmp_path):
+	output = tmp_path / "report.json"
+	code, out = run(monkeypatch, capsys, "--set", "digits=9", "--set", "fraction_digits=2", "--limit", "20000", "--output", str(output))
+	with open(output) as f:
+		report = json.load(f)
+	# Only values beyond the float32 limit of the last digit show wrong digits
+	assert report["mismatches"]
+	assert min(mismatch["value"] for mismatch in report["mismatches"]) >= float_precision.exact_limit(0.01)
+	code, out = run(monkeypatch, capsys, "--set", "digits=9", "--set", "fraction_digits=2", "--range", "0", "1000")
+	assert code == 0
+	assert "0 values show wrong digits" in out
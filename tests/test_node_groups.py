@@ -0,0 +1,112 @@
+"""
+Compares the NumPy evaluation to the node groups of segment.blend, needs Blender's Python (bpy).
+"""
+import math
+
+import pytest
+
+bpy = pytest.importorskip("bpy")
+
+import SegmentAddon
+import evaluation
+
+CORE_NODE_GROUP = ".7SegmentCore"
+
+MATH_OPERATIONS = {
+	'ADD': lambda a, b: a + b,
+	'SUBTRACT': lambda a, b: a - b,
+	'MULTIPLY': lambda a, b: a * b,
+	'DIVIDE': lambda a, b: a / b if b != 0 else 0.0,
+	'POWER': lambda a, b: math.pow(a, b),
+	'ROUND': lambda a, b: math.floor(a + 0.5),
+	'TRUNC': lambda a, b: math.trunc(a),
+	'FLOOR': lambda a, b: math.floor(a),
+	'MODULO': lambda a, b: math.fmod(a, b) if b != 0 else 0.0,
+	'ABSOLUTE': lambda a, b: abs(a),
+	'GREATER_THAN': lambda a, b: float(a > b),
+	'LESS_THAN': lambda a, b: float(a < b),
+}
+
+
+def input_value(socket, inputs):
+	if socket.is_linked:
+		return output_value(socket.links[0].from_socket, inputs)
+	return socket.default_value
+
+
+def output_value(socket, inputs):
+	"""
+	Evaluates a float output socket of the Math node graphs in the core node group.
+	"""
+	node = socket.node
+	if node.type == 'GROUP_INPUT':
+		return inputs[list(node.outputs).index(socket)]
+	if node.type == 'REROUTE':
+		return input_value(node.inputs[0], inputs)
+	if node.type == 'VALUE':
+		return socket.default_value
+	if node.type == 'MATH':
+		result = MATH_OPERATIONS[node.operation](input_value(node.inputs[0], inputs), input_value(node.inputs[1], inputs))
+		return min(max(result, 0.0), 1.0) if node.use_clamp else result
+	if node.type == 'GROUP':
+		group_inputs = [input_value(group_socket, inputs) for group_socket in node.inputs]
+		return group_output(node.node_tree, list(node.outputs).index(socket), group_inputs)
+	raise NotImplementedError(f"{node.type} nodes are not evaluated")
+
+
+def group_output(node_tree, index, inputs):
+	output = next(node for node in node_tree.nodes if node.type == 'GROUP_OUTPUT' and node.is_active_output)
+	return input_value(output.inputs[index], inputs)
+
+
+def srgb_to_linear(value):
+	# The "Segment" byte color attribute is read in linear space
+	return value / 12.92 if value <= 0.04045 else ((value + 0.055) / 1.055) ** 2.4
+
+
+@pytest.fixture(scope="module")
+def resource():
+	SegmentAddon.register()
+	resource = SegmentAddon.ResourceCache.get(SegmentAddon.SegmentAddon.addon_blend_path)
+	resource.require(objects=SegmentAddon.PROTOTYPE_OBJECTS, node_groups=[CORE_NODE_GROUP])
+	yield resource
+	SegmentAddon.unregister()
+
+
+def core_segments(resource, number):
+	"""
+	Returns the segment ids the core node group lights for the first digit of the number.
+	"""
+	core = resource.node_groups[CORE_NODE_GROUP]
+	names = [item.name for item in core.interface.items_tree if item.item_type == 'SOCKET' and item.in_out == 'INPUT']
+	lit = []
+	for segment in range(evaluation.SEGMENT_UPPER_RIGHT, evaluation.SEGMENT_MIDDLE + 1):
+		values = {"Number": number, "Vertex Colors": srgb_to_linear(segment * 0.1), "Digit": 0.0}
+		if group_output(core, 0, [values[name] for name in names]) > 0.5:
+			lit.append(segment)
+	return lit
+
+
+def test_digit_segments_match_the_core(resource):
+	for digit, segments in enumerate(evaluation.DIGIT_SEGMENTS):
+		assert core_segments(resource, float(digit)) == sorted(segments)
+
+
+def test_negative_digits_light_zero(resource):
+	assert core_segments(resource, -3.0) == sorted(evaluation.DIGIT_SEGMENTS[0])
+	assert evaluation.digit_masks([-3]).tolist() == [evaluation.DIGIT_MASKS[0]]
+
+
+@pytest.mark.parametrize("layout", [
+	{"display_type": "numeric", "digits": 4, "fraction_digits": 0},
+	{"display_type": "numeric", "digits": 3, "fraction_digits": 2},
+	{"display_type": "clock", "hour_digits": 0, "minute_digits": 2, "second_digits": 2, "millisecond_digits": 0},
+	{"display_type": "clock", "hour_digits": 3, "minute_digits": 0, "second_digits": 2, "millisecond_digits": 0},
+	{"display_type": "clock", "hour_digits": 2, "minute_digits": 2, "second_digits": 2, "millisecond_digits": 3},
+])
+def test_layout_indices_match_the_display_layout(resource, layout):
+	addon = SegmentAddon.SegmentAddon(SegmentAddon.DisplayConfig(**layout), resource, None)
+	pieces = addon.create_display_layout()
+	digit_indices, display_indices = evaluation.layout_indices(layout)
+	assert digit_indices.tolist() == [-1 if piece.digit is None else round(piece.digit * 10) for piece in pieces]
+	assert display_indices.tolist() == [0 if piece.display is None else round(piece.display * 10) for piece in pieces]
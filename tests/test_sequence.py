@@ -0,0 +1,58 @@
+import json
+
+import numpy
+import pytest
+
+import sequence
+
+
+def write(path, text):
+	path.write_text(text)
+	return str(path)
+
+
+def test_csv_with_header(tmp_path):
+	filepath = write(tmp_path / "values.csv", "frame,value\n10,2.5\n1,0.5\n\n5,1.5\n")
+	frames, values = sequence.load_sequence(filepath)
+	numpy.testing.assert_array_equal(frames, [1, 5, 10])
+	numpy.testing.assert_array_equal(values, [0.5, 1.5, 2.5])
+	assert frames.dtype == numpy.float64 and values.dtype == numpy.float64
+
+
+def test_json_pairs(tmp_path):
+	filepath = write(tmp_path / "values.json", json.dumps([[3, 30.0], [1, 10.0], [2, 20.0]]))
+	frames, values = sequence.load_sequence(filepath)
+	numpy.testing.assert_array_equal(frames, [1, 2, 3])
+	numpy.testing.assert_array_equal(values, [10, 20, 30])
+
+
+def test_json_samples(tmp_path):
+	filepath = write(tmp_path / "values.json", json.dumps([{"frame": 2, "value": 4.0}, {"frame": 1, "value": 2.0}]))
+	frames, values = sequence.load_sequence(filepath)
+	numpy.testing.assert_array_equal(frames, [1, 2])
+	numpy.testing.assert_array_equal(values, [2, 4])
+
+
+def test_json_lists(tmp_path):
+	filepath = write(tmp_path / "values.json", json.dumps({"frames": [1, 2, 3], "values": [7, 8, 9]}))
+	frames, values = sequence.load_sequence(filepath)
+	numpy.testing.assert_array_equal(frames, [1, 2, 3])
+	numpy.testing.assert_array_equal(values, [7, 8, 9])
+
+
+def test_equal_frames_keep_the_file_order(tmp_path):
+	filepath = write(tmp_path / "values.csv", "2,1\n1,5\n1,6\n")
+	frames, values = sequence.load_sequence(filepath)
+	numpy.testing.assert_array_equal(values, [5, 6, 1])
+
+
+def test_mismatched_lengths(tmp_path):
+	filepath = write(tmp_path / "values.json", json.dumps({"frames": [1, 2, 3], "values": [7, 8]}))
+	with pytest.raises(ValueError):
+		sequence.load_sequence(filepath)
+
+
+def test_no_samples(tmp_path):
+	filepath = write(tmp_path / "values.csv", "frame,value\n")
+	with pytest.raises(ValueError):
+		sequence.load_sequence(filepath)
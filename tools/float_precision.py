@@ -0,0 +1,291 @@
+# Sweeps the values a display can show in float32 like the shader does and lists every value
+# where the shown digits differ from the exact decimal digits, then suggests the smallest float_correction fixing them.
+# Layouts and value ranges that cannot be shown exactly in float32 are flagged before the sweep.
+#
+# Does not need Blender, run it with a Python interpreter that has NumPy installed.
+#
+# The config is a JSON object with SegmentAddonData settings like the one of tools/generate_displays.py,
+# missing settings take the addon defaults. Settings can also be given with --set NAME=VALUE.
+# Numbers and clock times are swept over every displayable value in --range (in steps of the last digit),
+# frame, timer and sequence sources over the frames in --frames.
+#
+# Usage:
+#   python tools/float_precision.py [CONFIG] [--set NAME=VALUE ...] [--range START STOP] [--frames START END]
+#                                   [--limit N] [--show N] [--output FILE]
+
+import argparse
+import json
+import math
+import os
+import sys
+
+import numpy
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.realpath(__file__)), "..", "SegmentAddon"))
+import evaluation
+import sequence
+
+# SegmentAddonData defaults of the settings affecting the display value
+DEFAULTS = {
+	"display_type": "numeric",
+	"digits": 3,
+	"fraction_digits": 2,
+	"millisecond_digits": 0,
+	"second_digits": 2,
+	"minute_digits": 2,
+	"hour_digits": 0,
+	"display_value_numeric": "number",
+	"number": 43.12,
+	"frame_divisor": 1.0,
+	"frame_offset": 0,
+	"timer_number_from": 1.0,
+	"timer_number_to": 50.0,
+	"timer_frame_start": 50,
+	"timer_frame_end": 250,
+	"sequence_filepath": "",
+	"display_value_clock": "seconds",
+	"clock_frame_divisor": 1.0,
+	"timer_time_from": 90.0,
+	"timer_time_to": 0.0,
+	"float_correction": 0.0001,
+}
+
+# Tried float corrections, smallest first
+CORRECTION_CANDIDATES = [0.0] + [mantissa * 10.0 ** -exponent for exponent in range(9, 0, -1) for mantissa in (1, 2, 5)]
+
+# Relative tolerance of the float64 reference against decimal values not representable in binary,
+# capped to a fraction of the last digit so that it never changes a digit on its own
+EXACT_TOLERANCE = 1e-9
+EXACT_TOLERANCE_MAX_STEP = 0.01
+
+
+def parse_args():
+	parser = argparse.ArgumentParser(description="Float32 precision sweep of a segment display")
+	parser.add_argument("config", nargs="?", help="JSON file with SegmentAddonData settings")
+	parser.add_argument("--set", action="append", default=[], metavar="NAME=VALUE", help="Overrides a setting, the value is parsed as JSON")
+	parser.add_argument("--range", nargs=2, type=float, metavar=("START", "STOP"), help="Swept number or seconds range of number sources")
+	parser.add_argument("--frames", nargs=2, type=int, metavar=("START", "END"), help="Swept frame range of frame, timer and sequence sources")
+	parser.add_argument("--limit", type=int, default=1000000, help="Maximum number of swept values, larger ranges are strided")
+	parser.add_argument("--show", type=int, default=20, help="Number of listed mismatches")
+	parser.add_argument("--output", help="JSON file the full report is written to")
+	return parser.parse_args()
+
+
+def load_settings(args) -> dict:
+	settings = dict(DEFAULTS)
+	if args.config:
+		with open(args.config) as f:
+			settings.update(json.load(f))
+	for override in args.set:
+		name, _, value = override.partition("=")
+		try:
+			settings[name] = json.loads(value)
+		except json.JSONDecodeError:
+			settings[name] = value
+	return settings
+
+
+def value_source(settings) -> str:
+	"""
+	Same as SegmentAddon.value_source().
+	"""
+	if settings["display_type"] == "numeric":
+		source = settings["display_value_numeric"]
+	else:
+		source = settings["display_value_clock"]
+	return "number" if source in ("seconds", "time") else source
+
+
+def resolution(settings) -> float:
+	"""
+	Returns the value step of the last shown digit.
+	"""
+	if settings["display_type"] == "numeric":
+		return 10.0 ** -settings["fraction_digits"]
+	return 0.001 if settings["millisecond_digits"] > 0 else 1.0
+
+
+def max_displayable(settings) -> float:
+	"""
+	Returns the number at which the highest digit overflows.
+	"""
+	if settings["display_type"] == "numeric":
+		return 10.0 ** settings["digits"]
+	for count, scale in (("hour_digits", 3600), ("minute_digits", 60), ("second_digits", 1), ("millisecond_digits", 0.001)):
+		if settings[count] > 0:
+			return 10.0 ** settings[count] * scale
+	return 0.0
+
+
+def exact_limit(step) -> float:
+	"""
+	Returns the number below which float32 steps are smaller than half of the step.
+	"""
+	return 2.0 ** math.ceil(math.log2(step / 2) + 23)
+
+
+def evaluation_config(settings) -> dict:
+	"""
+	Returns the evaluation.source_numbers() config of the settings, same as SegmentAddon.evaluation_config().
+	"""
+	numeric = settings["display_type"] == "numeric"
+	config = {
+		"display_type": settings["display_type"],
+		"value_source": value_source(settings),
+		"divisor": 1.0,
+		"float_correction": settings["float_correction"],
+	}
+	if config["value_source"] == "frame":
+		config["frame_offset"] = settings["frame_offset"]
+		config["divisor"] = settings["frame_divisor"] if numeric else settings["clock_frame_divisor"]
+	elif config["value_source"] == "timer":
+		config["timer_from"] = settings["timer_number_from"] if numeric else settings["timer_time_from"]
+		config["timer_to"] = settings["timer_number_to"] if numeric else settings["timer_time_to"]
+		config["timer_start"] = settings["timer_frame_start"]
+		config["timer_end"] = settings["timer_frame_end"]
+	elif config["value_source"] == "sequence":
+		frames, values = sequence.load_sequence(settings["sequence_filepath"])
+		config["sequence_frames"] = frames.tolist()
+		config["sequence_values"] = values.tolist()
+	return config
+
+
+def sweep(settings, config, args):
+	"""
+	Returns the swept frames and the config evaluating them.
+	Number sources are swept as a sequence holding one displayable value per frame.
+	"""
+	if config["value_source"] == "number":
+		step = resolution(settings)
+		start, stop = args.range if args.range else (0.0, max_displayable(settings))
+		first, last = round(start / step), round(stop / step)
+		units = numpy.arange(first, last, max(1, math.ceil((last - first) / args.limit)), dtype=numpy.float64)
+		# Dividing the integer units gives the closest double of the decimal value
+		values = units / round(1 / step) if step < 1 else units * step
+		frames = numpy.arange(len(values), dtype=numpy.float64)
+		return frames, dict(config, value_source="sequence", sequence_frames=frames, sequence_values=values)
+
+	if args.frames:
+		start, end = args.frames
+	elif config["value_source"] == "timer":
+		start, end = min(config["timer_start"], config["timer_end"]) - 1, max(config["timer_start"], config["timer_end"]) + 1
+	elif config["value_source"] == "sequence":
+		start, end = int(config["sequence_frames"][0]), int(config["sequence_frames"][-1])
+	else:
+		start, end = 0, 100000
+	frames = numpy.arange(start, end + 1, max(1, math.ceil((end + 1 - start) / args.limit)), dtype=numpy.float64)
+	return frames, config
+
+
+def precision_warnings(settings, config, numbers) -> list:
+	"""
+	Flags layouts and value ranges whose last digit cannot be shown exactly in float32.
+	"""
+	warnings = []
+	step = resolution(settings)
+	limit = exact_limit(step)
+	if max_displayable(settings) > limit:
+		if settings["display_type"] == "numeric":
+			layout = f"{settings['digits']} digits with {settings['fraction_digits']} decimal places"
+		else:
+			layout = "The clock layout"
+		warnings.append(f"{layout} cannot be exact in float32 above {limit:g}, the float32 step there is larger than half of the last digit ({step:g})")
+
+	largest = float(numpy.max(numpy.abs(numbers))) if len(numbers) > 0 else 0.0
+	if largest >= limit:
+		warnings.append(f"The swept values reach {largest:g}, above {limit:g} the last digit ({step:g}) cannot be exact in float32")
+
+	divisor = float(config["divisor"])
+	if divisor != 0 and math.frexp(divisor)[0] != 0.5:
+		warnings.append(f"The divisor {divisor:g} is not a power of two, value / divisor is rounded in float32 and needs a float correction")
+	elif divisor == 0:
+		warnings.append("The divisor is 0, the display number is only the float correction and shows 0")
+	return warnings
+
+
+def display_text(digits, digit_indices, display_indices, display_type) -> str:
+	"""
+	Formats one evaluated frame left to right, negative digits are shown as 0 like on the display.
+	"""
+	text = []
+	for i in range(len(digit_indices)):
+		if digit_indices[i] >= 0:
+			text.append(str(max(int(digits[i]), 0)))
+		elif display_type == "numeric" or (i > 0 and display_indices[i - 1] == evaluation.DISPLAY_MILLISECONDS):
+			text.append(".")
+		else:
+			text.append(":")
+	return "".join(reversed(text))
+
+
+def mismatches(config, frames, expected, digit_indices, display_indices, correction):
+	"""
+	Returns the indices of the frames whose float32 digits differ from the expected digits and the float32 digits.
+	"""
+	digits = evaluation.evaluate_display(dict(config, float_correction=correction), frames, digit_indices, display_indices).digits
+	return numpy.flatnonzero(numpy.any(digits != expected, axis=1)), digits
+
+
+def main():
+	args = parse_args()
+	settings = load_settings(args)
+	config = evaluation_config(settings)
+	digit_indices, display_indices = evaluation.layout_indices(settings)
+	frames, config = sweep(settings, config, args)
+
+	# Reference digits, evaluated in float64 with a per value tolerance instead of the float correction
+	numbers = evaluation.source_numbers(dict(config, float_correction=0.0), frames, numpy.float64)
+	tolerance = numpy.minimum(EXACT_TOLERANCE * numpy.abs(numbers), EXACT_TOLERANCE_MAX_STEP * resolution(settings))
+	expected = evaluation.number_digits(numbers + tolerance, settings["display_type"], digit_indices, display_indices, numpy.float64)
+
+	warnings = precision_warnings(settings, config, numbers)
+	out_of_range = len(numbers) > 0 and float(numpy.max(numpy.abs(numbers))) >= exact_limit(resolution(settings))
+	for warning in warnings:
+		print(f"WARNING: {warning}")
+	print(f"Swept {len(frames)} values of {numbers.min() if len(numbers) else 0:g} to {numbers.max() if len(numbers) else 0:g} ({config['value_source']})")
+
+	configured = settings["float_correction"]
+	failed, digits = mismatches(config, frames, expected, digit_indices, display_indices, configured)
+	print(f"float_correction {configured:g}: {len(failed)} values show wrong digits")
+	for i in failed[:args.show]:
+		shown = display_text(digits[i], digit_indices, display_indices, settings["display_type"])
+		exact = display_text(expected[i], digit_indices, display_indices, settings["display_type"])
+		print(f"  frame {frames[i]:g}  value {float(numbers[i])!r:20}  shows {shown!r}  expected {exact!r}")
+	if len(failed) > args.show:
+		print(f"  ... {len(failed) - args.show} more")
+
+	suggestion = None
+	if len(failed) == 0 or not out_of_range:
+		for correction in CORRECTION_CANDIDATES:
+			if len(mismatches(config, frames, expected, digit_indices, display_indices, correction)[0]) == 0:
+				suggestion = correction
+				break
+	if suggestion is None:
+		print("No float correction shows all values exactly")
+	else:
+		print(f"Smallest exact float_correction: {suggestion:g}")
+
+	if args.output:
+		report = {
+			"settings": settings,
+			"warnings": warnings,
+			"values": len(frames),
+			"float_correction": configured,
+			"mismatches": [{
+				"frame": float(frames[i]),
+				"value": float(numbers[i]),
+				"shown": display_text(digits[i], digit_indices, display_indices, settings["display_type"]),
+				"expected": display_text(expected[i], digit_indices, display_indices, settings["display_type"]),
+			} for i in failed],
+			"suggested_float_correction": suggestion,
+		}
+		with open(args.output, "w") as f:
+			json.dump(report, f, indent=2)
+		print(f"Report written to {args.output}")
+
+	if suggestion is None or len(failed) > 0:
+		sys.exit(1)
+
+
+if __name__ == "__main__":
+	main()
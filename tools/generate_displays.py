@@ -0,0 +1,56 @@
+# Generates segment displays from a config or manifest file and saves them into a .blend file.
+# Does not need a UI session, intended for building display assets on render farm nodes.
+#
+# The config is a JSON object with SegmentAddonData settings (and optionally "name" and a transform),
+# or a JSON/CSV manifest as accepted by SegmentAddon.load_manifest().
+#
+# Usage:
+#   blender -b --factory-startup --python tools/generate_displays.py -- CONFIG OUTPUT [--collection NAME] [--empty]
+
+import argparse
+import os
+import sys
+import time
+
+import bpy
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.realpath(__file__)), ".."))
+import SegmentAddon
+
+
+def parse_args():
+	argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+	parser = argparse.ArgumentParser(description="Headless segment display generator")
+	parser.add_argument("config", help="JSON config or JSON/CSV manifest file")
+	parser.add_argument("output", help="Path of the .blend file to write")
+	parser.add_argument("--collection", default="SegmentDisplays", help="Name of the collection the displays are linked to")
+	parser.add_argument("--empty", action="store_true", help="Remove all objects of the startup file before generating")
+	return parser.parse_args(argv)
+
+
+def main():
+	args = parse_args()
+	SegmentAddon.register()
+
+	if args.empty:
+		for obj in list(bpy.data.objects):
+			bpy.data.objects.remove(obj)
+
+	scene = bpy.context.scene
+	collection = bpy.data.collections.get(args.collection)
+	if collection is None:
+		collection = bpy.data.collections.new(args.collection)
+		scene.collection.children.link(collection)
+
+	rows = SegmentAddon.load_manifest(args.config)
+	start = time.perf_counter()
+	results = SegmentAddon.generate_displays(rows, collection)
+	total_time = time.perf_counter() - start
+	print(f"Generated {len(results)} displays in {total_time:.3f} s")
+
+	bpy.ops.wm.save_as_mainfile(filepath=os.path.abspath(args.output))
+	SegmentAddon.unregister()
+
+
+if __name__ == "__main__":
+	main()